@@ -2,11 +2,14 @@ from google.adk.apps import App
 from google.adk.apps.app import ResumabilityConfig
 from app.video_pipeline_app.root_agent import root_agent # very important, makes sure you use object
 from app.core.config import settings
+from app.services.state_compaction import StateCompactionPlugin
 
 APP_NAME = settings.app_name
 
 video_app = App(
     name=APP_NAME,
     root_agent=root_agent,
-    resumability_config=ResumabilityConfig(is_resumable=True)
+    resumability_config=ResumabilityConfig(is_resumable=True),
+    # Drops output_key blobs from session state/events once no later stage reads them
+    plugins=[StateCompactionPlugin(root_agent)] if settings.session_compaction_enabled else [],
 )
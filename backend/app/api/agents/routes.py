@@ -1,14 +1,15 @@
 # app/api/agents/routes.py
 
-from fastapi import APIRouter, HTTPException
-from uuid import uuid4
+from typing import Literal
+
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 import json
-from google.genai import types
-from google.adk.runners import Runner
 
-from google.adk.sessions import InMemorySessionService, DatabaseSessionService
-from app.adk_app import video_app, APP_NAME
 from app.core.config import settings
+from app.services.admission import AdmissionRejected, admission_controller
+from app.services.pipeline_service import pipeline_service, with_heartbeats
 from app.video_pipeline_app.root_agent.sub_agents.business_requirements_agent.schema import RawRequirements
 # Observability
 from app.observability import configure_logging, get_logger
@@ -23,78 +24,96 @@ router = APIRouter()
 DB_URL = f"postgresql+psycopg2://{settings.db_user}:{settings.db_password}@{settings.db_host}:5432/{settings.db_name}"
 
 
-# Use persistent session in production version.
-# session_service = DatabaseSessionService(DB_URL)
-# For Hackathon In memory session service
-session_service = InMemorySessionService()
-
-# Basic in memory runner
-runner = Runner(
-    # App contains the information of root agent to run so no need to pass agent in Runner
-    app=video_app, #Required for long running tasks / Human in the loop
-    session_service=session_service)
-
-
 @router.post("/generate-video-ad", summary="Run the full video creation pipeline")
 async def run_video_pipeline(req: RawRequirements):
     """
     Runs the multi-agent video pipeline.
+    Waits for a slot under admission control; 429 + Retry-After when busy.
     """
 
-    try:
-        session_id = f"s_{uuid4().hex[:8]}"
-        user_id = "user_001" # Get it dynamically in future versions
-
-        # Create ADK session. We don't use session service directly because it needs to come via Runner
-        await runner.session_service.create_session(
-            app_name=APP_NAME,
-            user_id=user_id,
-            session_id=session_id
-        )
+    user_id = "user_001" # Get it dynamically in future versions
+    ticket = await _admit(user_id)
 
-        # Extract the raw string
-        raw_requirements = req.raw_requirements
+    try:
+        async for event in pipeline_service.stream(req.raw_requirements, user_id=user_id):
+            if event["type"] == "error":
+                message = f"{event['code'] or ''} {event['message'] or ''}".strip()
+                if event["agent"] is None:
+                    raise HTTPException(500, message)
+                raise HTTPException(500, f"Agent error: {message}")
 
-        message = types.Content(
-            parts=[types.Part(text=raw_requirements)]
-        )
+            if event["type"] == "final":
+                return event["result"]
 
-        final_result = None
-
-        # Run orchestrator step-by-step
-        async for event in runner.run_async(
-            user_id=user_id,
-            session_id=session_id,
-            new_message=message
-        ):
-
-            # 1. Check for errors early
-            if event.error_code or event.error_message:
-                logger.error(
-                    "Agent error (code=%s): %s", 
-                    event.error_code, 
-                    event.error_message
-                )
-                raise HTTPException(
-                    500,
-                    f"Agent error: {event.error_code or ''} {event.error_message or ''}".strip()
-                )
-
-
-            if event.is_final_response():
-                # Extract only the TEXT of the final response
-                if event.content and event.content.parts:
-                    part = event.content.parts[0]
-                    if part.text:
-                        try:
-                            final_result = json.loads(part.text)
-                        except Exception:
-                            final_result = part.text
-
-        if final_result is None:
-            raise HTTPException(500, "Pipeline ended without final response.")
-
-        return final_result
+        raise HTTPException(500, "Pipeline ended without final response.")
 
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+    finally:
+        ticket.release()
+
+
+# -------------------------------------------------------------
+# POST /agents/generate-video-ad/stream
+# Same pipeline, streamed: per-agent progress, partial outputs
+# (concepts, prompts, ...), timings, then the final result
+# -------------------------------------------------------------
+@router.post("/generate-video-ad/stream", summary="Run the video pipeline, streaming progress")
+async def stream_video_pipeline(
+    req: RawRequirements,
+    format: Literal["sse", "ndjson"] = Query("sse", description="sse (text/event-stream) or ndjson"),
+):
+    """
+    Streams pipeline events as Server-Sent Events (`event: <type>`) or
+    NDJSON lines ({"type": ...}). Event types: start, progress, output,
+    error, final. Idle periods send a heartbeat (SSE comment / ping line).
+    Admission is decided before the stream starts (429 + Retry-After).
+    """
+
+    user_id = "user_001" # Get it dynamically in future versions
+    ticket = await _admit(user_id)
+
+    async def body():
+        events = with_heartbeats(
+            pipeline_service.stream(req.raw_requirements, user_id=user_id),
+            settings.pipeline_stream_heartbeat_seconds,
+        )
+        try:
+            async for event in events:
+                yield _encode(event, format)
+        except Exception as e:
+            logger.error(f"❌ Streaming pipeline failed: {e}")
+            error = {"type": "error", "agent": None, "code": None, "message": str(e)}
+            yield _encode(error, format)
+        finally:
+            ticket.release()
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(
+        body(),
+        media_type=media_type,
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},  # no proxy buffering
+        background=BackgroundTask(ticket.release),  # client left before the body started
+    )
+
+
+async def _admit(user_id: str):
+    try:
+        return await admission_controller.acquire(user_id)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
+
+
+def _encode(event, format: str) -> str:
+    if event is None:   # heartbeat
+        return ": ping\n\n" if format == "sse" else '{"type":"ping"}\n'
+
+    data = json.dumps(event, ensure_ascii=False, default=str)
+    if format == "sse":
+        return f"event: {event['type']}\ndata: {data}\n\n"
+    return data + "\n"
@@ -1,10 +1,15 @@
 # app/api/examples/routes.py
 
-from fastapi import APIRouter, Depends, HTTPException
+import json
+from typing import AsyncIterator
+
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.db.database import get_session
 from app.services.example_service import example_service
+from app.services.ingestion_service import bulk_ingestion_service
 
 from app.schemas.example_schema import (
     ExampleCreateRequest,
@@ -18,7 +23,7 @@ router = APIRouter()
 
 # -------------------------------------------------------------
 # POST /examples/upload
-# Create + store example prompt (text or JSON) + embed + Pinecone
+# Create + store example prompt (text or JSON); indexing runs in background
 # -------------------------------------------------------------
 @router.post("/upload")
 async def upload_example(
@@ -29,8 +34,7 @@ async def upload_example(
     Upload a new example for the creative pipeline:
     - Supports raw text prompts OR structured JSON prompts
     - Stores metadata in PostgreSQL
-    - Generates embeddings (based on text or JSON)
-    - Stores embedding + metadata in Pinecone
+    - Queues embedding + vector upsert (index outbox, drained in the background)
     """
 
     try:
@@ -49,6 +53,7 @@ async def upload_example(
         return {
             "status": "success",
             "example_id": example_id,
+            "indexing": "queued",
         }
 
     except Exception as e:
@@ -58,6 +63,39 @@ async def upload_example(
         )
 
 
+# -------------------------------------------------------------
+# POST /examples/bulk-upload
+# NDJSON / JSONL file → pipelined DB + embed + vector upsert
+# -------------------------------------------------------------
+@router.post("/bulk-upload")
+async def bulk_upload_examples(file: UploadFile = File(...)):
+    """
+    Bulk-ingest examples from an NDJSON file (one ExampleCreateRequest per line).
+
+    Streams back NDJSON: one result per record
+    {"line", "status": "ok" | "error", "example_id", "error"}
+    followed by a summary {"status": "done", "total", "ok", "failed"}.
+    """
+
+    async def results() -> AsyncIterator[str]:
+        async for result in bulk_ingestion_service.ingest(_read_lines(file)):
+            yield json.dumps(result) + "\n"
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+async def _read_lines(file: UploadFile, chunk_size: int = 64 * 1024) -> AsyncIterator[str]:
+    """Split the upload into lines without loading the whole file."""
+    buffer = b""
+    while chunk := await file.read(chunk_size):
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8", errors="replace")
+    if buffer:
+        yield buffer.decode("utf-8", errors="replace")
+
+
 # -------------------------------------------------------------
 # POST /examples/search
 # Hybrid semantic + metadata filtered vector search
@@ -0,0 +1,44 @@
+# app/api/jobs/routes.py
+
+from fastapi import APIRouter, HTTPException
+
+from app.schemas.job_schema import JobStatusResponse, JobSubmitResponse
+from app.services.job_service import JOB_QUEUED, job_service
+from app.video_pipeline_app.root_agent.sub_agents.business_requirements_agent.schema import RawRequirements
+
+router = APIRouter()
+
+
+# -------------------------------------------------------------
+# POST /jobs
+# Queue a video pipeline run; returns immediately with the job id
+# -------------------------------------------------------------
+@router.post("", response_model=JobSubmitResponse, status_code=202)
+async def submit_job(req: RawRequirements):
+    """
+    Submit the multi-agent video pipeline as a background job.
+    Poll GET /jobs/{job_id} for status, per-stage timings and the result.
+    """
+
+    try:
+        user_id = "user_001" # Get it dynamically in future versions
+        job_id = await job_service.submit(req.raw_requirements, user_id)
+
+        return JobSubmitResponse(job_id=job_id, status=JOB_QUEUED, status_url=f"/jobs/{job_id}")
+
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+# -------------------------------------------------------------
+# GET /jobs/{job_id}
+# -------------------------------------------------------------
+@router.get("/{job_id}", response_model=JobStatusResponse)
+async def get_job(job_id: str):
+    """Status (queued | running | succeeded | failed), stage timings, result or error."""
+
+    job = await job_service.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    return JobStatusResponse.model_validate(job)
@@ -1,5 +1,7 @@
 # app/core/config.py
 
+from typing import Dict, Optional
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -20,6 +22,112 @@ class Settings(BaseSettings):
     pinecone_api_key: str = ""
     pinecone_env: str = ""     # e.g., "us-east-1"
     pinecone_index: str = "prompt-examples"
+    pinecone_index_host: Optional[str] = None      # skip the control-plane lookup when set
+    pinecone_max_workers: int = 8                  # thread pool + HTTP connection pool size
+    pinecone_max_request_bytes: int = 2 * 1024 * 1024   # upsert payload limit per request
+    pinecone_max_batch_vectors: int = 1000
+
+    # Vector index backend: "pinecone" (managed) or "local" (in-process NumPy / HNSW)
+    vector_store_backend: str = "pinecone"
+    local_vector_store_path: str = "vector_store"   # directory (memory-mapped matrix + metadata)
+    local_vector_store_hnsw: bool = False           # needs `pip install hnswlib`
+
+    # Embedding size — text-embedding-3-large supports shortened outputs
+    # (256 / 512 / 1024 / ... / 3072). Must match the Pinecone index dimension.
+    embedding_dimensions: int = 3072
+
+    # Embedding client (async, pooled)
+    openai_base_url: Optional[str] = None      # e.g. "http://127.0.0.1:8089/v1" for a local stub
+    embedding_max_concurrency: int = 8         # max in-flight embedding requests
+    embedding_max_connections: int = 16        # shared HTTP connection pool size
+    embedding_timeout_seconds: float = 30.0
+    embedding_batch_max_size: int = 64         # texts per upstream request
+    embedding_batch_window_ms: float = 5.0     # coalescing window; 0 disables
+
+    # Embedding cache (in-process LRU + optional persistent tier)
+    embedding_cache_backend: str = "memory"    # memory | sqlite | postgres | none
+    embedding_cache_max_bytes: int = 64 * 1024 * 1024
+    embedding_cache_sqlite_path: str = "embedding_cache.sqlite3"
+    embedding_cache_codec: str = "float32"     # float32 | int8 | binary
+
+    # Search result cache (query + filters + top_k → matches); 0 disables
+    search_cache_max_entries: int = 1024
+    search_cache_ttl_seconds: float = 300.0
+
+    # Hybrid search: BM25 over title / prompt / tags fused with vector results (RRF)
+    hybrid_search_enabled: bool = True
+    hybrid_rrf_k: int = 60
+    hybrid_candidates: int = 20                # depth of each ranking before fusion
+    hybrid_exact_match_skips_vector: bool = True   # query == title / tag → exact hits, no embedding
+    lexical_index_refresh_seconds: float = 60.0    # picks up other processes' writes
+
+    # MMR diversification of the examples picked for agent prompts
+    example_mmr_enabled: bool = True
+    example_mmr_lambda: float = 0.7            # 1.0 = pure relevance, lower = more diverse
+
+    # Token budget for retrieved examples injected into agent prompts
+    example_context_budget_tokens: int = 1500
+    example_context_max_string_tokens: int = 400   # per string field, halved while over budget
+    example_context_max_list_items: int = 8
+    token_counter: str = "estimate"            # "estimate" (~4 chars/token) or "tiktoken"
+
+    # Hot cache of example payloads used by fetch_examples_by_ids
+    example_cache_max_entries: int = 2048      # 0 disables
+    example_cache_preload: bool = False        # warm the hottest examples at startup
+    example_cache_preload_count: int = 200
+    example_cache_hot_ids_path: str = "example_cache_hot_ids.json"   # written at shutdown
+
+    # Business retrieval re-ranking (additive boosts on the similarity score)
+    retrieval_category_boost: float = 0.15
+    retrieval_tone_boost: float = 0.05         # per matching tone
+    retrieval_region_boost: float = 0.1
+    retrieval_candidate_multiplier: int = 2    # candidates fetched per returned example
+
+    # Bulk ingestion pipeline (NDJSON upload / ingest_examples.py)
+    bulk_ingest_batch_size: int = 64           # records per DB commit / embed / upsert
+    bulk_ingest_queue_depth: int = 4           # batches buffered between stages
+
+    # Index outbox worker (background embed + vector upsert for new examples)
+    index_outbox_batch_size: int = 64
+    index_outbox_poll_seconds: float = 2.0     # idle poll; new rows also wake the worker
+    index_outbox_lease_seconds: float = 120.0  # claimed rows are retried after this if a worker dies
+    index_outbox_max_attempts: int = 8         # then the row stays as a dead letter
+    index_outbox_retry_base_seconds: float = 2.0
+    index_outbox_retry_max_seconds: float = 300.0
+
+    # Streaming pipeline endpoint: heartbeat while an agent step is silent
+    pipeline_stream_heartbeat_seconds: float = 15.0
+
+    # Client-side rate limits per upstream model (0 = unlimited); match your quota tier
+    rate_limit_enabled: bool = True
+    rate_limit_gemini_rpm: int = 1000          # every gemini-* model, each its own bucket
+    rate_limit_gemini_tpm: int = 1_000_000
+    rate_limit_embedding_rpm: int = 3000       # text-embedding-* models
+    rate_limit_embedding_tpm: int = 1_000_000
+    rate_limit_overrides: Dict[str, Dict[str, int]] = {}   # {"gemini-2.5-pro": {"rpm": 150, "tpm": 2000000}}
+    rate_limit_pause_seconds: float = 10.0     # hold a model back after an upstream 429
+
+    # Admission control for /agents pipeline runs (per process)
+    pipeline_max_concurrent: int = 4
+    pipeline_max_per_user: int = 2
+    pipeline_max_queue: int = 16               # beyond this: 429 + Retry-After at once
+    pipeline_queue_timeout_seconds: float = 120.0
+
+    # Background pipeline jobs (POST /jobs, GET /jobs/{id})
+    job_workers: int = 2                       # concurrent pipeline runs per process
+    job_poll_seconds: float = 2.0
+    job_heartbeat_seconds: float = 10.0
+    job_stale_seconds: float = 60.0            # running job without heartbeat → failed
+
+    # ADK sessions for the agents router: "postgres" (shared, pooled) or "memory"
+    session_backend: str = "postgres"
+    session_ttl_seconds: float = 86400.0       # idle sessions are evicted after this
+    session_evict_interval_seconds: float = 600.0
+
+    # Session state compaction: output_key blobs are dropped once their last
+    # reading stage has run (keep_tokens > 0 keeps a truncated summary instead)
+    session_compaction_enabled: bool = True
+    session_compaction_keep_tokens: int = 0
 
     # PostgreSQL (required)
     db_user: str
@@ -27,6 +135,11 @@ class Settings(BaseSettings):
     db_host: str
     db_name: str
 
+    # Async engine pool (shared by the API, workers and the session service)
+    db_pool_size: int = 10
+    db_max_overflow: int = 10
+    db_pool_recycle_seconds: int = 1800
+
     @property
     def database_url(self) -> str:
         return (
@@ -14,7 +14,11 @@ from app.core.config import settings
 engine = create_async_engine(
     settings.database_url,
     echo=False,            # Set True only for debugging SQL
-    future=True
+    future=True,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
+    pool_pre_ping=True,    # drop connections the server / LB closed
+    pool_recycle=settings.db_pool_recycle_seconds,
 )
 
 # -----------------------------
@@ -0,0 +1,66 @@
+# app/db/orm/agent_session.py
+#
+# Storage for app/services/session_store.py (ADK sessions on the app's
+# asyncpg engine). Separate table names from ADK's own DatabaseSessionService
+# ("sessions", "events", ...), which the dev web UI still uses.
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    Float,
+    ForeignKeyConstraint,
+    Index,
+    JSON,
+    String,
+    func,
+)
+from app.db.base import Base
+
+
+class AgentSession(Base):
+    __tablename__ = "agent_sessions"
+
+    app_name = Column(String(128), primary_key=True)
+    user_id = Column(String(128), primary_key=True)
+    id = Column(String(128), primary_key=True)
+
+    state = Column(JSON, nullable=False, default=dict)   # session-scoped keys only
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False, index=True)   # TTL eviction
+
+
+class AgentSessionEvent(Base):
+    __tablename__ = "agent_session_events"
+
+    id = Column(String(128), primary_key=True)
+    app_name = Column(String(128), nullable=False)
+    user_id = Column(String(128), nullable=False)
+    session_id = Column(String(128), nullable=False)
+
+    timestamp = Column(Float, nullable=False)
+    event = Column(JSON, nullable=False)   # Event.model_dump(mode="json", exclude_none=True)
+
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["app_name", "user_id", "session_id"],
+            ["agent_sessions.app_name", "agent_sessions.user_id", "agent_sessions.id"],
+            ondelete="CASCADE",
+        ),
+        Index("ix_agent_session_events_session", "app_name", "user_id", "session_id", "timestamp"),
+    )
+
+
+class AgentAppState(Base):
+    __tablename__ = "agent_app_states"
+
+    app_name = Column(String(128), primary_key=True)
+    state = Column(JSON, nullable=False, default=dict)
+
+
+class AgentUserState(Base):
+    __tablename__ = "agent_user_states"
+
+    app_name = Column(String(128), primary_key=True)
+    user_id = Column(String(128), primary_key=True)
+    state = Column(JSON, nullable=False, default=dict)
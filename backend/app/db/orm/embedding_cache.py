@@ -0,0 +1,15 @@
+# app/db/orm/embedding_cache.py
+
+from sqlalchemy import Column, String, Integer, LargeBinary
+from app.db.base import Base
+
+
+class EmbeddingCacheEntry(Base):
+    """Persistent embedding cache tier: one encoded vector per (model, codec, text hash)."""
+
+    __tablename__ = "embedding_cache"
+
+    key = Column(String(64), primary_key=True)   # sha256(model + codec + normalized text)
+    model = Column(String(100), nullable=False)
+    dim = Column(Integer, nullable=False)
+    vector = Column(LargeBinary, nullable=False)  # see app/utils/vectors.encode
@@ -0,0 +1,28 @@
+# app/db/orm/index_outbox.py
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text, func
+from app.db.base import Base
+
+
+class IndexOutbox(Base):
+    """
+    Transactional outbox: "example X must be (re)indexed".
+    Written in the same transaction as the PromptExample row and drained
+    by app/services/index_outbox.py (embed + vector upsert, with retries).
+    """
+
+    __tablename__ = "index_outbox"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    example_id = Column(
+        String,
+        ForeignKey("prompt_examples.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime(timezone=True), nullable=False, index=True)  # next try / lease expiry
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -0,0 +1,30 @@
+# app/db/orm/pipeline_job.py
+
+from sqlalchemy import Column, DateTime, JSON, String, Text, func
+from app.db.base import Base
+
+
+class PipelineJob(Base):
+    """
+    One video-pipeline run submitted through POST /jobs.
+    Executed by app/services/job_service.py; status survives restarts.
+    """
+
+    __tablename__ = "pipeline_jobs"
+
+    id = Column(String, primary_key=True)
+    user_id = Column(String(255), nullable=False)
+
+    status = Column(String(20), nullable=False, index=True)   # queued | running | succeeded | failed
+    raw_requirements = Column(Text, nullable=False)
+    session_id = Column(String(64), nullable=True)
+
+    current_stage = Column(String(255), nullable=True)
+    stages = Column(JSON, nullable=True)    # {agent: {"first_event_ms", "last_event_ms"}}
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)   # running jobs: liveness
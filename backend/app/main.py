@@ -1,4 +1,6 @@
 # backend/app/main.py
+import asyncio
+
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,6 +8,15 @@ from fastapi.middleware.cors import CORSMiddleware
 from app.core.config import settings
 from app.db.database import engine
 from app.db.base import Base
+from app.services.embedding_service import embedding_service
+from app.services.index_outbox import index_outbox_worker
+from app.services.job_service import job_service
+from app.services.pipeline_service import session_service
+from app.services.rate_limiter import rate_limiter
+from app.services.session_store import PostgresSessionService
+from app.services.vector_store import close_vector_store, init_vector_store
+from app.services.example_cache import example_cache
+from app.tools.example_tools import preload_hot_examples
 
 import os
 os.environ["GOOGLE_ADK_DISABLE_OTEL"] = "true"
@@ -16,12 +27,13 @@ os.environ["OTEL_PYTHON_DISABLED"] = "true"
 # Routers
 from app.api.agents.routes import router as agents_router
 from app.api.examples.routes import router as examples_router
+from app.api.jobs.routes import router as jobs_router
 
 # ADK Web Implementation (Only in developement mode)
 from google.adk.cli.fast_api import get_fast_api_app
 
 # Observability
-from app.observability import configure_logging, get_logger
+from app.observability import configure_logging, get_logger, get_metrics_snapshot
 
 # Configure logging once
 configure_logging()
@@ -50,8 +62,34 @@ async def lifespan_wrapper(app: FastAPI):
     except Exception as e:
         logger.error(f"Error creating database tables: {e}")
 
+    # Resolve the vector index in the background: startup never waits on
+    # (or fails because of) the network
+    warmup = asyncio.create_task(init_vector_store())
+    index_outbox_worker.start()
+    job_service.start()
+    if isinstance(session_service, PostgresSessionService):
+        session_service.start()   # TTL eviction
+
+    if settings.example_cache_preload:
+        try:
+            await preload_hot_examples()
+        except Exception as e:
+            logger.error(f"Example cache preload failed: {e}")
+
     yield
 
+    if settings.example_cache_preload:
+        example_cache.save_hot_ids(
+            settings.example_cache_hot_ids_path, settings.example_cache_preload_count
+        )
+
+    warmup.cancel()
+    await job_service.stop()
+    if isinstance(session_service, PostgresSessionService):
+        await session_service.stop()
+    await index_outbox_worker.stop()
+    await close_vector_store()
+    await embedding_service.aclose()
     logger.info("FastAPI backend shutdown")
 
 ##################################################
@@ -94,6 +132,9 @@ app.include_router(agents_router, prefix="/agents", tags=["Agents"])
 # For vector search
 app.include_router(examples_router, prefix="/examples", tags=["Examples"])
 
+# Background pipeline runs (submit + poll)
+app.include_router(jobs_router, prefix="/jobs", tags=["Jobs"])
+
 # health test
 @app.get("/health")
 def health():
@@ -102,3 +143,15 @@ def health():
         "status": "ok", 
         "env": settings.app_env
         }
+
+
+# In-process counters (LLM/tool calls, embedding cache hits/misses, ...)
+@app.get("/metrics")
+def metrics():
+    return get_metrics_snapshot()
+
+
+# Client-side rate-limit buckets per upstream model (budget left, waiters, throttling)
+@app.get("/metrics/rate-limits")
+def rate_limits():
+    return rate_limiter.snapshot()
@@ -23,6 +23,14 @@ def increment(metric_name: str, amount: int = 1) -> None:
         _METRICS[metric_name] += amount
 
 
+def set_gauge(metric_name: str, value: int) -> None:
+    """
+    Thread-safe overwrite of a point-in-time metric (sizes, queue depths...).
+    """
+    with _LOCK:
+        _METRICS[metric_name] = value
+
+
 def get_metrics_snapshot() -> Dict[str, int]:
     """
     Return a copy of current metrics.
@@ -29,7 +29,7 @@ class ExampleCreateRequest(BaseModel):
     def validate_prompt(self):
         """Ensure at least one form of prompt is provided."""
         has_text = bool(self.prompt_text and self.prompt_text.strip())
-        has_json = self.prompt_json is not None
+        has_json = bool(self.prompt_json)   # {} has nothing to embed
 
         if not (has_text or has_json):
             raise ValueError("Either prompt_text or prompt_json must be provided.")
@@ -0,0 +1,39 @@
+# app/schemas/job_schema.py
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+
+# ---------------------------------------------------------
+# 1. SUBMIT RESPONSE
+# ---------------------------------------------------------
+class JobSubmitResponse(BaseModel):
+    job_id: str
+    status: str
+    status_url: str
+
+
+# ---------------------------------------------------------
+# 2. STATUS — per-stage timings + result when finished
+# ---------------------------------------------------------
+class JobStageTiming(BaseModel):
+    first_event_ms: int
+    last_event_ms: int
+
+
+class JobStatusResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: str
+    status: str
+    session_id: Optional[str] = None
+    current_stage: Optional[str] = None
+    stages: Optional[Dict[str, JobStageTiming]] = None
+    result: Optional[Any] = None
+    error: Optional[str] = None
+
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
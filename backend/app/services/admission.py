@@ -0,0 +1,183 @@
+# app/services/admission.py
+
+import asyncio
+import logging
+import math
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.observability.metrics.metrics_store import increment, set_gauge
+
+logger = logging.getLogger("backend")
+
+
+class AdmissionRejected(Exception):
+    """No slot for this run; the client should retry after `retry_after` seconds."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """A held pipeline slot. `release()` is idempotent."""
+
+    def __init__(self, controller: "AdmissionController", user_id: str):
+        self._controller = controller
+        self.user_id = user_id
+        self.started = time.monotonic()
+        self._released = False
+
+    def release(self) -> None:
+        if not self._released:
+            self._released = True
+            self._controller._release(self)
+
+
+class AdmissionController:
+    """
+    Admission control in front of pipeline runs (per process).
+
+    - At most `max_concurrent` runs at once, and `max_per_user` per user
+    - Runs over the cap wait in a FIFO queue of at most `max_queue`; a
+      waiter whose user is at its cap does not block the users behind it
+    - A full queue (or a user with `max_per_user` runs already waiting)
+      is rejected at once; a waiter not admitted within
+      `queue_timeout_seconds` is rejected too — both with a Retry-After
+      estimated from recent run durations
+
+    Background jobs are bounded separately by JOB_WORKERS.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: Optional[int] = None,
+        max_per_user: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        queue_timeout_seconds: Optional[float] = None,
+    ):
+        self.max_concurrent = max_concurrent or settings.pipeline_max_concurrent
+        self.max_per_user = max_per_user or settings.pipeline_max_per_user
+        self.max_queue = settings.pipeline_max_queue if max_queue is None else max_queue
+        self.queue_timeout_seconds = queue_timeout_seconds or settings.pipeline_queue_timeout_seconds
+
+        self._running = 0
+        self._running_by_user: Dict[str, int] = {}
+        self._waiters: Deque[Tuple[str, asyncio.Future]] = deque()
+        self._avg_run_seconds: Optional[float] = None
+
+    # ------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------
+    async def acquire(self, user_id: str) -> Ticket:
+        """Wait for a slot; raises AdmissionRejected. Release the ticket when done."""
+        if not self._waiters and self._can_run(user_id):
+            self._record_wait(0)
+            return self._grant(user_id)
+
+        if len(self._waiters) >= self.max_queue:
+            self._reject("queue_full")
+            raise AdmissionRejected("Pipeline queue is full", self.retry_after())
+        if sum(1 for u, _ in self._waiters if u == user_id) >= self.max_per_user:
+            self._reject("user_queue_full")
+            raise AdmissionRejected("Too many queued runs for this user", self.retry_after())
+
+        future = asyncio.get_running_loop().create_future()
+        waiter = (user_id, future)
+        self._waiters.append(waiter)
+        queued_at = time.monotonic()
+        self._wake()   # free slot held back only by capped users ahead
+
+        try:
+            ticket = await asyncio.wait_for(future, timeout=self.queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            if future.done() and not future.cancelled():
+                future.result().release()
+            self._forget(waiter)
+            self._reject("queue_timeout")
+            raise AdmissionRejected("Timed out waiting for a pipeline slot", self.retry_after())
+        except asyncio.CancelledError:
+            # Slot granted just as the client went away: hand it on
+            if future.done() and not future.cancelled():
+                future.result().release()
+            self._forget(waiter)
+            raise
+
+        self._record_wait(int((time.monotonic() - queued_at) * 1000))
+        return ticket
+
+    def retry_after(self) -> int:
+        """Seconds until the current queue has likely drained enough for one more run."""
+        per_run = self._avg_run_seconds or self.queue_timeout_seconds
+        waves = (len(self._waiters) + 1) / self.max_concurrent
+        return max(1, math.ceil(per_run * waves))
+
+    # ------------------------------------------------------------
+    # HELPERS
+    # ------------------------------------------------------------
+    def _can_run(self, user_id: str) -> bool:
+        return (
+            self._running < self.max_concurrent
+            and self._running_by_user.get(user_id, 0) < self.max_per_user
+        )
+
+    def _grant(self, user_id: str) -> Ticket:
+        self._running += 1
+        self._running_by_user[user_id] = self._running_by_user.get(user_id, 0) + 1
+        increment("pipeline_admitted_total")
+        self._update_gauges()
+        return Ticket(self, user_id)
+
+    def _release(self, ticket: Ticket) -> None:
+        self._running -= 1
+        left = self._running_by_user.get(ticket.user_id, 1) - 1
+        if left:
+            self._running_by_user[ticket.user_id] = left
+        else:
+            self._running_by_user.pop(ticket.user_id, None)
+
+        elapsed = time.monotonic() - ticket.started
+        self._avg_run_seconds = (
+            elapsed if self._avg_run_seconds is None else 0.8 * self._avg_run_seconds + 0.2 * elapsed
+        )
+        self._wake()
+
+    def _wake(self) -> None:
+        """Admit waiters in FIFO order, skipping users that are at their cap."""
+        for waiter in list(self._waiters):
+            if self._running >= self.max_concurrent:
+                break
+            user_id, future = waiter
+            if future.done():
+                self._waiters.remove(waiter)
+            elif self._can_run(user_id):
+                self._waiters.remove(waiter)
+                future.set_result(self._grant(user_id))
+        self._update_gauges()
+
+    def _forget(self, waiter: Tuple[str, asyncio.Future]) -> None:
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        self._update_gauges()
+
+    def _record_wait(self, wait_ms: int) -> None:
+        increment("pipeline_queue_wait_ms_total", wait_ms)
+        set_gauge("pipeline_queue_wait_last_ms", wait_ms)
+
+    def _reject(self, reason: str) -> None:
+        increment("pipeline_rejected_total")
+        increment(f"pipeline_rejected_{reason}_total")
+        logger.warning(
+            f"⚠️ [ADMISSION] Rejected ({reason}): {self._running} running, {len(self._waiters)} queued"
+        )
+
+    def _update_gauges(self) -> None:
+        set_gauge("pipeline_running", self._running)
+        set_gauge("pipeline_queued", len(self._waiters))
+
+
+admission_controller = AdmissionController()
@@ -0,0 +1,121 @@
+# app/services/context_packer.py
+
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.observability.metrics.metrics_store import increment
+from app.utils.tokens import count_tokens, truncate_tokens
+
+logger = logging.getLogger("backend")
+
+_EMPTY = (None, "", [], {})
+
+
+def compact_json(value: Any) -> str:
+    """The JSON form examples are injected into prompts with."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class ExampleContextPacker:
+    """
+    Fits retrieved examples into a token budget before they reach a prompt.
+
+    1. Nulls, empty strings / lists / objects are stripped (recursively)
+    2. prompt_text is dropped when prompt_json carries the same example
+    3. Long strings and lists are capped; if the set is still over budget
+       the caps are halved until `min_string_tokens`
+    4. Still over: lowest-ranked examples are dropped (the first one stays)
+
+    Examples keep their order (best first); ids and titles are never cut.
+    """
+
+    def __init__(
+        self,
+        budget_tokens: int,
+        max_string_tokens: int,
+        max_list_items: int,
+        min_string_tokens: int = 32,
+    ):
+        self.budget_tokens = budget_tokens
+        self.max_string_tokens = max_string_tokens
+        self.max_list_items = max_list_items
+        self.min_string_tokens = min_string_tokens
+
+    def pack(self, examples: List[Dict], budget_tokens: Optional[int] = None) -> List[Dict]:
+        budget = budget_tokens or self.budget_tokens
+        if not examples or budget <= 0:
+            return examples
+
+        cleaned = [self._clean_example(ex) for ex in examples]
+        tokens_in = sum(count_tokens(compact_json(ex)) for ex in examples)
+
+        cap, items = self.max_string_tokens, self.max_list_items
+        while True:
+            packed = [self._shrink(ex, cap, items, top=True) for ex in cleaned]
+            sizes = [count_tokens(compact_json(ex)) for ex in packed]
+            if sum(sizes) <= budget or cap <= self.min_string_tokens:
+                break
+            cap = max(cap // 2, self.min_string_tokens)
+            items = max(items // 2, 1)
+
+        while sum(sizes) > budget and len(packed) > 1:
+            packed.pop()
+            sizes.pop()
+
+        tokens_out = sum(sizes)
+        increment("context_packer_tokens_in_total", tokens_in)
+        increment("context_packer_tokens_out_total", tokens_out)
+        logger.info(
+            f"🟦 [CONTEXT] Packed {len(packed)}/{len(examples)} examples: "
+            f"{tokens_in} → {tokens_out} tokens (budget {budget})"
+        )
+        return packed
+
+    # ------------------------------------------------------------
+    # HELPERS
+    # ------------------------------------------------------------
+    def _clean_example(self, example: Dict) -> Dict:
+        example = _strip_empty(example) or {}
+        if "prompt_json" in example and "prompt_text" in example:
+            example.pop("prompt_text")   # same example twice: keep the structured form
+        return example
+
+    def _shrink(self, value: Any, cap: int, items: int, top: bool = False) -> Any:
+        if isinstance(value, str):
+            return truncate_tokens(value, cap)
+
+        if isinstance(value, list):
+            kept = [self._shrink(v, cap, items) for v in value[:items]]
+            if len(value) > items:
+                kept.append(f"… (+{len(value) - items} more)")
+            return kept
+
+        if isinstance(value, dict):
+            return {
+                # ids and titles are short and identify the example: never cut
+                k: v if top and k in ("id", "title") else self._shrink(v, cap, items)
+                for k, v in value.items()
+            }
+
+        return value
+
+
+def _strip_empty(value: Any) -> Any:
+    if isinstance(value, dict):
+        cleaned = {k: _strip_empty(v) for k, v in value.items()}
+        return {k: v for k, v in cleaned.items() if v not in _EMPTY}
+    if isinstance(value, list):
+        cleaned = [_strip_empty(v) for v in value]
+        return [v for v in cleaned if v not in _EMPTY]
+    if isinstance(value, str):
+        return value.strip()
+    return value
+
+
+example_context_packer = ExampleContextPacker(
+    budget_tokens=settings.example_context_budget_tokens,
+    max_string_tokens=settings.example_context_max_string_tokens,
+    max_list_items=settings.example_context_max_list_items,
+)
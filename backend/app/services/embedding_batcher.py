@@ -0,0 +1,105 @@
+# app/services/embedding_batcher.py
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional, Set, Tuple
+
+from app.observability.metrics.metrics_store import increment
+from app.utils.vectors import Vector
+
+logger = logging.getLogger("backend")
+
+EmbedManyFn = Callable[[List[str]], Awaitable[List[Vector]]]
+
+
+class EmbeddingBatcher:
+    """
+    Micro-batching coalescer for single-text embedding calls.
+
+    Concurrent `embed(text)` calls that arrive within `max_wait_ms` of the
+    first pending call are grouped into ONE `embed_many(texts)` call
+    (flushed early once `max_batch_size` texts are waiting).
+
+    At most `max_concurrent_batches` batches are in flight; while upstream is
+    saturated new calls keep accumulating, so batches grow with load.
+
+    - Identical texts inside a batch are embedded only once
+    - A failed batch fails every caller waiting on it
+    - Cancelled callers are simply skipped when results arrive
+    """
+
+    def __init__(
+        self,
+        embed_many: EmbedManyFn,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        max_concurrent_batches: int = 4,
+    ):
+        self._embed_many = embed_many
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_concurrent_batches = max_concurrent_batches
+        self._in_flight = 0
+
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def embed(self, text: str) -> Vector:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    # ------------------------------------------------------------
+    # INTERNAL
+    # ------------------------------------------------------------
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+
+        loop = asyncio.get_running_loop()
+
+        while self._pending and self._in_flight < self.max_concurrent_batches:
+            batch = self._pending[: self.max_batch_size]
+            self._pending = self._pending[self.max_batch_size :]
+            self._in_flight += 1
+
+            # Keep a reference so the task is not garbage-collected mid-flight
+            task = loop.create_task(self._run_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]) -> None:
+        unique_texts = list(dict.fromkeys(text for text, _ in batch))
+
+        increment("embedding_batches_total")
+        increment("embedding_batched_texts_total", len(batch))
+        logger.debug(
+            "Embedding batch: %d calls → %d unique texts", len(batch), len(unique_texts)
+        )
+
+        try:
+            vectors = await self._embed_many(unique_texts)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            # Free the slot and send whatever piled up while we were busy
+            self._in_flight -= 1
+            if self._pending:
+                self._flush()
+
+        by_text = dict(zip(unique_texts, vectors))
+        for text, future in batch:
+            if not future.done():
+                future.set_result(by_text[text])
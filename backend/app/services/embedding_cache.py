@@ -0,0 +1,260 @@
+# app/services/embedding_cache.py
+
+import asyncio
+import hashlib
+import logging
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.config import settings
+from app.observability.metrics.metrics_store import increment, set_gauge
+from app.utils.vectors import Vector, VectorLike, decode, encode
+
+logger = logging.getLogger("backend")
+
+# Rough per-entry bookkeeping cost (key string + OrderedDict node + bytes header)
+_ENTRY_OVERHEAD_BYTES = 200
+
+
+# ------------------------------------------------------------
+# KEYING
+# ------------------------------------------------------------
+def normalize_text(text: str) -> str:
+    """Unicode NFC + collapse all whitespace runs + strip."""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def cache_key(model: str, text: str, codec: str = "float32") -> str:
+    """Content address of an embedding: sha256(model, codec, normalized text)."""
+    payload = f"{model}\x00{codec}\x00{normalize_text(text)}".encode("utf-8")
+    return hashlib.sha256(payload).hexdigest()
+
+
+# ------------------------------------------------------------
+# TIER 1 — IN-PROCESS LRU (byte budget)
+# ------------------------------------------------------------
+class LruByteCache:
+    """LRU of encoded vector blobs bounded by total bytes, not entry count."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.bytes_used = 0
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        blob = self._entries.get(key)
+        if blob is not None:
+            self._entries.move_to_end(key)
+        return blob
+
+    def put(self, key: str, blob: bytes) -> None:
+        size = self._size(blob)
+        if size > self.max_bytes:
+            return
+
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes_used -= self._size(old)
+
+        self._entries[key] = blob
+        self.bytes_used += size
+
+        while self.bytes_used > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.bytes_used -= self._size(evicted)
+            increment("embedding_cache_evictions_total")
+
+        set_gauge("embedding_cache_bytes", self.bytes_used)
+        set_gauge("embedding_cache_entries", len(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.bytes_used = 0
+
+    @staticmethod
+    def _size(blob: bytes) -> int:
+        return len(blob) + _ENTRY_OVERHEAD_BYTES
+
+
+# ------------------------------------------------------------
+# TIER 2 — PERSISTENT STORES (encoded blobs)
+# ------------------------------------------------------------
+class SqliteEmbeddingStore:
+    """Local SQLite file. Calls run in a worker thread to keep the loop free."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache ("
+            " key TEXT PRIMARY KEY, model TEXT NOT NULL,"
+            " dim INTEGER NOT NULL, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, bytes]:
+        return await asyncio.to_thread(self._get_many, list(keys))
+
+    async def put_many(self, model: str, items: Dict[str, bytes], dim: int) -> None:
+        await asyncio.to_thread(self._put_many, model, items, dim)
+
+    def _get_many(self, keys: List[str]) -> Dict[str, bytes]:
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, vector FROM embedding_cache WHERE key IN ({placeholders})",
+                keys,
+            ).fetchall()
+        return {key: blob for key, blob in rows}
+
+    def _put_many(self, model: str, items: Dict[str, bytes], dim: int) -> None:
+        rows = [(k, model, dim, blob) for k, blob in items.items()]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO embedding_cache (key, model, dim, vector)"
+                " VALUES (?, ?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+
+class PostgresEmbeddingStore:
+    """`embedding_cache` table in the application database (asyncpg engine)."""
+
+    def __init__(self):
+        # Imported lazily so the memory/sqlite tiers don't need DB settings
+        from app.db.database import async_session
+        from app.db.orm.embedding_cache import EmbeddingCacheEntry
+
+        self._session_factory = async_session
+        self._model = EmbeddingCacheEntry
+
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, bytes]:
+        if not keys:
+            return {}
+        async with self._session_factory() as session:
+            result = await session.execute(
+                select(self._model.key, self._model.vector).where(
+                    self._model.key.in_(list(keys))
+                )
+            )
+            return {key: blob for key, blob in result.all()}
+
+    async def put_many(self, model: str, items: Dict[str, bytes], dim: int) -> None:
+        if not items:
+            return
+        rows = [
+            {"key": k, "model": model, "dim": dim, "vector": blob}
+            for k, blob in items.items()
+        ]
+        async with self._session_factory() as session:
+            await session.execute(
+                pg_insert(self._model).values(rows).on_conflict_do_nothing()
+            )
+            await session.commit()
+
+
+# ------------------------------------------------------------
+# FACADE
+# ------------------------------------------------------------
+class EmbeddingCache:
+    """
+    Two-tier, content-addressed embedding cache.
+
+    Lookup order: in-process LRU → persistent store (optional) → miss.
+    Persistent hits are promoted into the LRU. A broken persistent tier
+    is logged and treated as a miss — it never fails the embedding call.
+
+    Vectors are stored encoded with `codec` (float32 | int8 | binary, see
+    app/utils/vectors.py); int8 cuts cache memory/storage 4x.
+    """
+
+    def __init__(self, max_bytes: int, store=None, codec: str = "float32"):
+        self.memory = LruByteCache(max_bytes)
+        self.store = store
+        self.codec = codec
+
+    async def get_many(self, model: str, texts: Sequence[str]) -> Dict[str, Vector]:
+        """Return {text: vector} for every text already cached."""
+        keys = {text: cache_key(model, text, self.codec) for text in texts}
+
+        found: Dict[str, Vector] = {}
+        missing: Dict[str, str] = {}
+        for text, key in keys.items():
+            blob = self.memory.get(key)
+            if blob is not None:
+                found[text] = decode(blob, self.codec)
+            else:
+                missing[key] = text
+
+        if missing and self.store is not None:
+            try:
+                blobs = await self.store.get_many(list(missing))
+            except Exception as e:
+                logger.warning(f"Embedding cache store read failed: {e}")
+                blobs = {}
+
+            for key, blob in blobs.items():
+                self.memory.put(key, blob)
+                found[missing.pop(key)] = decode(blob, self.codec)
+
+            increment("embedding_cache_store_hits_total", len(blobs))
+
+        increment("embedding_cache_hits_total", len(found))
+        increment("embedding_cache_misses_total", len(missing))
+        return found
+
+    async def put_many(self, model: str, vectors: Dict[str, VectorLike]) -> None:
+        if not vectors:
+            return
+
+        items = {
+            cache_key(model, text, self.codec): encode(vector, self.codec)
+            for text, vector in vectors.items()
+        }
+        for key, blob in items.items():
+            self.memory.put(key, blob)
+
+        if self.store is not None:
+            dim = len(next(iter(vectors.values())))
+            try:
+                await self.store.put_many(model, items, dim)
+            except Exception as e:
+                logger.warning(f"Embedding cache store write failed: {e}")
+
+
+def build_embedding_cache() -> Optional[EmbeddingCache]:
+    """Create the cache described by settings (None when disabled)."""
+    backend = settings.embedding_cache_backend.lower()
+
+    if backend in ("", "none", "off"):
+        return None
+
+    if backend == "memory":
+        store = None
+    elif backend == "sqlite":
+        store = SqliteEmbeddingStore(settings.embedding_cache_sqlite_path)
+    elif backend == "postgres":
+        store = PostgresEmbeddingStore()
+    else:
+        raise ValueError(f"Unknown EMBEDDING_CACHE_BACKEND: {backend}")
+
+    logger.info(
+        f"Embedding cache enabled (backend={backend}, codec={settings.embedding_cache_codec})"
+    )
+    return EmbeddingCache(
+        settings.embedding_cache_max_bytes, store, codec=settings.embedding_cache_codec
+    )
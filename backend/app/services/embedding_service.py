@@ -1,20 +1,108 @@
-from openai import OpenAI
+import asyncio
+import httpx
+from openai import AsyncOpenAI, RateLimitError
 from app.core.config import settings
-from typing import List
+from app.services.embedding_batcher import EmbeddingBatcher
+from app.services.embedding_cache import EmbeddingCache, build_embedding_cache
+from app.services.rate_limiter import rate_limiter
+from app.utils.tokens import count_tokens
+from app.utils.vectors import Vector, from_base64, to_vector
+from typing import List, Optional
 import logging
 
 logger = logging.getLogger("backend")
 
-# Initialize OpenAI client
-client = OpenAI(api_key=settings.openai_api_key)
-
 EMBED_MODEL = "text-embedding-3-large"
 
 
 class EmbeddingService:
-    """Wrapper around OpenAI embeddings with unified async API."""
+    """
+    Wrapper around OpenAI embeddings with unified async API.
+
+    - Uses AsyncOpenAI so embedding calls never block the event loop
+    - One shared HTTP connection pool per service instance
+    - Bounded concurrency (semaphore) + per-request timeout
+    - Requests wait for the model's shared rate-limit budget (rate_limiter)
+    - `base_url` can point at any OpenAI-compatible server (e.g. a local stub)
+    - `generate_embeddings` embeds many texts per upstream request
+    - `get_embedding` coalesces concurrent single-text calls into batches
+    - `get_embedding(s)` are served from a content-addressed cache when possible
+    - Vectors are returned as float32 NumPy arrays (see app/utils/vectors.py)
+    """
+
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        model: str = EMBED_MODEL,
+        dimensions: Optional[int] = None,
+        max_concurrency: Optional[int] = None,
+        max_connections: Optional[int] = None,
+        timeout: Optional[float] = None,
+        max_batch_size: Optional[int] = None,
+        batch_window_ms: Optional[float] = None,
+        cache: Optional[EmbeddingCache] = None,
+    ):
+        self.api_key = api_key if api_key is not None else settings.openai_api_key
+        self.base_url = base_url or settings.openai_base_url
+        self.model = model
+        self.dimensions = dimensions or settings.embedding_dimensions
+        # Cache namespace: vectors of different sizes must never mix
+        self.cache_namespace = f"{self.model}:{self.dimensions}"
+        self.max_connections = max_connections or settings.embedding_max_connections
+        self.timeout = timeout or settings.embedding_timeout_seconds
+        self.max_batch_size = max_batch_size or settings.embedding_batch_max_size
+
+        self.max_concurrency = max_concurrency or settings.embedding_max_concurrency
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._client: Optional[AsyncOpenAI] = None
+        self.cache = cache or build_embedding_cache()
+
+        # Micro-batching for single-text calls (window <= 0 disables it)
+        window_ms = (
+            batch_window_ms
+            if batch_window_ms is not None
+            else settings.embedding_batch_window_ms
+        )
+        self._batcher: Optional[EmbeddingBatcher] = (
+            EmbeddingBatcher(
+                self.generate_embeddings,
+                max_batch_size=self.max_batch_size,
+                max_wait_ms=window_ms,
+                max_concurrent_batches=self.max_concurrency,
+            )
+            if window_ms > 0
+            else None
+        )
+
+    # ------------------------------------------------------------
+    # CLIENT (created lazily on first use, shared afterwards)
+    # ------------------------------------------------------------
+    @property
+    def client(self) -> AsyncOpenAI:
+        if self._client is None:
+            http_client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                ),
+                timeout=httpx.Timeout(self.timeout),
+            )
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=self.timeout,
+                http_client=http_client,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP connection pool (call on app shutdown)."""
+        if self._client is not None:
+            await self._client.close()
+            self._client = None
 
-    async def generate_embedding(self, text: str) -> List[float]:
+    async def generate_embedding(self, text: str) -> Vector:
         """
         Generate embedding for text using OpenAI API.
         """
@@ -24,21 +112,108 @@ class EmbeddingService:
 
             logger.info("Generating embedding via OpenAI...")
 
-            response = client.embeddings.create(
-                model=EMBED_MODEL,
-                input=text
-            )
-
-            embedding = response.data[0].embedding
-            return embedding
+            vectors = await self._embed_chunk([text])
+            return vectors[0]
 
         except Exception as e:
             logger.error(f"Embedding generation failed: {e}")
             raise
 
-    # Alias for backward compatibility
-    async def get_embedding(self, text: str) -> List[float]:
-        return await self.generate_embedding(text)
+    async def generate_embeddings(self, texts: List[str]) -> List[Vector]:
+        """
+        Generate embeddings for many texts.
+        Sends one upstream request per `max_batch_size` chunk; output order
+        matches input order.
+        """
+        if not texts:
+            return []
+
+        try:
+            if any(not t or not t.strip() for t in texts):
+                raise ValueError("Text for embedding is empty.")
+
+            logger.info(f"Generating {len(texts)} embeddings via OpenAI...")
+
+            chunks = [
+                texts[i : i + self.max_batch_size]
+                for i in range(0, len(texts), self.max_batch_size)
+            ]
+            results = await asyncio.gather(*(self._embed_chunk(c) for c in chunks))
+
+            return [vector for chunk in results for vector in chunk]
+
+        except Exception as e:
+            logger.error(f"Batch embedding generation failed: {e}")
+            raise
+
+    async def _embed_chunk(self, texts: List[str]) -> List[Vector]:
+        estimated = sum(count_tokens(t) for t in texts)
+        await rate_limiter.acquire(self.model, estimated)
+
+        async with self._semaphore:
+            try:
+                response = await self.client.embeddings.create(
+                    model=self.model,
+                    input=texts,
+                    dimensions=self.dimensions,
+                    encoding_format="base64",  # raw float32 bytes, no boxed floats
+                    timeout=self.timeout,
+                )
+            except RateLimitError:
+                rate_limiter.pause(self.model)
+                raise
+
+        usage = getattr(response, "usage", None)
+        rate_limiter.settle(self.model, estimated, usage.prompt_tokens if usage else None)
+
+        # The API tags each item with its input index; don't rely on ordering
+        data = sorted(response.data, key=lambda d: d.index)
+        return [
+            from_base64(d.embedding) if isinstance(d.embedding, str) else to_vector(d.embedding)
+            for d in data
+        ]
+
+    async def get_embedding(self, text: str) -> Vector:
+        """
+        Preferred single-text entrypoint:
+        cache lookup first, then (on a miss) concurrent callers are coalesced
+        into one upstream request when batching is enabled.
+        """
+        if not text or not text.strip():
+            raise ValueError("Text for embedding is empty.")
+
+        if self.cache is not None:
+            cached = await self.cache.get_many(self.cache_namespace, [text])
+            if text in cached:
+                return cached[text]
+
+        if self._batcher is None:
+            embedding = await self.generate_embedding(text)
+        else:
+            embedding = await self._batcher.embed(text)
+
+        if self.cache is not None:
+            await self.cache.put_many(self.cache_namespace, {text: embedding})
+
+        return embedding
+
+    async def get_embeddings(self, texts: List[str]) -> List[Vector]:
+        """
+        Cached variant of `generate_embeddings`: only cache misses are sent
+        upstream (deduplicated, in one batch). Output order matches input.
+        """
+        if self.cache is None:
+            return await self.generate_embeddings(texts)
+
+        cached = await self.cache.get_many(self.cache_namespace, texts)
+        missing = list(dict.fromkeys(t for t in texts if t not in cached))
+
+        fresh = {}
+        if missing:
+            fresh = dict(zip(missing, await self.generate_embeddings(missing)))
+            await self.cache.put_many(self.cache_namespace, fresh)
+
+        return [fresh[t] if t in fresh else cached[t] for t in texts]
 
 
 # Singleton instance
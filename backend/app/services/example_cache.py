@@ -0,0 +1,101 @@
+# app/services/example_cache.py
+
+import json
+import logging
+import os
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, List, Tuple
+
+from app.core.config import settings
+from app.observability.metrics.metrics_store import increment, set_gauge
+
+logger = logging.getLogger("backend")
+
+
+class ExamplePayloadCache:
+    """
+    Read-through cache of serialized PromptExample payloads, keyed by id.
+
+    - LRU, bounded by entry count (payloads are small dicts)
+    - Writers call `invalidate()` after committing example rows
+    - Per-id hit counts feed `save_hot_ids()` / the optional startup preload
+    - Cached payloads are shared: callers must not mutate them
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._hits: Counter = Counter()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, ids: Iterable[str]) -> Tuple[Dict[str, Dict], List[str]]:
+        """Return ({id: payload} for hits, [ids to load])."""
+        found: Dict[str, Dict] = {}
+        missing: List[str] = []
+
+        for example_id in ids:
+            payload = self._entries.get(example_id)
+            if payload is None:
+                missing.append(example_id)
+            else:
+                self._entries.move_to_end(example_id)
+                self._hits[example_id] += 1
+                found[example_id] = payload
+
+        increment("example_cache_hits_total", len(found))
+        increment("example_cache_misses_total", len(missing))
+        return found, missing
+
+    def put_many(self, payloads: Iterable[Dict]) -> None:
+        if self.max_entries <= 0:
+            return
+
+        for payload in payloads:
+            self._entries[payload["id"]] = payload
+            self._entries.move_to_end(payload["id"])
+
+        while len(self._entries) > self.max_entries:
+            evicted, _ = self._entries.popitem(last=False)
+            self._hits.pop(evicted, None)
+            increment("example_cache_evictions_total")
+
+        set_gauge("example_cache_entries", len(self._entries))
+
+    def invalidate(self, ids: Iterable[str]) -> None:
+        for example_id in ids:
+            self._entries.pop(example_id, None)
+        set_gauge("example_cache_entries", len(self._entries))
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._hits.clear()
+        set_gauge("example_cache_entries", 0)
+
+    # ------------------------------------------------------------
+    # HOT SET (optional preload across restarts)
+    # ------------------------------------------------------------
+    def hot_ids(self, n: int) -> List[str]:
+        return [example_id for example_id, _ in self._hits.most_common(n)]
+
+    def save_hot_ids(self, path: str, n: int) -> None:
+        ids = self.hot_ids(n)
+        if not ids:
+            return
+
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(ids, f)
+        os.replace(tmp_path, path)
+        logger.info(f"🟩 [EXAMPLE CACHE] Saved {len(ids)} hot example ids to {path}")
+
+    @staticmethod
+    def load_hot_ids(path: str) -> List[str]:
+        if not os.path.exists(path):
+            return []
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+example_cache = ExamplePayloadCache(max_entries=settings.example_cache_max_entries)
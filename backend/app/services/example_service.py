@@ -1,19 +1,28 @@
 # app/services/example_service.py
 
+import asyncio
 import logging
 import uuid
-from typing import List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import selectinload
 
+from app.core.config import settings
 from app.db.orm.prompt_example import PromptExample
 from app.db.orm.tag import Tag
 from app.db.orm.example_tag import ExampleTag
 
+from app.observability.metrics.metrics_store import increment
+
 from app.services.embedding_service import embedding_service
-from app.services.pinecone_service import pinecone_service
+from app.services.index_outbox import index_outbox_worker
+from app.services.example_cache import example_cache
+from app.services.lexical_index import lexical_index, reciprocal_rank_fusion
+from app.services.search_cache import search_cache
+from app.services.vector_store import VectorMatch, get_vector_store
 
 from app.schemas.example_schema import ExampleSearchResult
 
@@ -24,7 +33,7 @@ logger = logging.getLogger("backend")
 class ExampleService:
 
     # ------------------------------------------------------------
-    # CREATE EXAMPLE (DB + Pinecone)
+    # CREATE EXAMPLE (DB + outbox → vector index)
     # ------------------------------------------------------------
     async def create_example(
         self,
@@ -42,10 +51,11 @@ class ExampleService:
         example_id = str(uuid.uuid4())
 
         # -------------------------------------------------------------------
-        # (1) Store example in PostgreSQL
+        # (1) + (2) Store example and its tags in PostgreSQL
         # -------------------------------------------------------------------
-        db_example = PromptExample(
-            id=example_id,
+        await self.add_example_rows(
+            db,
+            example_id=example_id,
             title=title,
             prompt_text=prompt_text,
             prompt_json=prompt_json,
@@ -53,70 +63,159 @@ class ExampleService:
             ad_style=ad_style,
             tone=tone,
             target_audience=target_audience,
+            tags=tags,
         )
 
-        db.add(db_example)
-
         # -------------------------------------------------------------------
-        # (2) Store tags
+        # (3) Queue embedding + vector upsert in the SAME transaction
+        #     (drained in the background by the index outbox worker)
         # -------------------------------------------------------------------
-        tag_ids = []
-        for tag_name in tags:
-            clean = tag_name.lower().strip()
-            result = await db.execute(select(Tag).where(Tag.name == clean))
-            tag_obj = result.scalars().first()
+        await index_outbox_worker.enqueue(db, [example_id])
 
-            if not tag_obj:
-                tag_obj = Tag(name=clean)
-                db.add(tag_obj)
+        await db.commit()
+        example_cache.invalidate([example_id])
+        search_cache.bump_version()
+        index_outbox_worker.notify()
 
-            await db.flush()
-            tag_ids.append(tag_obj.id)
+        return example_id
 
-        # insert example → tags relationship
-        for tag_id in tag_ids:
-            db.add(ExampleTag(example_id=example_id, tag_id=tag_id))
+    # ------------------------------------------------------------
+    # BUILDING BLOCKS (shared with bulk ingestion)
+    # ------------------------------------------------------------
+    async def add_example_rows(
+        self,
+        db: AsyncSession,
+        example_id: str,
+        title: str,
+        prompt_text: Optional[str],
+        prompt_json: Optional[dict],
+        business_type: Optional[str],
+        ad_style: Optional[str],
+        tone: Optional[str],
+        target_audience: Optional[str],
+        tags: List[str],
+    ) -> None:
+        """
+        Insert PromptExample + tags + example_tags rows.
+        Does NOT commit — the caller owns the transaction.
+        """
+
+        await self.add_examples(
+            db,
+            [
+                {
+                    "id": example_id,
+                    "title": title,
+                    "prompt_text": prompt_text,
+                    "prompt_json": prompt_json,
+                    "business_type": business_type,
+                    "ad_style": ad_style,
+                    "tone": tone,
+                    "target_audience": target_audience,
+                }
+            ],
+        )
+        await self.link_tags(db, {example_id: tags})
+
+    async def add_examples(self, db: AsyncSession, rows: List[dict]) -> None:
+        """Insert prompt_examples rows (column dicts) in one executemany."""
+        if rows:
+            await db.execute(insert(PromptExample), rows)
+
+    async def link_tags(self, db: AsyncSession, tags_by_example: Dict[str, List[str]]) -> None:
+        """
+        Attach tags to examples: one tag upsert for every distinct name,
+        then one bulk insert into example_tags — independent of tag count.
+        """
+
+        clean_by_example = {
+            example_id: {self.clean_tag(t) for t in tags} - {""}
+            for example_id, tags in tags_by_example.items()
+        }
 
-        await db.commit()
+        all_names = set().union(*clean_by_example.values()) if clean_by_example else set()
+        if not all_names:
+            return
 
-        # -------------------------------------------------------------------
-        # (3) Generate Embedding (text OR JSON)
-        # -------------------------------------------------------------------
-        embedding_input = (
+        tag_ids = await self.resolve_tag_ids(db, all_names)
+
+        await db.execute(
+            insert(ExampleTag),
+            [
+                {"example_id": example_id, "tag_id": tag_ids[name]}
+                for example_id, names in clean_by_example.items()
+                for name in names
+            ],
+        )
+
+    async def resolve_tag_ids(self, db: AsyncSession, names: Iterable[str]) -> Dict[str, str]:
+        """
+        Return {name: tag_id}, creating missing tags.
+
+        INSERT ... ON CONFLICT DO NOTHING RETURNING hands back the rows it
+        created; names that already existed (or were created concurrently)
+        are picked up by a single follow-up SELECT.
+        """
+
+        names = sorted(set(names))   # stable order → consistent lock order
+        if not names:
+            return {}
+
+        result = await db.execute(
+            pg_insert(Tag)
+            .values([{"id": str(uuid.uuid4()), "name": name} for name in names])
+            .on_conflict_do_nothing(index_elements=[Tag.name])
+            .returning(Tag.name, Tag.id)
+        )
+        tag_ids = dict(result.all())
+
+        missing = [name for name in names if name not in tag_ids]
+        if missing:
+            result = await db.execute(
+                select(Tag.name, Tag.id).where(Tag.name.in_(missing))
+            )
+            tag_ids.update(result.all())
+
+        return tag_ids
+
+    @staticmethod
+    def clean_tag(name: str) -> str:
+        return name.lower().strip()
+
+    @staticmethod
+    def build_embedding_input(
+        prompt_text: Optional[str], prompt_json: Optional[dict]
+    ) -> str:
+        return (
             prompt_text
             if prompt_text
             else (str(prompt_json) if prompt_json else "")
         )
 
-
-        embedding = await embedding_service.get_embedding(embedding_input)
-
-        # -------------------------------------------------------------------
-        # (4) Upsert into Pinecone
-        # -------------------------------------------------------------------
-        metadata = {
+    @staticmethod
+    def build_vector_metadata(
+        example_id: str,
+        title: str,
+        prompt_json: Optional[dict],
+        business_type: Optional[str],
+        ad_style: Optional[str],
+        tone: Optional[str],
+        target_audience: Optional[str],
+        tags: List[str],
+    ) -> dict:
+        return {
             "id": example_id,
             "title": title,
             "business_type": business_type or "",
             "ad_style": ad_style or "",
             "tone": tone or "",
             "target_audience": target_audience or "",
-            "tags": tags,                    # OK: list of strings
+            "tags": sorted({ExampleService.clean_tag(t) for t in tags} - {""}),
             "has_json": bool(prompt_json),   # boolean is allowed
         }
 
-
-
-        await pinecone_service.upsert_example(
-            example_id=example_id,
-            embedding=embedding,
-            metadata=metadata,
-        )
-
-        return example_id
-
     # ------------------------------------------------------------
-    # 🔍 SEARCH EXAMPLES (semantic + metadata filters)
+    # 🔍 SEARCH EXAMPLES (semantic + lexical + metadata filters)
     # ------------------------------------------------------------
     async def search_examples(
         self,
@@ -130,9 +229,6 @@ class ExampleService:
         top_k: int = 5,
     ) -> List[ExampleSearchResult]:
 
-        logger.info("🔍 Embedding search query...")
-        embedding = await embedding_service.get_embedding(query)
-
         # Build metadata filter for Pinecone
         pinecone_filter = {}
 
@@ -145,14 +241,13 @@ class ExampleService:
         if target_audience:
             pinecone_filter["target_audience"] = target_audience
         if tags:
-            pinecone_filter["tags"] = {"$in": tags}
+            pinecone_filter["tags"] = {"$in": [self.clean_tag(t) for t in tags]}
 
-        # 🔍 Query Pinecone
-        matches = await pinecone_service.query_examples(
-            embedding=embedding,
-            top_k=top_k,
-            metadata_filter=pinecone_filter,
-        )
+        # 🔍 Vector index (result cache first), fused with BM25 when enabled
+        if settings.hybrid_search_enabled:
+            matches = await self.hybrid_matches(query, top_k, pinecone_filter)
+        else:
+            matches = await self.find_matches(query, top_k, pinecone_filter)
 
         if not matches:
             return []
@@ -198,5 +293,92 @@ class ExampleService:
 
         return final_results
 
+    # ------------------------------------------------------------
+    # HYBRID MATCHES (BM25 + vector, reciprocal rank fusion)
+    # ------------------------------------------------------------
+    async def hybrid_matches(
+        self,
+        query: str,
+        top_k: int = 5,
+        metadata_filter: Optional[dict] = None,
+    ) -> List[VectorMatch]:
+        """
+        Order candidates by fusing lexical and vector rankings with RRF.
+        `score` stays the vector (cosine) similarity, as in plain vector
+        search: RRF values are only ~1/k apart and would drown in re-ranking
+        boosts.
+
+        If the query IS an example title or tag, those examples are returned
+        with score 1.0 (a perfect match) and no embedding or vector query is
+        made. Lexical-only hits of the fused ranking get their similarity
+        from one small vector query restricted to their ids.
+        """
+
+        depth = max(top_k, settings.hybrid_candidates)
+
+        try:
+            exact = (
+                await lexical_index.exact_matches(query, metadata_filter)
+                if settings.hybrid_exact_match_skips_vector
+                else []
+            )
+            if exact:
+                increment("hybrid_search_exact_total")
+                return exact[:top_k]
+
+            lexical, vector = await asyncio.gather(
+                lexical_index.search(query, depth, metadata_filter),
+                self.find_matches(query, depth, metadata_filter),
+            )
+
+        except Exception as e:
+            # Lexical side is best-effort: fall back to the plain vector search
+            logger.warning(f"⚠️ Lexical search failed, using vector only: {e}")
+            return await self.find_matches(query, top_k, metadata_filter)
+
+        ranked = reciprocal_rank_fusion([vector, lexical], k=settings.hybrid_rrf_k)[:top_k]
+        fused = [example_id for example_id, _ in ranked]
+
+        similarity = {m.id: m.score for m in vector}
+        unscored = [example_id for example_id in fused if example_id not in similarity]
+        if unscored:
+            id_filter = {**(metadata_filter or {}), "id": {"$in": unscored}}
+            for m in await self.find_matches(query, len(unscored), id_filter):
+                similarity[m.id] = m.score
+
+        return [VectorMatch(id=example_id, score=similarity.get(example_id, 0.0)) for example_id in fused]
+
+    # ------------------------------------------------------------
+    # VECTOR MATCHES (cached: query + filters + top_k → ids/scores)
+    # ------------------------------------------------------------
+    async def find_matches(
+        self,
+        query: str,
+        top_k: int = 5,
+        metadata_filter: Optional[dict] = None,
+        include_values: bool = False,
+    ) -> List[VectorMatch]:
+        """`include_values` also returns candidate vectors (for MMR)."""
+
+        cached = search_cache.get(query, metadata_filter, top_k, include_values)
+        if cached is not None:
+            logger.info("🟩 Search cache hit")
+            return cached
+
+        version = search_cache.version
+
+        logger.info("🔍 Embedding search query...")
+        embedding = await embedding_service.get_embedding(query)
+
+        matches = await get_vector_store().query_examples(
+            embedding=embedding,
+            top_k=top_k,
+            metadata_filter=metadata_filter,
+            include_values=include_values,
+        )
+
+        search_cache.put(query, metadata_filter, top_k, matches, version, include_values)
+        return matches
+
 
 example_service = ExampleService()
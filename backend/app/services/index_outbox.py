@@ -0,0 +1,298 @@
+# app/services/index_outbox.py
+
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.db.database import async_session
+from app.db.orm.index_outbox import IndexOutbox
+from app.db.orm.prompt_example import PromptExample
+from app.observability.metrics.metrics_store import increment
+from app.services.embedding_service import embedding_service
+from app.services.search_cache import search_cache
+from app.services.vector_store import get_vector_store
+
+logger = logging.getLogger("backend")
+
+EMPTY_INPUT_ERROR = "nothing to embed: prompt_text and prompt_json are empty"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class IndexOutboxWorker:
+    """
+    Keeps the vector index in sync with PostgreSQL via the index_outbox table.
+
+    - Writers call `enqueue()` inside the transaction that inserts the
+      PromptExample, so "row exists" ⇒ "indexing is owed" (no lost vectors)
+    - A background task claims due rows with FOR UPDATE SKIP LOCKED and a
+      lease (safe with several app processes), re-reads the examples,
+      embeds them in one batch and upserts them in one call
+    - Success deletes the rows; failure reschedules them with exponential
+      backoff until `max_attempts`, after which they stay as dead letters.
+      A failed batch is retried one example at a time, so only the bad
+      rows are rescheduled; examples with nothing to embed are dead-lettered
+      at once
+    - Idempotent: vectors are keyed by example id and rebuilt from the
+      current DB row, so a retried / duplicated row just rewrites the same vector
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        poll_seconds: Optional[float] = None,
+        lease_seconds: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+    ):
+        self.batch_size = batch_size or settings.index_outbox_batch_size
+        self.poll_seconds = poll_seconds or settings.index_outbox_poll_seconds
+        self.lease_seconds = lease_seconds or settings.index_outbox_lease_seconds
+        self.max_attempts = max_attempts or settings.index_outbox_max_attempts
+
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    # ------------------------------------------------------------
+    # PRODUCER SIDE (runs in the caller's transaction)
+    # ------------------------------------------------------------
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        example_ids: Iterable[str],
+        delay_seconds: float = 0.0,
+    ) -> None:
+        """
+        Add outbox rows; does NOT commit. `delay_seconds` lets a caller that
+        indexes inline (bulk ingestion) keep the worker off the rows unless
+        it fails to `complete()` them.
+        """
+        available_at = _utcnow() + timedelta(seconds=delay_seconds)
+        rows = [
+            {"example_id": example_id, "attempts": 0, "available_at": available_at}
+            for example_id in example_ids
+        ]
+        if rows:
+            await db.execute(insert(IndexOutbox), rows)
+
+    async def complete(self, example_ids: List[str]) -> None:
+        """Drop pending rows for examples that were indexed inline."""
+        async with async_session() as db:
+            await db.execute(
+                delete(IndexOutbox).where(IndexOutbox.example_id.in_(example_ids))
+            )
+            await db.commit()
+
+    def notify(self) -> None:
+        """Wake the worker now instead of at the next poll."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    # ------------------------------------------------------------
+    # LIFECYCLE (FastAPI lifespan)
+    # ------------------------------------------------------------
+    def start(self) -> None:
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+            logger.info("🟦 [OUTBOX] Index worker started")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+            logger.info("🟩 [OUTBOX] Index worker stopped")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                claimed = await self.drain_once()
+            except Exception as e:
+                logger.error(f"❌ [OUTBOX] Drain failed: {e}")
+                claimed = 0
+
+            if claimed >= self.batch_size:
+                continue   # backlog: keep draining without waiting
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    # ------------------------------------------------------------
+    # DRAIN
+    # ------------------------------------------------------------
+    async def drain_once(self) -> int:
+        """Claim and process one batch; returns the number of rows claimed."""
+
+        claimed = await self._claim()
+        if not claimed:
+            return 0
+
+        example_ids = list({row.example_id for row in claimed})
+
+        try:
+            failed = await self._index(example_ids)
+        except Exception as e:
+            logger.warning(f"⚠️ [OUTBOX] Indexing {len(example_ids)} examples failed: {e}")
+            await self._reschedule(claimed, str(e))
+            return len(claimed)
+
+        done = [row for row in claimed if row.example_id not in failed]
+        if done:
+            async with async_session() as db:
+                await db.execute(
+                    delete(IndexOutbox).where(IndexOutbox.id.in_([row.id for row in done]))
+                )
+                await db.commit()
+            search_cache.bump_version()
+
+        # One bad example must not hold back (or dead-letter) the rest
+        for error in set(failed.values()):
+            rows = [row for row in claimed if failed.get(row.example_id) == error]
+            await self._reschedule(rows, error, dead=error == EMPTY_INPUT_ERROR)
+
+        indexed = len(example_ids) - len(failed)
+        increment("index_outbox_indexed_total", indexed)
+        logger.info(f"🟩 [OUTBOX] Indexed {indexed} examples ({len(failed)} failed)")
+        return len(claimed)
+
+    async def _claim(self) -> list:
+        now = _utcnow()
+
+        due = (
+            select(IndexOutbox.id)
+            .where(
+                IndexOutbox.available_at <= now,
+                IndexOutbox.attempts < self.max_attempts,
+            )
+            .order_by(IndexOutbox.id)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+
+        async with async_session() as db:
+            result = await db.execute(
+                update(IndexOutbox)
+                .where(IndexOutbox.id.in_(due))
+                .values(
+                    attempts=IndexOutbox.attempts + 1,
+                    available_at=now + timedelta(seconds=self.lease_seconds),
+                )
+                .returning(IndexOutbox.id, IndexOutbox.example_id, IndexOutbox.attempts)
+            )
+            claimed = result.all()
+            await db.commit()
+
+        return claimed
+
+    async def _index(self, example_ids: List[str]) -> Dict[str, str]:
+        """Embed + upsert; returns {example_id: error} for examples that failed alone."""
+        # Imported here: example_service enqueues through this module
+        from app.services.example_service import ExampleService
+
+        async with async_session() as db:
+            result = await db.execute(
+                select(PromptExample)
+                .where(PromptExample.id.in_(example_ids))
+                .options(selectinload(PromptExample.tags))
+            )
+            examples = result.scalars().all()
+
+        # Examples deleted since enqueue are simply absent: nothing to index
+        failed: Dict[str, str] = {}
+        ready = []
+        for ex in examples:
+            text = ExampleService.build_embedding_input(ex.prompt_text, ex.prompt_json)
+            if text.strip():
+                ready.append((ex, text))
+            else:
+                failed[ex.id] = EMPTY_INPUT_ERROR   # retrying cannot help
+
+        if not ready:
+            return failed
+
+        try:
+            vectors = await embedding_service.get_embeddings([text for _, text in ready])
+        except Exception as e:
+            if len(ready) == 1:
+                raise
+            logger.warning(f"⚠️ [OUTBOX] Batch embedding failed, retrying per example: {e}")
+            vectors, kept = [], []
+            for ex, text in ready:
+                try:
+                    vectors.extend(await embedding_service.get_embeddings([text]))
+                except Exception as e:
+                    failed[ex.id] = str(e)
+                    continue
+                kept.append((ex, text))
+            ready = kept
+
+        if not ready:
+            return failed
+
+        await get_vector_store().upsert_many(
+            [
+                (
+                    ex.id,
+                    vector,
+                    ExampleService.build_vector_metadata(
+                        example_id=ex.id,
+                        title=ex.title,
+                        prompt_json=ex.prompt_json,
+                        business_type=ex.business_type,
+                        ad_style=ex.ad_style,
+                        tone=ex.tone,
+                        target_audience=ex.target_audience,
+                        tags=[t.name for t in ex.tags],
+                    ),
+                )
+                for (ex, _), vector in zip(ready, vectors)
+            ]
+        )
+        return failed
+
+    async def _reschedule(self, claimed: list, error: str, dead: bool = False) -> None:
+        """Back off and retry; `dead` (or out of attempts) leaves a dead letter."""
+        now = _utcnow()
+        updates = []
+
+        for row in claimed:
+            if dead or row.attempts >= self.max_attempts:
+                increment("index_outbox_dead_total")
+                logger.error(
+                    f"❌ [OUTBOX] Giving up on example {row.example_id} "
+                    f"after {row.attempts} attempts: {error}"
+                )
+                delay = 0.0
+            else:
+                increment("index_outbox_retries_total")
+                delay = min(
+                    settings.index_outbox_retry_base_seconds * 2 ** (row.attempts - 1),
+                    settings.index_outbox_retry_max_seconds,
+                )
+
+            update_row = {
+                "id": row.id,
+                "available_at": now + timedelta(seconds=delay),
+                "last_error": error[:2000],
+            }
+            if dead:
+                update_row["attempts"] = self.max_attempts   # never claimed again
+            updates.append(update_row)
+
+        async with async_session() as db:
+            await db.execute(update(IndexOutbox), updates)
+            await db.commit()
+
+
+index_outbox_worker = IndexOutboxWorker()
@@ -0,0 +1,312 @@
+# app/services/ingestion_service.py
+
+import asyncio
+import logging
+import uuid
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional
+
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.database import async_session
+from app.schemas.example_schema import ExampleCreateRequest
+from app.services.embedding_service import embedding_service
+from app.services.example_cache import example_cache
+from app.services.example_service import example_service
+from app.services.index_outbox import index_outbox_worker
+from app.services.search_cache import search_cache
+from app.services.vector_store import get_vector_store
+
+logger = logging.getLogger("backend")
+
+_DONE = object()   # end-of-stream marker passed between stages
+
+
+class BulkIngestionService:
+    """
+    NDJSON → PostgreSQL (+ outbox) → embeddings → vector index, as a pipeline.
+
+        parse ──▶ [db_q] ──▶ DB write ──▶ [embed_q] ──▶ embed ──▶ [upsert_q] ──▶ upsert
+
+    - Records are grouped into batches of `batch_size`; each stage works on
+      one batch while the next stage works on the previous one
+    - Queues are bounded (`queue_depth` batches), so a slow stage throttles
+      the reader instead of buffering the whole file in memory
+    - One commit per batch, written with set-based inserts; if the batch
+      fails, it is retried one SAVEPOINT per record so a bad record is
+      reported without failing its neighbours
+    - Every input line produces exactly one result:
+      {"line": n, "status": "ok" | "error", "example_id": ..., "error": ...}
+    """
+
+    def __init__(
+        self,
+        batch_size: Optional[int] = None,
+        queue_depth: Optional[int] = None,
+    ):
+        self.batch_size = batch_size or settings.bulk_ingest_batch_size
+        self.queue_depth = queue_depth or settings.bulk_ingest_queue_depth
+
+    # ------------------------------------------------------------
+    # PUBLIC API
+    # ------------------------------------------------------------
+    async def ingest(self, lines: AsyncIterable[str]) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield one result per non-blank input line (in completion order),
+        followed by a final summary: {"status": "done", "total", "ok", "failed"}.
+        """
+
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.batch_size * self.queue_depth)
+        db_q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_depth)
+        embed_q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_depth)
+        upsert_q: asyncio.Queue = asyncio.Queue(maxsize=self.queue_depth)
+
+        tasks = [
+            asyncio.create_task(self._parse_stage(lines, db_q, results)),
+            asyncio.create_task(self._db_stage(db_q, embed_q, results)),
+            asyncio.create_task(self._embed_stage(embed_q, upsert_q, results)),
+            asyncio.create_task(self._upsert_stage(upsert_q, results)),
+        ]
+
+        ok = failed = 0
+        try:
+            while True:
+                item = await results.get()
+                if item is _DONE:
+                    break
+
+                if item["status"] == "ok":
+                    ok += 1
+                else:
+                    failed += 1
+                yield item
+
+            # Surface unexpected stage crashes (per-record errors are already reported)
+            for task in tasks:
+                if task.done() and not task.cancelled() and task.exception():
+                    raise task.exception()
+
+            logger.info(f"🟩 [BULK INGEST] Done: {ok} ok, {failed} failed")
+            yield {"status": "done", "total": ok + failed, "ok": ok, "failed": failed}
+
+        finally:
+            # Consumer went away (client disconnect) or a stage crashed
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    # ------------------------------------------------------------
+    # STAGE 1: parse + validate
+    # ------------------------------------------------------------
+    async def _parse_stage(
+        self,
+        lines: AsyncIterable[str],
+        out: asyncio.Queue,
+        results: asyncio.Queue,
+    ) -> None:
+        batch: List[Dict[str, Any]] = []
+        line_no = 0
+
+        try:
+            async for line in lines:
+                line_no += 1
+                if not line.strip():
+                    continue
+
+                try:
+                    example = ExampleCreateRequest.model_validate_json(line)
+                except ValidationError as e:
+                    await results.put(_error(line_no, _validation_message(e)))
+                    continue
+
+                batch.append({"line": line_no, "example": example})
+                if len(batch) >= self.batch_size:
+                    await out.put(batch)
+                    batch = []
+
+            if batch:
+                await out.put(batch)
+        finally:
+            await _close(out)
+
+    # ------------------------------------------------------------
+    # STAGE 2: PostgreSQL (one transaction per batch)
+    # ------------------------------------------------------------
+    async def _db_stage(
+        self,
+        inp: asyncio.Queue,
+        out: asyncio.Queue,
+        results: asyncio.Queue,
+    ) -> None:
+        try:
+            while (batch := await inp.get()) is not _DONE:
+                for record in batch:
+                    record["example_id"] = str(uuid.uuid4())
+
+                async with async_session() as db:
+                    try:
+                        # Fast path: whole batch in 1 insert + 1 tag upsert + 1 link insert
+                        async with db.begin_nested():
+                            await self._write(db, batch)
+                        stored = batch
+                    except Exception as e:
+                        logger.warning(f"⚠️ [BULK INGEST] Batch insert failed, retrying per record: {e}")
+                        stored = []
+                        for record in batch:
+                            try:
+                                async with db.begin_nested():
+                                    await self._write(db, [record])
+                            except Exception as e:
+                                await results.put(_error(record["line"], str(e)))
+                                continue
+                            stored.append(record)
+
+                    try:
+                        await db.commit()
+                    except Exception as e:
+                        logger.error(f"❌ [BULK INGEST] Batch commit failed: {e}")
+                        for record in stored:
+                            await results.put(_error(record["line"], f"commit failed: {e}"))
+                        continue
+
+                example_cache.invalidate(r["example_id"] for r in stored)
+
+                if stored:
+                    await out.put(stored)
+        finally:
+            await _close(out)
+
+    @staticmethod
+    async def _write(db: AsyncSession, records: List[Dict[str, Any]]) -> None:
+        await example_service.add_examples(
+            db,
+            [
+                {"id": r["example_id"], **r["example"].model_dump(exclude={"tags"})}
+                for r in records
+            ],
+        )
+        await example_service.link_tags(
+            db, {r["example_id"]: r["example"].tags for r in records}
+        )
+        # Safety net: if this pipeline dies before indexing, the outbox worker
+        # picks the rows up once the lease runs out
+        await index_outbox_worker.enqueue(
+            db,
+            [r["example_id"] for r in records],
+            delay_seconds=index_outbox_worker.lease_seconds,
+        )
+
+    # ------------------------------------------------------------
+    # STAGE 3: embeddings (one batched request per batch)
+    # ------------------------------------------------------------
+    async def _embed_stage(
+        self,
+        inp: asyncio.Queue,
+        out: asyncio.Queue,
+        results: asyncio.Queue,
+    ) -> None:
+        try:
+            while (batch := await inp.get()) is not _DONE:
+                texts = [
+                    example_service.build_embedding_input(
+                        record["example"].prompt_text, record["example"].prompt_json
+                    )
+                    for record in batch
+                ]
+
+                try:
+                    vectors = await embedding_service.get_embeddings(texts)
+                except Exception as e:
+                    logger.warning(f"⚠️ [BULK INGEST] Embedding batch failed, retrying per record: {e}")
+                    vectors, kept = [], []
+                    for record, text in zip(batch, texts):
+                        try:
+                            vectors.extend(await embedding_service.get_embeddings([text]))
+                        except Exception as e:
+                            await results.put(
+                                _error(record["line"], f"stored; indexing queued for retry: {e}", record["example_id"])
+                            )
+                            continue
+                        kept.append(record)
+                    batch = kept
+                    if not batch:
+                        continue
+
+                for record, vector in zip(batch, vectors):
+                    record["embedding"] = vector
+                await out.put(batch)
+        finally:
+            await _close(out)
+
+    # ------------------------------------------------------------
+    # STAGE 4: vector index upsert
+    # ------------------------------------------------------------
+    async def _upsert_stage(self, inp: asyncio.Queue, results: asyncio.Queue) -> None:
+        try:
+            while (batch := await inp.get()) is not _DONE:
+                items = []
+                for record in batch:
+                    example: ExampleCreateRequest = record["example"]
+                    metadata = example_service.build_vector_metadata(
+                        example_id=record["example_id"],
+                        title=example.title,
+                        prompt_json=example.prompt_json,
+                        business_type=example.business_type,
+                        ad_style=example.ad_style,
+                        tone=example.tone,
+                        target_audience=example.target_audience,
+                        tags=example.tags,
+                    )
+                    items.append((record["example_id"], record["embedding"], metadata))
+
+                try:
+                    await get_vector_store().upsert_many(items)
+                except Exception as e:
+                    logger.error(f"❌ [BULK INGEST] Upsert batch failed: {e}")
+                    for record in batch:
+                        await results.put(
+                            _error(record["line"], f"stored; indexing queued for retry: {e}", record["example_id"])
+                        )
+                    continue
+
+                search_cache.bump_version()
+
+                try:
+                    await index_outbox_worker.complete([r["example_id"] for r in batch])
+                except Exception as e:
+                    # Harmless: the worker will re-upsert the same vectors later
+                    logger.warning(f"⚠️ [BULK INGEST] Could not clear outbox rows: {e}")
+
+                for record in batch:
+                    await results.put(
+                        {
+                            "line": record["line"],
+                            "status": "ok",
+                            "example_id": record["example_id"],
+                            "error": None,
+                        }
+                    )
+        finally:
+            await _close(results)
+
+
+async def _close(queue: asyncio.Queue) -> None:
+    """Pass end-of-stream downstream, unless the pipeline is being torn down."""
+    if not asyncio.current_task().cancelling():
+        await queue.put(_DONE)
+
+
+def _error(line: int, message: str, example_id: Optional[str] = None) -> Dict[str, Any]:
+    return {"line": line, "status": "error", "example_id": example_id, "error": message}
+
+
+def _validation_message(error: ValidationError) -> str:
+    first = error.errors()[0]
+    if first.get("type") == "json_invalid":
+        return f"invalid JSON: {first.get('ctx', {}).get('error', first['msg'])}"
+    location = ".".join(str(part) for part in first.get("loc", ())) or "record"
+    return f"{location}: {first['msg']}"
+
+
+bulk_ingestion_service = BulkIngestionService()
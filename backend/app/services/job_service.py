@@ -0,0 +1,260 @@
+# app/services/job_service.py
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import select, update
+
+from app.core.config import settings
+from app.db.database import async_session
+from app.db.orm.pipeline_job import PipelineJob
+from app.observability.metrics.metrics_store import increment, set_gauge
+from app.services.pipeline_service import pipeline_service
+
+logger = logging.getLogger("backend")
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class PipelineJobService:
+    """
+    Runs video-pipeline jobs on a bounded pool of background workers.
+
+    - `submit()` stores a queued row in PostgreSQL and returns at once
+    - `workers` tasks claim queued jobs with FOR UPDATE SKIP LOCKED (safe
+      with several app processes), run the pipeline and write per-stage
+      timings as stages start, then the result or error
+    - Running jobs carry a heartbeat; a job whose heartbeat is older than
+      `stale_seconds` (its process died) is marked failed, not re-run —
+      a pipeline run is not idempotent (video generation)
+    - Queued jobs survive restarts and are picked up by the next process
+    """
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        poll_seconds: Optional[float] = None,
+        heartbeat_seconds: Optional[float] = None,
+        stale_seconds: Optional[float] = None,
+    ):
+        self.workers = workers or settings.job_workers
+        self.poll_seconds = poll_seconds or settings.job_poll_seconds
+        self.heartbeat_seconds = heartbeat_seconds or settings.job_heartbeat_seconds
+        self.stale_seconds = stale_seconds or settings.job_stale_seconds
+
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._running: set = set()
+
+    # ------------------------------------------------------------
+    # API SIDE
+    # ------------------------------------------------------------
+    async def submit(self, raw_requirements: str, user_id: str) -> str:
+        job_id = str(uuid.uuid4())
+
+        async with async_session() as db:
+            db.add(
+                PipelineJob(
+                    id=job_id,
+                    user_id=user_id,
+                    status=JOB_QUEUED,
+                    raw_requirements=raw_requirements,
+                )
+            )
+            await db.commit()
+
+        increment("jobs_submitted_total")
+        self.notify()
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[PipelineJob]:
+        async with async_session() as db:
+            return await db.get(PipelineJob, job_id)
+
+    def notify(self) -> None:
+        """Wake an idle worker now instead of at the next poll."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    # ------------------------------------------------------------
+    # LIFECYCLE (FastAPI lifespan)
+    # ------------------------------------------------------------
+    def start(self) -> None:
+        if not self._tasks:
+            self._wakeup = asyncio.Event()
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+            self._tasks.append(asyncio.create_task(self._heartbeat()))
+            logger.info(f"🟦 [JOBS] {self.workers} pipeline workers started")
+
+    async def stop(self) -> None:
+        if self._tasks:
+            for task in self._tasks:
+                task.cancel()
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+            self._tasks = []
+            logger.info("🟩 [JOBS] Pipeline workers stopped")
+
+    async def _worker(self) -> None:
+        while True:
+            try:
+                job = await self._claim()
+            except Exception as e:
+                logger.error(f"❌ [JOBS] Claim failed: {e}")
+                job = None
+
+            if job is not None:
+                await self.run_job(job.id, job.user_id, job.raw_requirements)
+                continue
+
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def _heartbeat(self) -> None:
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                now = _utcnow()
+                async with async_session() as db:
+                    if self._running:
+                        await db.execute(
+                            update(PipelineJob)
+                            .where(PipelineJob.id.in_(list(self._running)))
+                            .values(heartbeat_at=now)
+                        )
+                    # Jobs of processes that died mid-run
+                    reaped = await db.execute(
+                        update(PipelineJob)
+                        .where(
+                            PipelineJob.status == JOB_RUNNING,
+                            PipelineJob.heartbeat_at < now - timedelta(seconds=self.stale_seconds),
+                        )
+                        .values(status=JOB_FAILED, error="Interrupted: worker stopped", finished_at=now)
+                    )
+                    await db.commit()
+
+                if reaped.rowcount:
+                    increment("jobs_interrupted_total", reaped.rowcount)
+                    logger.warning(f"⚠️ [JOBS] Marked {reaped.rowcount} stale jobs as failed")
+            except Exception as e:
+                logger.error(f"❌ [JOBS] Heartbeat failed: {e}")
+
+    # ------------------------------------------------------------
+    # EXECUTION
+    # ------------------------------------------------------------
+    async def _claim(self):
+        now = _utcnow()
+
+        next_job = (
+            select(PipelineJob.id)
+            .where(PipelineJob.status == JOB_QUEUED)
+            .order_by(PipelineJob.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+
+        async with async_session() as db:
+            result = await db.execute(
+                update(PipelineJob)
+                .where(PipelineJob.id == next_job)
+                .values(status=JOB_RUNNING, started_at=now, heartbeat_at=now)
+                .returning(PipelineJob.id, PipelineJob.user_id, PipelineJob.raw_requirements)
+            )
+            job = result.first()
+            await db.commit()
+
+        return job
+
+    async def run_job(self, job_id: str, user_id: str, raw_requirements: str) -> None:
+        self._running.add(job_id)
+        set_gauge("jobs_running", len(self._running))
+        logger.info(f"🟦 [JOBS] Running {job_id}")
+
+        stages: Dict[str, Dict[str, int]] = {}
+        try:
+            async for event in pipeline_service.stream(
+                raw_requirements, user_id=user_id, session_id=f"job_{job_id}"
+            ):
+                if event["type"] == "start":
+                    await self._update(job_id, session_id=event["session_id"])
+
+                elif event["type"] == "progress":
+                    agent = event["agent"]
+                    is_new = agent not in stages
+                    stage = stages.setdefault(
+                        agent, {"first_event_ms": event["elapsed_ms"], "last_event_ms": event["elapsed_ms"]}
+                    )
+                    stage["last_event_ms"] = event["elapsed_ms"]
+                    if is_new:   # one write per stage, not per event
+                        await self._update(job_id, current_stage=agent, stages=dict(stages))
+
+                elif event["type"] == "error":
+                    message = f"{event['code'] or ''} {event['message'] or ''}".strip()
+                    await self._finish(job_id, JOB_FAILED, stages, error=message)
+                    return
+
+                elif event["type"] == "final":
+                    await self._finish(job_id, JOB_SUCCEEDED, event["timings"], result=event["result"])
+                    return
+
+            await self._finish(job_id, JOB_FAILED, stages, error="Pipeline ended without final response.")
+
+        except asyncio.CancelledError:
+            await self._finish(job_id, JOB_FAILED, stages, error="Interrupted: server shutting down")
+            raise
+
+        except Exception as e:
+            logger.error(f"❌ [JOBS] {job_id} failed: {e}")
+            await self._finish(job_id, JOB_FAILED, stages, error=str(e))
+
+        finally:
+            self._running.discard(job_id)
+            set_gauge("jobs_running", len(self._running))
+
+    async def _finish(
+        self,
+        job_id: str,
+        status: str,
+        stages: Dict[str, Any],
+        result: Any = None,
+        error: Optional[str] = None,
+    ) -> None:
+        try:
+            await self._update(
+                job_id,
+                status=status,
+                stages=stages,
+                result=result,
+                error=error,
+                current_stage=None,
+                finished_at=_utcnow(),
+            )
+        except Exception as e:
+            logger.error(f"❌ [JOBS] Could not record {status} for {job_id}: {e}")
+        increment(f"jobs_{status}_total")
+        logger.info(f"🟩 [JOBS] {job_id} {status}")
+
+    async def _update(self, job_id: str, **values) -> None:
+        async with async_session() as db:
+            await db.execute(
+                update(PipelineJob)
+                .where(PipelineJob.id == job_id)
+                .values(heartbeat_at=_utcnow(), **values)
+            )
+            await db.commit()
+
+
+job_service = PipelineJobService()
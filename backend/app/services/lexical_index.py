@@ -0,0 +1,320 @@
+# app/services/lexical_index.py
+
+import asyncio
+import logging
+import math
+import re
+import time
+import unicodedata
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+
+from app.core.config import settings
+from app.db.database import async_session
+from app.db.orm.prompt_example import PromptExample
+from app.observability.metrics.metrics_store import increment, set_gauge
+from app.services.search_cache import search_cache
+from app.services.vector_store import VectorMatch
+
+logger = logging.getLogger("backend")
+
+# Words plus joined codes ("ab-123", "coca-cola", "v2.1")
+_TOKEN = re.compile(r"\w+(?:[-_./]\w+)*")
+_SPLIT = re.compile(r"[-_./]")
+
+
+def _words(text: str) -> List[str]:
+    return _TOKEN.findall(unicodedata.normalize("NFKC", text).casefold())
+
+
+def tokenize(text: str) -> List[str]:
+    """Case-folded terms; joined codes also yield their parts and the run-together form."""
+    terms: List[str] = []
+    for token in _words(text):
+        terms.append(token)
+        parts = _SPLIT.split(token)
+        if len(parts) > 1:
+            terms.extend(p for p in parts if p)
+            terms.append("".join(parts))   # "gs-4411" also matches "gs4411"
+    return terms
+
+
+def _phrase(text: str) -> str:
+    return " ".join(_words(text))
+
+
+@dataclass
+class _Snapshot:
+    """Immutable BM25 postings; swapped in whole after a rebuild."""
+
+    ids: List[str] = field(default_factory=list)
+    metadata: List[Dict[str, Any]] = field(default_factory=list)
+    # term → (doc rows, precomputed BM25 weight per row)
+    postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = field(default_factory=dict)
+    # normalized title / tag phrase → doc rows (exact-match shortcut)
+    phrases: Dict[str, List[int]] = field(default_factory=dict)
+
+
+class LexicalIndex:
+    """
+    In-process BM25 index over PromptExample title, prompt text and tags.
+
+    - Catches what embeddings blur: brand names, SKUs, regional terms
+    - Title and tag terms count `field_boost` times (short, high-signal fields)
+    - Document-side BM25 weights are precomputed, so a query is one
+      scatter-add per query term
+    - Loaded from PostgreSQL on first use; after local writes (the search
+      cache version moves) and every `refresh_seconds` (writes made by
+      other processes) only examples not indexed yet are read — examples
+      are insert-only — and the postings are rebuilt in memory
+    - Metadata filters use the vector-store dialect ($eq, $in, $ne, $nin)
+    """
+
+    LOAD_BATCH = 1000   # ids per IN (...) query when catching up
+
+    def __init__(
+        self,
+        refresh_seconds: float,
+        k1: float = 1.2,
+        b: float = 0.75,
+        field_boost: int = 2,
+    ):
+        self.refresh_seconds = refresh_seconds
+        self.k1 = k1
+        self.b = b
+        self.field_boost = field_boost
+
+        self._snapshot = _Snapshot()
+        self._docs: Dict[str, Tuple[str, str, str, List[str], Dict[str, Any]]] = {}
+        self._built_version: Optional[int] = None
+        self._built_at = 0.0
+        self._lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._snapshot.ids)
+
+    # ------------------------------------------------------------
+    # QUERY
+    # ------------------------------------------------------------
+    async def search(
+        self,
+        query: str,
+        top_k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[VectorMatch]:
+        """BM25 matches, best first (documents sharing no term are left out)."""
+        await self.ensure_fresh()
+        snap = self._snapshot
+
+        scores = np.zeros(len(snap.ids), dtype=np.float32)
+        for term in set(tokenize(query)):
+            posting = snap.postings.get(term)
+            if posting is not None:
+                rows, weights = posting
+                scores[rows] += weights
+
+        rows = np.flatnonzero(scores)
+        if metadata_filter:
+            rows = np.array(
+                [r for r in rows if _matches(snap.metadata[r], metadata_filter)], dtype=np.int64
+            )
+        if rows.size == 0:
+            return []
+
+        k = min(top_k, rows.size)
+        best = rows[np.argpartition(-scores[rows], k - 1)[:k]]
+        best = best[np.argsort(-scores[best], kind="stable")]
+
+        return [
+            VectorMatch(id=snap.ids[r], score=float(scores[r]), metadata=snap.metadata[r])
+            for r in best
+        ]
+
+    async def exact_matches(
+        self,
+        query: str,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[VectorMatch]:
+        """Examples whose title or one of whose tags IS the query."""
+        await self.ensure_fresh()
+        snap = self._snapshot
+
+        rows = snap.phrases.get(_phrase(query), [])
+        return [
+            VectorMatch(id=snap.ids[r], score=1.0, metadata=snap.metadata[r])
+            for r in rows
+            if not metadata_filter or _matches(snap.metadata[r], metadata_filter)
+        ]
+
+    # ------------------------------------------------------------
+    # BUILD
+    # ------------------------------------------------------------
+    async def ensure_fresh(self) -> None:
+        if self._is_fresh():
+            return
+
+        async with self._lock:
+            if self._is_fresh():
+                return   # rebuilt while we waited
+
+            version = search_cache.version
+            started = time.perf_counter()
+
+            added, removed = await self._sync_docs()
+            if added or removed or self._built_version is None:
+                docs = list(self._docs.values())
+                self._snapshot = await asyncio.to_thread(self._build, docs)
+
+                increment("lexical_index_rebuilds_total")
+                set_gauge("lexical_index_documents", len(docs))
+                logger.info(
+                    f"🟩 [LEXICAL] Indexed {len(docs)} examples (+{added} −{removed}) in "
+                    f"{(time.perf_counter() - started) * 1000:.0f} ms"
+                )
+
+            self._built_version = version
+            self._built_at = time.monotonic()
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._built_version == search_cache.version
+            and time.monotonic() - self._built_at < self.refresh_seconds
+        )
+
+    async def _sync_docs(self) -> Tuple[int, int]:
+        """Read only examples not indexed yet, forget deleted ones; returns (added, removed)."""
+        async with async_session() as db:
+            ids = set((await db.execute(select(PromptExample.id))).scalars().all())
+            new_ids = list(ids - self._docs.keys())
+            removed = self._docs.keys() - ids
+
+            examples = []
+            for start in range(0, len(new_ids), self.LOAD_BATCH):
+                result = await db.execute(
+                    select(PromptExample)
+                    .where(PromptExample.id.in_(new_ids[start : start + self.LOAD_BATCH]))
+                    .options(selectinload(PromptExample.tags))
+                )
+                examples.extend(result.scalars().all())
+
+        for example_id in removed:
+            del self._docs[example_id]
+        for ex in examples:
+            self._docs[ex.id] = self._doc(ex)
+        return len(examples), len(removed)
+
+    @staticmethod
+    def _doc(ex: PromptExample) -> Tuple[str, str, str, List[str], Dict[str, Any]]:
+        # Imported here: example_service imports this module
+        from app.services.example_service import ExampleService
+
+        tags = [t.name for t in ex.tags]
+        metadata = ExampleService.build_vector_metadata(
+            example_id=ex.id,
+            title=ex.title,
+            prompt_json=ex.prompt_json,
+            business_type=ex.business_type,
+            ad_style=ex.ad_style,
+            tone=ex.tone,
+            target_audience=ex.target_audience,
+            tags=tags,
+        )
+        body = ExampleService.build_embedding_input(ex.prompt_text, ex.prompt_json)
+        return ex.id, ex.title or "", body, tags, metadata
+
+    def _build(self, docs) -> _Snapshot:
+        snap = _Snapshot()
+        term_freqs: List[Dict[str, int]] = []
+        lengths: List[int] = []
+
+        for row, (example_id, title, body, tags, metadata) in enumerate(docs):
+            snap.ids.append(example_id)
+            snap.metadata.append(metadata)
+
+            field_terms = tokenize(" ".join([title, *tags]))
+            terms = field_terms * self.field_boost + tokenize(body)
+
+            tf: Dict[str, int] = {}
+            for term in terms:
+                tf[term] = tf.get(term, 0) + 1
+            term_freqs.append(tf)
+            lengths.append(len(terms))
+
+            for phrase in {_phrase(title), *(_phrase(t) for t in tags)} - {""}:
+                snap.phrases.setdefault(phrase, []).append(row)
+
+        n_docs = len(docs)
+        if not n_docs:
+            return snap
+
+        avg_len = (sum(lengths) / n_docs) or 1.0
+        rows_by_term: Dict[str, List[int]] = {}
+        tfs_by_term: Dict[str, List[int]] = {}
+        for row, tf in enumerate(term_freqs):
+            for term, count in tf.items():
+                rows_by_term.setdefault(term, []).append(row)
+                tfs_by_term.setdefault(term, []).append(count)
+
+        norms = self.k1 * (1 - self.b + self.b * np.asarray(lengths, dtype=np.float32) / avg_len)
+
+        for term, rows in rows_by_term.items():
+            rows_arr = np.asarray(rows, dtype=np.int64)
+            tf_arr = np.asarray(tfs_by_term[term], dtype=np.float32)
+            idf = math.log(1 + (n_docs - len(rows) + 0.5) / (len(rows) + 0.5))
+            weights = idf * tf_arr * (self.k1 + 1) / (tf_arr + norms[rows_arr])
+            snap.postings[term] = (rows_arr, weights.astype(np.float32))
+
+        return snap
+
+
+def _matches(metadata: Dict[str, Any], metadata_filter: Dict[str, Any]) -> bool:
+    for key, condition in metadata_filter.items():
+        value = metadata.get(key)
+        values = set(value) if isinstance(value, list) else {value}
+        operators = condition if isinstance(condition, dict) else {"$eq": condition}
+
+        for op, expected in operators.items():
+            if op == "$eq":
+                ok = expected in values
+            elif op == "$in":
+                ok = bool(values & set(expected))
+            elif op == "$ne":
+                ok = expected not in values
+            elif op == "$nin":
+                ok = not values & set(expected)
+            else:
+                raise ValueError(f"Unsupported filter operator: {op}")
+            if not ok:
+                return False
+    return True
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[VectorMatch]],
+    k: int = 60,
+) -> List[Tuple[str, float]]:
+    """
+    [(id, fused score)], best first: Σ 1 / (k + rank) over the rankings an
+    id appears in, scaled so rank 1 in every ranking scores 1.0.
+
+    The fused score is only good for ordering (neighbouring ranks differ by
+    ~1/k); it is not a similarity and should not be shown as one.
+    """
+    fused: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, match in enumerate(ranking, start=1):
+            fused[match.id] = fused.get(match.id, 0.0) + 1.0 / (k + rank)
+
+    ceiling = len(rankings) / (k + 1) if rankings else 1.0
+    return sorted(
+        ((example_id, score / ceiling) for example_id, score in fused.items()),
+        key=lambda item: item[1],
+        reverse=True,
+    )
+
+
+lexical_index = LexicalIndex(refresh_seconds=settings.lexical_index_refresh_seconds)
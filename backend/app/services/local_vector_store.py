@@ -0,0 +1,381 @@
+# app/services/local_vector_store.py
+
+import asyncio
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.vector_store import VectorMatch, VectorStore
+from app.utils.vectors import VectorLike, to_vector
+
+try:
+    import hnswlib  # optional: pip install hnswlib
+except ImportError:
+    hnswlib = None
+
+logger = logging.getLogger("backend")
+
+_INITIAL_CAPACITY = 1024
+_MIN_COMPACT_LINES = 1024   # meta.log lines before meta.json is rewritten
+
+
+class LocalVectorStore(VectorStore):
+    """
+    In-process vector index — drop-in replacement for PineconeService.
+
+    - Vectors live in a float32 matrix memory-mapped from `<path>/vectors.f32`
+      (rows are L2-normalized, so cosine similarity == dot product)
+    - IDs + metadata live in `<path>/meta.json` plus an append-only
+      `<path>/meta.log` (one line per upsert since the last snapshot); the
+      log is folded into meta.json once it outgrows the index and on close,
+      so each upsert batch writes O(batch), not the whole index
+    - Inverted postings per metadata value turn equality / `$in` filters
+      into set operations
+    - Exact brute-force search by default; `use_hnsw=True` adds an hnswlib
+      graph (optional dependency) built from the matrix at startup
+    - The async methods run writes and searches in a worker thread (one at
+      a time, under a lock); `upsert_rows()` / `query()` are the blocking
+      versions
+    """
+
+    def __init__(
+        self,
+        path: str,
+        dimension: Optional[int] = None,
+        use_hnsw: bool = False,
+    ):
+        self.path = path
+        self.dimension = dimension or settings.embedding_dimensions
+
+        os.makedirs(path, exist_ok=True)
+        self._vectors_path = os.path.join(path, "vectors.f32")
+        self._meta_path = os.path.join(path, "meta.json")
+        self._log_path = os.path.join(path, "meta.log")
+        self._log_lines = 0
+        self._lock = threading.Lock()
+
+        self._ids: List[str] = []
+        self._metadata: List[Dict[str, Any]] = []
+        self._row_of: Dict[str, int] = {}
+        self._postings: Dict[str, Dict[Any, Set[int]]] = {}
+
+        self._load()
+
+        self._hnsw = None
+        if use_hnsw:
+            self._build_hnsw()
+
+        logger.info(
+            f"🟩 [LOCAL INDEX] {len(self._ids)} vectors loaded from {path} "
+            f"(dim={self.dimension}, hnsw={use_hnsw})"
+        )
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    # ------------------------------------------------------------
+    # UPSERT
+    # ------------------------------------------------------------
+    async def upsert_example(
+        self,
+        example_id: str,
+        embedding: VectorLike,
+        metadata: Dict[str, Any],
+    ) -> None:
+        await asyncio.to_thread(self.upsert_rows, [(example_id, embedding, metadata)])
+
+    async def upsert_many(
+        self,
+        items: Iterable[Tuple[str, VectorLike, Dict[str, Any]]],
+    ) -> None:
+        await asyncio.to_thread(self.upsert_rows, list(items))
+
+    def upsert_rows(self, items: Iterable[Tuple[str, VectorLike, Dict[str, Any]]]) -> None:
+        with self._lock:
+            self._upsert_rows(list(items))
+
+    def _upsert_rows(self, items: List[Tuple[str, VectorLike, Dict[str, Any]]]) -> None:
+        if not items:
+            return
+
+        for example_id, embedding, metadata in items:
+            vector = self._normalize(embedding)
+
+            row = self._row_of.get(example_id)
+            if row is None:
+                row = len(self._ids)
+                if row >= self._capacity:
+                    self._grow(self._capacity * 2)
+                self._ids.append(example_id)
+                self._metadata.append(metadata)
+                self._row_of[example_id] = row
+            else:
+                self._unindex(row)
+                self._metadata[row] = metadata
+
+            self._matrix[row] = vector
+            self._index(row, metadata)
+
+            if self._hnsw is not None:
+                self._hnsw.add_items(vector[None, :], np.array([row]))
+
+        # Vectors reach disk before the log line that makes them visible
+        self._matrix.flush()
+        self._append_log(items)
+
+    async def close(self) -> None:
+        await asyncio.to_thread(self.compact)
+
+    def compact(self) -> None:
+        """Fold meta.log into meta.json."""
+        with self._lock:
+            if self._log_lines:
+                self._save_meta()
+
+    # ------------------------------------------------------------
+    # QUERY
+    # ------------------------------------------------------------
+    async def query_examples(
+        self,
+        embedding: VectorLike,
+        top_k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        include_values: bool = False,
+    ) -> List[VectorMatch]:
+        return await asyncio.to_thread(self.query, embedding, top_k, metadata_filter, include_values)
+
+    def query(
+        self,
+        embedding: VectorLike,
+        top_k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        include_values: bool = False,
+    ) -> List[VectorMatch]:
+        with self._lock:
+            return self._query(embedding, top_k, metadata_filter, include_values)
+
+    def _query(
+        self,
+        embedding: VectorLike,
+        top_k: int,
+        metadata_filter: Optional[Dict[str, Any]],
+        include_values: bool,
+    ) -> List[VectorMatch]:
+        n = len(self._ids)
+        if n == 0 or top_k <= 0:
+            return []
+
+        query = self._normalize(embedding)
+        rows = self._filter_rows(metadata_filter)
+        if rows is not None and rows.size == 0:
+            return []
+
+        if self._hnsw is not None:
+            hits = self._query_hnsw(query, top_k, rows)
+            if hits is not None:
+                return self._with_values(hits) if include_values else hits
+
+        candidates = self._matrix[:n] if rows is None else self._matrix[rows]
+        scores = candidates @ query
+
+        k = min(top_k, scores.size)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        row_ids = top if rows is None else rows[top]
+
+        return [
+            VectorMatch(
+                id=self._ids[r],
+                score=float(scores[t]),
+                metadata=self._metadata[r],
+                values=self._matrix[r].copy() if include_values else None,
+            )
+            for r, t in zip(row_ids, top)
+        ]
+
+    def _with_values(self, hits: List[VectorMatch]) -> List[VectorMatch]:
+        for hit in hits:
+            hit.values = self._matrix[self._row_of[hit.id]].copy()
+        return hits
+
+    def _query_hnsw(
+        self, query: np.ndarray, top_k: int, rows: Optional[np.ndarray]
+    ) -> Optional[List[VectorMatch]]:
+        allowed = None if rows is None else set(rows.tolist())
+        k = min(top_k, len(self._ids) if allowed is None else len(allowed))
+
+        try:
+            labels, distances = self._hnsw.knn_query(
+                query,
+                k=k,
+                filter=(lambda label: label in allowed) if allowed is not None else None,
+            )
+        except RuntimeError:
+            # Graph could not produce k results (very selective filter) → brute force
+            return None
+
+        return [
+            VectorMatch(id=self._ids[r], score=float(1.0 - d), metadata=self._metadata[r])
+            for r, d in zip(labels[0], distances[0])
+        ]
+
+    # ------------------------------------------------------------
+    # METADATA FILTERS (Pinecone dialect: equality, $eq, $ne, $in, $nin)
+    # ------------------------------------------------------------
+    def _filter_rows(self, metadata_filter: Optional[Dict[str, Any]]) -> Optional[np.ndarray]:
+        if not metadata_filter:
+            return None
+
+        all_rows = set(range(len(self._ids)))
+        allowed: Optional[Set[int]] = None
+
+        for key, condition in metadata_filter.items():
+            postings = self._postings.get(key, {})
+            operators = condition if isinstance(condition, dict) else {"$eq": condition}
+
+            for op, value in operators.items():
+                if op == "$eq":
+                    rows = set(postings.get(value, ()))
+                elif op == "$in":
+                    rows = set().union(*(postings.get(v, ()) for v in value))
+                elif op == "$ne":
+                    rows = all_rows - postings.get(value, set())
+                elif op == "$nin":
+                    rows = all_rows - set().union(*(postings.get(v, ()) for v in value))
+                else:
+                    raise ValueError(f"Unsupported filter operator: {op}")
+
+                allowed = rows if allowed is None else allowed & rows
+
+        return np.fromiter(sorted(allowed or ()), dtype=np.int64)
+
+    def _index(self, row: int, metadata: Dict[str, Any]) -> None:
+        for key, value in self._filter_values(metadata):
+            self._postings.setdefault(key, {}).setdefault(value, set()).add(row)
+
+    def _unindex(self, row: int) -> None:
+        for key, value in self._filter_values(self._metadata[row]):
+            self._postings.get(key, {}).get(value, set()).discard(row)
+
+    @staticmethod
+    def _filter_values(metadata: Dict[str, Any]):
+        # List fields (e.g. tags) match if ANY element matches, like Pinecone
+        for key, value in metadata.items():
+            values = value if isinstance(value, list) else [value]
+            for v in values:
+                if isinstance(v, (str, int, float, bool)):
+                    yield key, v
+
+    # ------------------------------------------------------------
+    # STORAGE
+    # ------------------------------------------------------------
+    def _normalize(self, embedding: VectorLike) -> np.ndarray:
+        vector = to_vector(embedding)
+        if vector.shape != (self.dimension,):
+            raise ValueError(
+                f"Embedding has shape {vector.shape}, index expects ({self.dimension},)"
+            )
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    def _load(self) -> None:
+        if os.path.exists(self._meta_path):
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+
+            if meta["dimension"] != self.dimension:
+                raise ValueError(
+                    f"Local index at {self.path} has dimension {meta['dimension']}, "
+                    f"expected {self.dimension}"
+                )
+
+            self._ids = meta["ids"]
+            self._metadata = meta["metadata"]
+            self._row_of = {example_id: row for row, example_id in enumerate(self._ids)}
+
+        # Replay upserts made since the last snapshot (new ids take the next row)
+        if os.path.exists(self._log_path):
+            with open(self._log_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break   # torn last line of a crashed write
+                    row = self._row_of.get(entry["id"])
+                    if row is None:
+                        self._row_of[entry["id"]] = len(self._ids)
+                        self._ids.append(entry["id"])
+                        self._metadata.append(entry["metadata"])
+                    else:
+                        self._metadata[row] = entry["metadata"]
+                    self._log_lines += 1
+
+        for row, metadata in enumerate(self._metadata):
+            self._index(row, metadata)
+
+        rows_on_disk = (
+            os.path.getsize(self._vectors_path) // (self.dimension * 4)
+            if os.path.exists(self._vectors_path)
+            else 0
+        )
+        self._map(max(_INITIAL_CAPACITY, rows_on_disk, len(self._ids)))
+
+    def _map(self, capacity: int) -> None:
+        needed = capacity * self.dimension * 4
+        with open(self._vectors_path, "ab") as f:
+            if f.tell() < needed:
+                f.truncate(needed)
+
+        self._matrix = np.memmap(
+            self._vectors_path, dtype=np.float32, mode="r+", shape=(capacity, self.dimension)
+        )
+        self._capacity = capacity
+
+    def _grow(self, capacity: int) -> None:
+        self._matrix.flush()
+        del self._matrix
+        self._map(capacity)
+        if self._hnsw is not None:
+            self._hnsw.resize_index(capacity)
+
+    def _append_log(self, items: List[Tuple[str, VectorLike, Dict[str, Any]]]) -> None:
+        with open(self._log_path, "a", encoding="utf-8") as f:
+            for example_id, _, metadata in items:
+                f.write(json.dumps({"id": example_id, "metadata": metadata}) + "\n")
+        self._log_lines += len(items)
+
+        # Amortized O(1) per upsert: rewrite only after ≥ len(index) log lines
+        if self._log_lines >= max(_MIN_COMPACT_LINES, len(self._ids)):
+            self._save_meta()
+
+    def _save_meta(self) -> None:
+        tmp_path = self._meta_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"dimension": self.dimension, "ids": self._ids, "metadata": self._metadata}, f
+            )
+        os.replace(tmp_path, self._meta_path)
+
+        # Snapshot covers everything logged so far
+        open(self._log_path, "w").close()
+        self._log_lines = 0
+
+    def _build_hnsw(self) -> None:
+        if hnswlib is None:
+            raise RuntimeError("LOCAL_VECTOR_STORE_HNSW=true requires `pip install hnswlib`")
+
+        # Inner product on normalized rows == cosine; distance = 1 - similarity
+        index = hnswlib.Index(space="ip", dim=self.dimension)
+        index.init_index(max_elements=self._capacity, ef_construction=200, M=16)
+        index.set_ef(64)
+
+        n = len(self._ids)
+        if n:
+            index.add_items(np.asarray(self._matrix[:n]), np.arange(n))
+
+        self._hnsw = index
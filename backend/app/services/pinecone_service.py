@@ -1,44 +1,122 @@
 # app/services/pinecone_service.py
 
+import asyncio
+import json
 import logging
-from typing import List, Optional, Dict, Any
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Dict, Any, Iterator, Sequence, Tuple
 
 from pinecone import Pinecone, ServerlessSpec
 
 from app.core.config import settings
+from app.observability.metrics.metrics_store import increment, set_gauge
+from app.services.vector_store import VectorStore
+from app.utils.vectors import VectorLike, to_list
 
 logger = logging.getLogger("backend")
 
 
-class PineconeService:
-    def __init__(self):
-        logger.info("🔵 Initializing Pinecone client...")
+class PineconeService(VectorStore):
+    """
+    Pinecone-backed vector store.
 
+    Construction is free (no network): the client, the index check/creation
+    and the index host lookup happen once, on first use or in `connect()`
+    (called from the FastAPI lifespan). The resolved host/dimension are
+    cached for the process; set PINECONE_INDEX_HOST to skip the control
+    plane entirely.
+    """
+
+    def __init__(self):
         if not settings.pinecone_api_key:
             raise ValueError("PINECONE_API_KEY is not set")
 
-        # Create Pinecone client
-        self.pc = Pinecone(api_key=settings.pinecone_api_key)
+        self.index_name = settings.pinecone_index
+        self.index_host: Optional[str] = settings.pinecone_index_host or None
+        self.index_dimension: Optional[int] = None
+
+        self._index = None
+        self._init_lock = threading.Lock()
+
+        # The Pinecone client is blocking: all calls run on this bounded pool,
+        # never on the event loop (and never on the default executor)
+        self._executor = ThreadPoolExecutor(
+            max_workers=settings.pinecone_max_workers,
+            thread_name_prefix="pinecone",
+        )
+
+    # ------------------------------------------------------------
+    # LAZY INITIALIZATION
+    # ------------------------------------------------------------
+    async def connect(self) -> None:
+        """Resolve (or create) the index off the event loop."""
+        await asyncio.get_running_loop().run_in_executor(self._executor, self._get_index)
+
+    @property
+    def index(self):
+        """Blocking accessor — only call from the Pinecone pool threads."""
+        return self._get_index()
+
+    def _get_index(self):
+        if self._index is None:
+            with self._init_lock:
+                if self._index is None:
+                    self._index = self._open_index()
+        return self._index
+
+    def _open_index(self):
+        logger.info("🔵 Initializing Pinecone client...")
+        start = time.perf_counter()
 
-        # Ensure index exists
-        existing = [idx["name"] for idx in self.pc.list_indexes()]
+        pc = Pinecone(api_key=settings.pinecone_api_key)
 
-        if settings.pinecone_index not in existing:
-            logger.info(f"🟦 [PINECONE] Creating index {settings.pinecone_index}...")
-            self.pc.create_index(
-                name=settings.pinecone_index,
-                dimension=3072,   # OpenAI text-embedding-3-large
+        if self.index_host is None:
+            self.index_host, self.index_dimension = self._ensure_index(pc)
+
+        # Index instance — its HTTP connection pool is sized to the thread
+        # pool, so every worker thread reuses a kept-alive connection
+        index = pc.Index(
+            host=self.index_host,
+            pool_threads=settings.pinecone_max_workers,
+            connection_pool_maxsize=settings.pinecone_max_workers,
+        )
+
+        logger.info(
+            f"🟩 [PINECONE] Index {self.index_name} ready at {self.index_host} "
+            f"({(time.perf_counter() - start) * 1000:.0f} ms)"
+        )
+        return index
+
+    def _ensure_index(self, pc: Pinecone) -> Tuple[str, int]:
+        existing = {idx["name"]: idx for idx in pc.list_indexes()}
+
+        if self.index_name not in existing:
+            logger.info(f"🟦 [PINECONE] Creating index {self.index_name}...")
+            pc.create_index(
+                name=self.index_name,
+                dimension=settings.embedding_dimensions,
                 metric="cosine",
                 spec=ServerlessSpec(
                     cloud="aws",
                     region="us-east-1",
                 ),
             )
-        else:
-            logger.info(f"🟩 [PINECONE] Using existing index: {settings.pinecone_index}")
+            description = pc.describe_index(self.index_name)
+            return description.host, description.dimension
 
-        # Index instance
-        self.index = self.pc.Index(settings.pinecone_index)
+        logger.info(f"🟩 [PINECONE] Using existing index: {self.index_name}")
+        index = existing[self.index_name]
+
+        if index["dimension"] != settings.embedding_dimensions:
+            logger.warning(
+                f"⚠️ [PINECONE] Index dimension {index['dimension']} "
+                f"!= EMBEDDING_DIMENSIONS {settings.embedding_dimensions}. "
+                "Run migrate_embedding_index.py or fix the settings."
+            )
+
+        return index["host"], index["dimension"]
 
     # ------------------------------------------------------------
     # UPSERT
@@ -46,33 +124,65 @@ class PineconeService:
     async def upsert_example(
         self,
         example_id: str,
-        embedding: List[float],
+        embedding: VectorLike,
         metadata: Dict[str, Any],
     ) -> None:
 
         logger.info(f"🟦 [PINECONE] Upserting ID={example_id}")
-        logger.info(f"Embedding size = {len(embedding)}")
-
-        self.index.upsert(
-            vectors=[
-                {
-                    "id": example_id,
-                    "values": embedding,
-                    "metadata": metadata,
-                }
-            ]
+        await self.upsert_many([(example_id, embedding, metadata)])
+        logger.info("🟩 [PINECONE] Upsert successful")
+
+    async def upsert_many(
+        self,
+        items: Sequence[Tuple[str, VectorLike, Dict[str, Any]]],
+    ) -> None:
+        """
+        Upsert many vectors: split into requests that stay under
+        PINECONE_MAX_REQUEST_BYTES / PINECONE_MAX_BATCH_VECTORS and send the
+        chunks concurrently (bounded by the thread pool).
+        """
+
+        chunks = list(self._chunk_by_payload(items))
+        logger.info(f"🟦 [PINECONE] Upserting {len(items)} vectors in {len(chunks)} requests")
+
+        await asyncio.gather(
+            *(
+                self._call("upsert", vectors=chunk, show_progress=False)
+                for chunk in chunks
+            )
         )
 
-        logger.info("🟩 [PINECONE] Upsert successful")
+    @staticmethod
+    def _chunk_by_payload(items) -> Iterator[List[dict]]:
+        chunk: List[dict] = []
+        chunk_bytes = 0
+
+        for example_id, embedding, metadata in items:
+            values = to_list(embedding)  # JSON boundary
+            size = _estimate_vector_bytes(example_id, values, metadata)
+
+            if chunk and (
+                chunk_bytes + size > settings.pinecone_max_request_bytes
+                or len(chunk) >= settings.pinecone_max_batch_vectors
+            ):
+                yield chunk
+                chunk, chunk_bytes = [], 0
+
+            chunk.append({"id": example_id, "values": values, "metadata": metadata})
+            chunk_bytes += size
+
+        if chunk:
+            yield chunk
 
     # ------------------------------------------------------------
     # QUERY EXAMPLES (semantic + metadata filtering)
     # ------------------------------------------------------------
     async def query_examples(
         self,
-        embedding: List[float],
+        embedding: VectorLike,
         top_k: int = 5,
         metadata_filter: Optional[Dict[str, Any]] = None,
+        include_values: bool = False,
     ):
         """
         metadata_filter may contain:
@@ -89,14 +199,61 @@ class PineconeService:
             f"🟦 [PINECONE] Query top_k={top_k}, filter={metadata_filter or None}"
         )
 
-        result = self.index.query(
-            vector=embedding,
+        result = await self._call(
+            "query",
+            vector=to_list(embedding),  # JSON boundary
             top_k=top_k,
             include_metadata=True,
+            include_values=include_values,
             filter=metadata_filter or None,
         )
 
         return result.matches
 
+    async def query_many(
+        self,
+        embeddings: Sequence[VectorLike],
+        top_k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[list]:
+        """One query per vector, run concurrently; results keep input order."""
+        return list(
+            await asyncio.gather(
+                *(self.query_examples(e, top_k, metadata_filter) for e in embeddings)
+            )
+        )
+
+    # ------------------------------------------------------------
+    # EXECUTION + TIMINGS
+    # ------------------------------------------------------------
+    async def _call(self, op: str, **kwargs):
+        """
+        Run `index.<op>(**kwargs)` on the Pinecone pool and record
+        pinecone_<op>_total / _errors_total / _ms_total / _last_ms.
+        """
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+
+        try:
+            return await loop.run_in_executor(
+                self._executor, lambda: getattr(self.index, op)(**kwargs)
+            )
+        except Exception:
+            increment(f"pinecone_{op}_errors_total")
+            raise
+        finally:
+            elapsed_ms = int((time.perf_counter() - start) * 1000)
+            increment(f"pinecone_{op}_total")
+            increment(f"pinecone_{op}_ms_total", elapsed_ms)
+            set_gauge(f"pinecone_{op}_last_ms", elapsed_ms)
+            logger.debug(f"[PINECONE] {op} took {elapsed_ms} ms")
+
+    async def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _estimate_vector_bytes(example_id: str, values: list, metadata: Dict[str, Any]) -> int:
+    # Floats serialize to <= ~24 JSON chars; metadata measured exactly
+    return 24 * len(values) + len(json.dumps(metadata, default=str)) + len(example_id) + 64
 
-pinecone_service = PineconeService()
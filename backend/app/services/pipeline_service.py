@@ -0,0 +1,211 @@
+# app/services/pipeline_service.py
+
+import asyncio
+import json
+import time
+from typing import Any, AsyncIterator, Dict, Optional
+from uuid import uuid4
+
+from google.adk.runners import Runner
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+from google.genai import types
+
+from app.adk_app import video_app, APP_NAME
+from app.core.config import settings
+from app.services.session_store import PostgresSessionService
+
+# Observability
+from app.observability import configure_logging, get_logger
+
+# Configure logging once
+configure_logging()
+logger = get_logger(__name__)
+
+
+def build_session_service() -> BaseSessionService:
+    """SESSION_BACKEND: "postgres" (shared across workers, TTL-evicted) or "memory"."""
+    if settings.session_backend == "memory":
+        return InMemorySessionService()
+    return PostgresSessionService()
+
+
+session_service = build_session_service()
+
+# Basic in memory runner
+runner = Runner(
+    # App contains the information of root agent to run so no need to pass agent in Runner
+    app=video_app, #Required for long running tasks / Human in the loop
+    session_service=session_service)
+
+
+def _parse(value: Any) -> Any:
+    """Agent outputs are usually JSON text; hand clients the parsed value."""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _elapsed_ms(started: float) -> int:
+    return int((time.perf_counter() - started) * 1000)
+
+
+class PipelineService:
+    """
+    Runs the video pipeline and reports it as a stream of plain dicts:
+
+        {"type": "start",    "session_id", "elapsed_ms"}
+        {"type": "progress", "agent", "elapsed_ms"}              every ADK event
+        {"type": "output",   "agent", "key", "value", "elapsed_ms"}  each state_delta key
+        {"type": "error",    "agent", "code", "message", "elapsed_ms"}
+        {"type": "final",    "result", "timings", "elapsed_ms"}
+
+    `timings` = {agent: {"first_event_ms", "last_event_ms"}} relative to
+    the start of the run. The stream ends after "error" or "final".
+    """
+
+    def __init__(self, runner: Runner):
+        self.runner = runner
+
+    async def stream(
+        self,
+        raw_requirements: str,
+        user_id: str = "user_001",
+        session_id: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        started = time.perf_counter()
+        session_id = session_id or f"s_{uuid4().hex}"
+
+        # Create ADK session. We don't use session service directly because it needs to come via Runner
+        await self.runner.session_service.create_session(
+            app_name=APP_NAME,
+            user_id=user_id,
+            session_id=session_id
+        )
+        yield {"type": "start", "session_id": session_id, "elapsed_ms": _elapsed_ms(started)}
+
+        message = types.Content(
+            parts=[types.Part(text=raw_requirements)]
+        )
+
+        final_result = None
+        timings: Dict[str, Dict[str, int]] = {}
+
+        # Run orchestrator step-by-step
+        async for event in self.runner.run_async(
+            user_id=user_id,
+            session_id=session_id,
+            new_message=message
+        ):
+            elapsed = _elapsed_ms(started)
+            agent = event.author
+            stage = timings.setdefault(agent, {"first_event_ms": elapsed, "last_event_ms": elapsed})
+            stage["last_event_ms"] = elapsed
+
+            # 1. Check for errors early
+            if event.error_code or event.error_message:
+                logger.error(
+                    "Agent error (code=%s): %s",
+                    event.error_code,
+                    event.error_message
+                )
+                yield {
+                    "type": "error",
+                    "agent": agent,
+                    "code": event.error_code,
+                    "message": event.error_message,
+                    "elapsed_ms": elapsed,
+                }
+                return
+
+            yield {"type": "progress", "agent": agent, "elapsed_ms": elapsed}
+
+            # 2. Partial results (concepts, prompts, ...) arrive as output_key state writes
+            state_delta = event.actions.state_delta if event.actions else None
+            for key, value in (state_delta or {}).items():
+                yield {
+                    "type": "output",
+                    "agent": agent,
+                    "key": key,
+                    "value": _parse(value),
+                    "elapsed_ms": elapsed,
+                }
+
+            if event.is_final_response():
+                # Extract only the TEXT of the final response
+                if event.content and event.content.parts:
+                    part = event.content.parts[0]
+                    if part.text:
+                        final_result = _parse(part.text)
+
+        if final_result is None:
+            yield {
+                "type": "error",
+                "agent": None,
+                "code": None,
+                "message": "Pipeline ended without final response.",
+                "elapsed_ms": _elapsed_ms(started),
+            }
+            return
+
+        yield {
+            "type": "final",
+            "result": final_result,
+            "timings": timings,
+            "elapsed_ms": _elapsed_ms(started),
+        }
+
+
+async def with_heartbeats(
+    events: AsyncIterator[Dict[str, Any]],
+    interval: float,
+) -> AsyncIterator[Optional[Dict[str, Any]]]:
+    """
+    Re-yield `events`, yielding None whenever `interval` seconds pass
+    without one (long agent steps), so streaming clients and proxies
+    see traffic and keep the connection open.
+
+    `events` is consumed by a single producer task for its whole life, so
+    contextvars (OpenTelemetry spans among them) are set and reset in the
+    same context.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=1)
+    done = object()
+
+    async def produce() -> None:
+        try:
+            async for item in events:
+                await queue.put((item, None))
+            await queue.put((done, None))
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            await queue.put((done, e))
+        finally:
+            aclose = getattr(events, "aclose", None)
+            if aclose is not None:
+                await aclose()
+
+    producer = asyncio.create_task(produce())
+    try:
+        while True:
+            try:
+                item, error = await asyncio.wait_for(queue.get(), timeout=interval)
+            except asyncio.TimeoutError:
+                yield None
+                continue
+
+            if error is not None:
+                raise error
+            if item is done:
+                return
+            yield item
+    finally:
+        # Client went away mid-run: stop the pipeline too
+        producer.cancel()
+        await asyncio.gather(producer, return_exceptions=True)
+
+
+pipeline_service = PipelineService(runner)
@@ -0,0 +1,195 @@
+# app/services/rate_limiter.py
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.observability.metrics.metrics_store import increment, set_gauge
+
+logger = logging.getLogger("backend")
+
+
+class TokenBucket:
+    """
+    Requests-per-minute and tokens-per-minute budget of one upstream model.
+
+    Both buckets start full and refill continuously. `acquire()` waits
+    until one request and the estimated tokens are available; waiters are
+    served in arrival order. A limit of 0 means unlimited.
+    """
+
+    def __init__(self, name: str, rpm: int, tpm: int):
+        self.name = name
+        self.rpm = rpm
+        self.tpm = tpm
+
+        self._requests = float(rpm)
+        self._tokens = float(tpm)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+        self.waiting = 0
+        self.requests_total = 0
+        self.tokens_total = 0
+        self.throttled_total = 0
+        self.wait_ms_total = 0
+
+    async def acquire(self, tokens: int) -> None:
+        started = time.monotonic()
+        self.waiting += 1
+        self._metric_gauges()
+        try:
+            async with self._lock:
+                while True:
+                    delay = self._delay(tokens)
+                    if delay <= 0:
+                        break
+                    await asyncio.sleep(delay)
+                if self.rpm:
+                    self._requests -= 1
+                if self.tpm:
+                    self._tokens -= tokens
+        finally:
+            self.waiting -= 1
+
+        waited_ms = int((time.monotonic() - started) * 1000)
+        self.requests_total += 1
+        self.tokens_total += tokens
+        increment(f"rate_limit_{self.name}_requests_total")
+        increment(f"rate_limit_{self.name}_tokens_total", tokens)
+        if waited_ms:
+            self.throttled_total += 1
+            self.wait_ms_total += waited_ms
+            increment(f"rate_limit_{self.name}_throttled_total")
+            increment(f"rate_limit_{self.name}_wait_ms_total", waited_ms)
+        self._metric_gauges()
+
+    def settle(self, estimated: int, actual: int) -> None:
+        """Correct the token bucket once the provider reports real usage."""
+        if self.tpm and actual:
+            self._refill()
+            self._tokens = min(self.tpm, self._tokens - (actual - estimated))
+            self.tokens_total += actual - estimated
+
+    def pause(self, seconds: float) -> None:
+        """Upstream said 429 anyway: hold every caller back for a while."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        increment(f"rate_limit_{self.name}_upstream_429_total")
+        logger.warning(f"⚠️ [RATE LIMIT] {self.name}: upstream 429, pausing {seconds:.0f}s")
+
+    def snapshot(self) -> Dict[str, Any]:
+        self._refill()
+        return {
+            "rpm": self.rpm,
+            "tpm": self.tpm,
+            "requests_available": round(self._requests, 1) if self.rpm else None,
+            "tokens_available": int(self._tokens) if self.tpm else None,
+            "paused_seconds": round(max(0.0, self._paused_until - time.monotonic()), 1),
+            "waiting": self.waiting,
+            "requests_total": self.requests_total,
+            "tokens_total": self.tokens_total,
+            "throttled_total": self.throttled_total,
+            "wait_ms_total": self.wait_ms_total,
+        }
+
+    # ------------------------------------------------------------
+    # HELPERS
+    # ------------------------------------------------------------
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed, self._updated = now - self._updated, now
+        if self.rpm:
+            self._requests = min(self.rpm, self._requests + elapsed * self.rpm / 60)
+        if self.tpm:
+            self._tokens = min(self.tpm, self._tokens + elapsed * self.tpm / 60)
+
+    def _delay(self, tokens: int) -> float:
+        """Seconds until the request fits (0 = now)."""
+        self._refill()
+        delays = [self._paused_until - time.monotonic()]
+        if self.rpm and self._requests < 1:
+            delays.append((1 - self._requests) * 60 / self.rpm)
+        if self.tpm:
+            # A request larger than the whole budget waits for a full bucket
+            needed = min(tokens, self.tpm)
+            if self._tokens < needed:
+                delays.append((needed - self._tokens) * 60 / self.tpm)
+        return max(delays)
+
+    def _metric_gauges(self) -> None:
+        set_gauge(f"rate_limit_{self.name}_waiting", self.waiting)
+        if self.tpm:
+            set_gauge(f"rate_limit_{self.name}_tokens_available", int(self._tokens))
+
+
+class RateLimiter:
+    """
+    Client-side token buckets keyed by upstream model name, shared by every
+    caller in the process (all Gemini agents, the embedding client).
+
+    Limits: an exact entry in `overrides`, else the first `defaults` entry
+    whose prefix matches the model name; models matching neither are not
+    limited.
+    """
+
+    def __init__(
+        self,
+        defaults: Dict[str, Tuple[int, int]],
+        overrides: Optional[Dict[str, Dict[str, int]]] = None,
+        enabled: bool = True,
+    ):
+        self.defaults = defaults
+        self.overrides = overrides or {}
+        self.enabled = enabled
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+
+    def bucket(self, model: str) -> Optional[TokenBucket]:
+        if model not in self._buckets:
+            self._buckets[model] = self._build(model)
+        return self._buckets[model]
+
+    async def acquire(self, model: str, tokens: int) -> None:
+        bucket = self.bucket(model) if self.enabled else None
+        if bucket is not None:
+            await bucket.acquire(tokens)
+
+    def settle(self, model: str, estimated: int, actual: Optional[int]) -> None:
+        bucket = self.bucket(model) if self.enabled else None
+        if bucket is not None and actual:
+            bucket.settle(estimated, actual)
+
+    def pause(self, model: str, seconds: Optional[float] = None) -> None:
+        bucket = self.bucket(model) if self.enabled else None
+        if bucket is not None:
+            bucket.pause(seconds or settings.rate_limit_pause_seconds)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {model: bucket.snapshot() for model, bucket in self._buckets.items() if bucket}
+
+    def _build(self, model: str) -> Optional[TokenBucket]:
+        limits = self.overrides.get(model)
+        if limits is not None:
+            rpm, tpm = limits.get("rpm", 0), limits.get("tpm", 0)
+        else:
+            match = next((v for prefix, v in self.defaults.items() if model.startswith(prefix)), None)
+            if match is None:
+                return None
+            rpm, tpm = match
+
+        if not rpm and not tpm:
+            return None
+        logger.info(f"🟦 [RATE LIMIT] {model}: {rpm or '∞'} rpm, {tpm or '∞'} tpm")
+        return TokenBucket(model, rpm, tpm)
+
+
+rate_limiter = RateLimiter(
+    defaults={
+        "gemini": (settings.rate_limit_gemini_rpm, settings.rate_limit_gemini_tpm),
+        "text-embedding": (settings.rate_limit_embedding_rpm, settings.rate_limit_embedding_tpm),
+    },
+    overrides=settings.rate_limit_overrides,
+    enabled=settings.rate_limit_enabled,
+)
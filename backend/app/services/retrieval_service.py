@@ -1,11 +1,17 @@
 # app/services/retrieval_service.py
 
-from typing import List, Optional
-from pydantic import BaseModel
+import json
+import logging
+from dataclasses import dataclass, field
+from itertools import chain
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import settings
 from app.services.example_service import example_service
-import logging
+from app.schemas.example_schema import ExampleSearchResult
 from app.schemas.retrieval_schema import (
     RetrievalPreferences,
     RetrievedExample,
@@ -14,17 +20,123 @@ from app.schemas.retrieval_schema import (
 logger = logging.getLogger("backend")
 
 
+def _norm(value: Optional[str]) -> str:
+    return value.lower().strip() if value else ""
+
+
+@dataclass
+class RerankWeights:
+    """Additive boosts on top of the vector similarity score."""
+
+    category: float = field(default_factory=lambda: settings.retrieval_category_boost)
+    tone: float = field(default_factory=lambda: settings.retrieval_tone_boost)      # per matching tone
+    region: float = field(default_factory=lambda: settings.retrieval_region_boost)
+
+
+class CandidateBatch:
+    """
+    Columnar encoding of re-ranking candidates, built once per result set.
+
+    - `base`     : similarity scores, float64[n]
+    - `category` : business_type code per candidate, int32[n]
+    - labels     : tags + tone per candidate as a flat code array
+                   (`label_codes`) with the owning row (`label_rows`)
+    Strings are mapped to codes through one shared vocabulary, so scoring
+    is pure NumPy — no per-candidate Python work.
+    """
+
+    def __init__(self, candidates: Sequence[ExampleSearchResult]):
+        self.candidates = list(candidates)
+        n = len(self.candidates)
+
+        categories = [c.business_type or "" for c in self.candidates]
+        labels = [c.tags + [c.tone] if c.tone else c.tags for c in self.candidates]
+        flat = list(chain.from_iterable(labels))
+
+        # Distinct raw strings are few: normalize those once, then map in C
+        self.vocab: Dict[str, int] = {}
+        raw_codes = {raw: self._code(raw) for raw in set(categories).union(flat)}
+
+        self.base = np.array([c.score for c in self.candidates], dtype=np.float64)
+        self.category = np.fromiter(map(raw_codes.__getitem__, categories), dtype=np.int32, count=n)
+
+        self.label_codes = np.fromiter(map(raw_codes.__getitem__, flat), dtype=np.int32, count=len(flat))
+        self.label_rows = np.repeat(np.arange(n, dtype=np.int32), [len(x) for x in labels])
+
+    def __len__(self) -> int:
+        return len(self.candidates)
+
+    def _code(self, value: str) -> int:
+        return self.vocab.setdefault(_norm(value), len(self.vocab))
+
+    def has_label(self, code: int) -> np.ndarray:
+        """bool[n]: candidates carrying the label (a tone repeated as a tag counts once)."""
+        present = np.zeros(len(self.candidates), dtype=bool)
+        present[self.label_rows[self.label_codes == code]] = True
+        return present
+
+    def lookup(self, values: Sequence[str]) -> List[int]:
+        """Codes of the given (non-empty) strings that occur in this batch."""
+        return [self.vocab[v] for v in map(_norm, values) if v and v in self.vocab]
+
+
+class ExampleReranker:
+    """Scores every candidate at once and selects top-k by partial selection."""
+
+    def __init__(self, weights: Optional[RerankWeights] = None):
+        self.weights = weights or RerankWeights()
+
+    def score(self, batch: CandidateBatch, preferences: RetrievalPreferences) -> np.ndarray:
+        final = batch.base.copy()
+
+        # ✅ Category boost (business_type)
+        category = batch.lookup([preferences.category] if preferences.category else [])
+        if category:
+            final += self.weights.category * (batch.category == category[0])
+
+        # ✅ Tone / style boost (funny, premium, cinematic, ...) — per matching tone
+        for code in batch.lookup(preferences.tones or []):
+            final += self.weights.tone * batch.has_label(code)
+
+        # ✅ Region boost (e.g., "punjab" tag)
+        region = batch.lookup([preferences.region] if preferences.region else [])
+        if region:
+            final += self.weights.region * batch.has_label(region[0])
+
+        return final
+
+    def top_k(
+        self,
+        batch: CandidateBatch,
+        preferences: RetrievalPreferences,
+        k: int,
+    ) -> List[Tuple[int, float]]:
+        """[(candidate index, final score)], best first — O(n + k log k)."""
+        scores = self.score(batch, preferences)
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+
+        # argpartition = introselect: no full sort of all candidates
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(int(i), float(scores[i])) for i in best]
+
+
 class ExampleRetrievalService:
     """
     High-level retrieval service used by agents.
 
     Responsibilities:
     - Turn business description into an embedding (via example_service internally)
-    - Query Pinecone for similar examples
+    - Query the vector index for similar examples
     - Fetch full records from Postgres
-    - Re-rank based on category, tones, region
+    - Re-rank based on category, tones, region (ExampleReranker)
     """
 
+    def __init__(self, reranker: Optional[ExampleReranker] = None):
+        self.reranker = reranker or ExampleReranker()
+
     async def get_examples_for_business(
         self,
         db: AsyncSession,
@@ -46,7 +158,7 @@ class ExampleRetrievalService:
         if not business_description or not business_description.strip():
             raise ValueError("business_description cannot be empty")
 
-        # 🔹 Step 1: Use existing search service to get base results from Pinecone + Postgres
+        # 🔹 Step 1: Use existing search service to get base results from the index + Postgres
         logger.info(
             "🔎 [RETRIEVAL] Searching examples for business (category=%s, tones=%s, region=%s)",
             preferences.category,
@@ -54,64 +166,29 @@ class ExampleRetrievalService:
             preferences.region,
         )
 
+        # No metadata filter: category/tone/region are boosts, not hard filters
         base_results = await example_service.search_examples(
             db=db,
             query=business_description,
-            top_k=preferences.max_examples * 2,  # fetch a bit more for re-ranking
-            category=preferences.category,
+            business_type=None,
+            ad_style=None,
+            tone=None,
+            target_audience=None,
+            tags=None,
+            top_k=preferences.max_examples * settings.retrieval_candidate_multiplier,
         )
 
         if not base_results:
             logger.warning("⚠️ [RETRIEVAL] No examples found for query.")
             return []
 
-        # 🔹 Step 2: Re-rank according to tones + region + category
-        re_ranked: List[RetrievedExample] = []
-
-        tones_lower = {t.lower().strip() for t in preferences.tones} if preferences.tones else set()
-        region_lower = preferences.region.lower().strip() if preferences.region else None
-        category_lower = preferences.category.lower().strip() if preferences.category else None
-
-        for res in base_results:
-            # `res` is assumed to be a dict from example_service.search_examples
-            # with keys: id, title, content, category, tags, score
-            base_score = float(res.score)
-            category = res.category
-            tags = res.tags or []
-
-            tags_lower = {str(t).lower().strip() for t in tags}
-
-            # Start with Pinecone similarity score
-            final_score = base_score
-
-            # ✅ Category boost
-            if category_lower and category and category.lower().strip() == category_lower:
-                final_score += 0.15  # tune as needed
-
-            # ✅ Tone / style boost (funny, premium, cinematic, etc.)
-            if tones_lower:
-                tone_matches = tones_lower.intersection(tags_lower)
-                if tone_matches:
-                    final_score += 0.05 * len(tone_matches)
-
-            # ✅ Region boost (e.g., "punjab" tag)
-            if region_lower and region_lower in tags_lower:
-                final_score += 0.1
-
-            re_ranked.append(
-                RetrievedExample(
-                    id=str(res.id),
-                    title=res.title or "",
-                    content=res.content or "",
-                    category=category,
-                    tags=res.tags or [],
-                    score=final_score,
-                )
-            )
-
-        # 🔹 Step 3: Sort by final score descending and trim
-        re_ranked.sort(key=lambda x: x.score, reverse=True)
-        final = re_ranked[: preferences.max_examples]
+        # 🔹 Step 2 + 3: Score all candidates at once, keep the best max_examples
+        batch = CandidateBatch(base_results)
+        ranked = self.reranker.top_k(batch, preferences, preferences.max_examples)
+
+        final = [
+            self._to_retrieved(batch.candidates[index], score) for index, score in ranked
+        ]
 
         logger.info(
             "✅ [RETRIEVAL] Returning %d curated examples (from %d base results)",
@@ -121,6 +198,18 @@ class ExampleRetrievalService:
 
         return final
 
+    @staticmethod
+    def _to_retrieved(res: ExampleSearchResult, score: float) -> RetrievedExample:
+        content = res.prompt_text or (json.dumps(res.prompt_json) if res.prompt_json else "")
+        return RetrievedExample(
+            id=str(res.id),
+            title=res.title or "",
+            content=content,
+            category=res.business_type,
+            tags=res.tags or [],
+            score=score,
+        )
+
 
 # Singleton-style instance to import elsewhere
 example_retrieval_service = ExampleRetrievalService()
@@ -0,0 +1,131 @@
+# app/services/search_cache.py
+
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.observability.metrics.metrics_store import increment, set_gauge
+from app.services.embedding_cache import normalize_text
+from app.services.vector_store import VectorMatch, match_values
+
+logger = logging.getLogger("backend")
+
+
+class SearchResultCache:
+    """
+    TTL + LRU cache of vector-search results (ids, scores, metadata).
+
+    - Key: case-folded normalized query + canonical filter JSON + top_k
+    - `bump_version()` (called on every ingest / index update) drops all
+      entries; results of searches that were in flight during a bump are
+      not stored, because `put()` checks the version read before searching
+    - The version is per process; the TTL bounds staleness for writes
+      made by other processes
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.version = 0
+        self._entries: "OrderedDict[Tuple, Tuple[int, float, List[VectorMatch]]]" = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_entries > 0 and self.ttl_seconds > 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(
+        query: str,
+        metadata_filter: Optional[Dict[str, Any]],
+        top_k: int,
+        include_values: bool = False,
+    ) -> Tuple:
+        filters = json.dumps(metadata_filter or {}, sort_keys=True, default=str)
+        return (normalize_text(query).casefold(), filters, top_k, include_values)
+
+    def get(
+        self,
+        query: str,
+        metadata_filter: Optional[Dict[str, Any]],
+        top_k: int,
+        include_values: bool = False,
+    ) -> Optional[List[VectorMatch]]:
+        if not self.enabled:
+            return None
+
+        key = self.make_key(query, metadata_filter, top_k, include_values)
+        entry = self._entries.get(key)
+
+        if entry is None:
+            increment("search_cache_misses_total")
+            return None
+
+        version, expires_at, matches = entry
+        if version != self.version or expires_at < time.monotonic():
+            del self._entries[key]
+            increment("search_cache_stale_total")
+            increment("search_cache_misses_total")
+            set_gauge("search_cache_entries", len(self._entries))
+            return None
+
+        self._entries.move_to_end(key)
+        increment("search_cache_hits_total")
+        return matches
+
+    def put(
+        self,
+        query: str,
+        metadata_filter: Optional[Dict[str, Any]],
+        top_k: int,
+        matches: List[Any],
+        version: int,
+        include_values: bool = False,
+    ) -> None:
+        """`version` = value of `self.version` read BEFORE the search ran."""
+        if not self.enabled or version != self.version:
+            return   # index changed while searching: result may be stale
+
+        key = self.make_key(query, metadata_filter, top_k, include_values)
+        self._entries[key] = (
+            version,
+            time.monotonic() + self.ttl_seconds,
+            [
+                VectorMatch(
+                    id=m.id,
+                    score=m.score,
+                    metadata=dict(m.metadata or {}),
+                    values=match_values(m) if include_values else None,
+                )
+                for m in matches
+            ],
+        )
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            increment("search_cache_evictions_total")
+
+        set_gauge("search_cache_entries", len(self._entries))
+
+    def bump_version(self) -> None:
+        """Invalidate every cached result (the index changed)."""
+        self.version += 1
+        self._entries.clear()
+        set_gauge("search_cache_version", self.version)
+        set_gauge("search_cache_entries", 0)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        set_gauge("search_cache_entries", 0)
+
+
+search_cache = SearchResultCache(
+    max_entries=settings.search_cache_max_entries,
+    ttl_seconds=settings.search_cache_ttl_seconds,
+)
@@ -0,0 +1,359 @@
+# app/services/session_store.py
+
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from google.adk.errors.already_exists_error import AlreadyExistsError
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, Session
+from google.adk.sessions.base_session_service import GetSessionConfig, ListSessionsResponse
+from google.adk.sessions.state import State
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.database import async_session
+from app.db.orm.agent_session import (
+    AgentAppState,
+    AgentSession,
+    AgentSessionEvent,
+    AgentUserState,
+)
+from app.observability.metrics.metrics_store import increment
+
+logger = logging.getLogger("backend")
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _aware(value: datetime) -> datetime:
+    # Backends without tz-aware timestamps hand back naive UTC
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+def _split_state(state: Optional[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """{"app": {...}, "user": {...}, "session": {...}}; temp: keys are dropped."""
+    parts: Dict[str, Dict[str, Any]] = {"app": {}, "user": {}, "session": {}}
+    for key, value in (state or {}).items():
+        if key.startswith(State.APP_PREFIX):
+            parts["app"][key.removeprefix(State.APP_PREFIX)] = value
+        elif key.startswith(State.USER_PREFIX):
+            parts["user"][key.removeprefix(State.USER_PREFIX)] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            parts["session"][key] = value
+    return parts
+
+
+class PostgresSessionService(BaseSessionService):
+    """
+    ADK session service on the application's async SQLAlchemy engine
+    (asyncpg pool) — no second, synchronous psycopg2 connection pool.
+
+    - Sessions, events and app/user state live in PostgreSQL, so several
+      uvicorn workers behind a load balancer share them
+    - Events are stored as compact JSON (None fields omitted); partial
+      (streaming) events are never stored
+    - Sessions idle longer than `ttl_seconds` are invisible to get/list and
+      deleted (with their events) by a background task every
+      `evict_interval_seconds`
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: Optional[float] = None,
+        evict_interval_seconds: Optional[float] = None,
+        evict_batch_size: int = 500,
+    ):
+        self.ttl_seconds = ttl_seconds or settings.session_ttl_seconds
+        self.evict_interval_seconds = evict_interval_seconds or settings.session_evict_interval_seconds
+        self.evict_batch_size = evict_batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------
+    # SESSIONS
+    # ------------------------------------------------------------
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[Dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = session_id.strip() if session_id and session_id.strip() else str(uuid.uuid4())
+        parts = _split_state(state)
+        now = _utcnow()
+
+        async with async_session() as db:
+            if await db.get(AgentSession, (app_name, user_id, session_id)) is not None:
+                raise AlreadyExistsError(f"Session with id {session_id} already exists.")
+
+            await self._merge_scoped_state(db, app_name, user_id, parts["app"], parts["user"])
+            db.add(
+                AgentSession(
+                    app_name=app_name,
+                    user_id=user_id,
+                    id=session_id,
+                    state=parts["session"],
+                    updated_at=now,
+                )
+            )
+            await db.commit()
+
+            merged = await self._with_scoped_state(db, app_name, user_id, parts["session"])
+
+        increment("agent_sessions_created_total")
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=merged,
+            last_update_time=now.timestamp(),
+        )
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        async with async_session() as db:
+            row = await db.get(AgentSession, (app_name, user_id, session_id))
+            if row is None or self._expired(row):
+                return None
+
+            stmt = select(AgentSessionEvent.event).where(
+                AgentSessionEvent.app_name == app_name,
+                AgentSessionEvent.user_id == user_id,
+                AgentSessionEvent.session_id == session_id,
+            )
+            if config and config.after_timestamp:
+                stmt = stmt.where(AgentSessionEvent.timestamp >= config.after_timestamp)
+            stmt = stmt.order_by(AgentSessionEvent.timestamp.desc())
+            if config and config.num_recent_events:
+                stmt = stmt.limit(config.num_recent_events)
+
+            result = await db.execute(stmt)
+            events = [Event.model_validate(data) for data in reversed(result.scalars().all())]
+
+            merged = await self._with_scoped_state(db, app_name, user_id, row.state or {})
+
+        return Session(
+            app_name=app_name,
+            user_id=user_id,
+            id=session_id,
+            state=merged,
+            events=events,
+            last_update_time=_aware(row.updated_at).timestamp(),
+        )
+
+    async def list_sessions(
+        self, *, app_name: str, user_id: Optional[str] = None
+    ) -> ListSessionsResponse:
+        stmt = select(AgentSession).where(
+            AgentSession.app_name == app_name,
+            AgentSession.updated_at >= self._cutoff(),
+        )
+        if user_id is not None:
+            stmt = stmt.where(AgentSession.user_id == user_id)
+
+        async with async_session() as db:
+            rows = (await db.execute(stmt)).scalars().all()
+            sessions = [
+                Session(
+                    app_name=row.app_name,
+                    user_id=row.user_id,
+                    id=row.id,
+                    state=await self._with_scoped_state(db, row.app_name, row.user_id, row.state or {}),
+                    last_update_time=_aware(row.updated_at).timestamp(),
+                )
+                for row in rows
+            ]
+
+        return ListSessionsResponse(sessions=sessions)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        async with async_session() as db:
+            await self._delete(db, [(app_name, user_id, session_id)])
+            await db.commit()
+
+    # ------------------------------------------------------------
+    # EVENTS
+    # ------------------------------------------------------------
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+
+        # Applies the state delta to the in-memory session object
+        event = await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+
+        parts = _split_state(event.actions.state_delta if event.actions else None)
+        values: Dict[str, Any] = {"updated_at": _utcnow()}
+        if parts["session"]:
+            values["state"] = _split_state(session.state)["session"]
+
+        async with async_session() as db:
+            db.add(
+                AgentSessionEvent(
+                    id=event.id,
+                    app_name=session.app_name,
+                    user_id=session.user_id,
+                    session_id=session.id,
+                    timestamp=event.timestamp,
+                    event=event.model_dump(mode="json", exclude_none=True),
+                )
+            )
+            await db.execute(
+                update(AgentSession)
+                .where(
+                    AgentSession.app_name == session.app_name,
+                    AgentSession.user_id == session.user_id,
+                    AgentSession.id == session.id,
+                )
+                .values(**values)
+            )
+            await self._merge_scoped_state(
+                db, session.app_name, session.user_id, parts["app"], parts["user"]
+            )
+            await db.commit()
+
+        return event
+
+    async def replace_events(self, session: Session, events: List[Event]) -> None:
+        """Overwrite the stored copies of `events` (e.g. after compaction)."""
+        async with async_session() as db:
+            for event in events:
+                await db.execute(
+                    update(AgentSessionEvent)
+                    .where(
+                        AgentSessionEvent.app_name == session.app_name,
+                        AgentSessionEvent.user_id == session.user_id,
+                        AgentSessionEvent.session_id == session.id,
+                        AgentSessionEvent.id == event.id,
+                    )
+                    .values(event=event.model_dump(mode="json", exclude_none=True))
+                )
+            await db.commit()
+
+    # ------------------------------------------------------------
+    # TTL EVICTION (FastAPI lifespan)
+    # ------------------------------------------------------------
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._evict_loop())
+            logger.info(f"🟦 [SESSIONS] Eviction started (ttl={self.ttl_seconds:.0f}s)")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _evict_loop(self) -> None:
+        while True:
+            try:
+                evicted = await self.evict_expired()
+                if evicted:
+                    logger.info(f"🟩 [SESSIONS] Evicted {evicted} expired sessions")
+            except Exception as e:
+                logger.error(f"❌ [SESSIONS] Eviction failed: {e}")
+            await asyncio.sleep(self.evict_interval_seconds)
+
+    async def evict_expired(self) -> int:
+        """Delete sessions idle past the TTL (in batches); returns the count."""
+        total = 0
+        while True:
+            async with async_session() as db:
+                result = await db.execute(
+                    select(AgentSession.app_name, AgentSession.user_id, AgentSession.id)
+                    .where(AgentSession.updated_at < self._cutoff())
+                    .limit(self.evict_batch_size)
+                )
+                keys = [tuple(row) for row in result.all()]
+                if not keys:
+                    break
+                await self._delete(db, keys)
+                await db.commit()
+
+            total += len(keys)
+            increment("agent_sessions_evicted_total", len(keys))
+            if len(keys) < self.evict_batch_size:
+                break
+        return total
+
+    # ------------------------------------------------------------
+    # HELPERS
+    # ------------------------------------------------------------
+    def _cutoff(self) -> datetime:
+        return _utcnow() - timedelta(seconds=self.ttl_seconds)
+
+    def _expired(self, row: AgentSession) -> bool:
+        return _aware(row.updated_at) < self._cutoff()
+
+    @staticmethod
+    async def _delete(db: AsyncSession, keys) -> None:
+        for app_name, user_id, session_id in keys:
+            # Events explicitly too: not every backend enforces ON DELETE CASCADE
+            await db.execute(
+                delete(AgentSessionEvent).where(
+                    AgentSessionEvent.app_name == app_name,
+                    AgentSessionEvent.user_id == user_id,
+                    AgentSessionEvent.session_id == session_id,
+                )
+            )
+            await db.execute(
+                delete(AgentSession).where(
+                    AgentSession.app_name == app_name,
+                    AgentSession.user_id == user_id,
+                    AgentSession.id == session_id,
+                )
+            )
+
+    @staticmethod
+    async def _merge_scoped_state(
+        db: AsyncSession,
+        app_name: str,
+        user_id: str,
+        app_delta: Dict[str, Any],
+        user_delta: Dict[str, Any],
+    ) -> None:
+        if app_delta:
+            row = await db.get(AgentAppState, app_name, with_for_update=True)
+            if row is None:
+                db.add(AgentAppState(app_name=app_name, state=dict(app_delta)))
+            else:
+                row.state = {**(row.state or {}), **app_delta}
+        if user_delta:
+            row = await db.get(AgentUserState, (app_name, user_id), with_for_update=True)
+            if row is None:
+                db.add(AgentUserState(app_name=app_name, user_id=user_id, state=dict(user_delta)))
+            else:
+                row.state = {**(row.state or {}), **user_delta}
+
+    @staticmethod
+    async def _with_scoped_state(
+        db: AsyncSession,
+        app_name: str,
+        user_id: str,
+        session_state: Dict[str, Any],
+    ) -> Dict[str, Any]:
+        """Session state plus app:/user: keys, like ADK's own services."""
+        merged = dict(session_state)
+
+        app_row = await db.get(AgentAppState, app_name)
+        for key, value in ((app_row.state or {}) if app_row else {}).items():
+            merged[State.APP_PREFIX + key] = value
+
+        user_row = await db.get(AgentUserState, (app_name, user_id))
+        for key, value in ((user_row.state or {}) if user_row else {}).items():
+            merged[State.USER_PREFIX + key] = value
+
+        return merged
@@ -0,0 +1,208 @@
+# app/services/state_compaction.py
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Set
+
+from google.adk.agents import BaseAgent, LlmAgent, LoopAgent, ParallelAgent, SequentialAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.events import Event
+from google.adk.plugins.base_plugin import BasePlugin
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.sessions.state import State
+
+from app.core.config import settings
+from app.observability.metrics.metrics_store import increment
+from app.services.context_packer import compact_json
+from app.services.session_store import PostgresSessionService
+from app.utils.tokens import truncate_tokens
+
+logger = logging.getLogger("backend")
+
+# Same placeholder syntax ADK's instruction templating resolves
+_PLACEHOLDER = re.compile(r"{+([^{}]*)}+")
+_SCOPES = (State.APP_PREFIX, State.USER_PREFIX, State.TEMP_PREFIX)
+
+
+def state_references(template: str) -> Set[str]:
+    """State keys a template reads via `{key}` / `{key?}` (not `{artifact.x}`)."""
+    keys = set()
+    for match in _PLACEHOLDER.finditer(template):
+        name = match.group(1).strip().removesuffix("?")
+        scope, _, rest = name.rpartition(":")
+        if rest.isidentifier() and (not scope or scope + ":" in _SCOPES):
+            keys.add(name)
+    return keys
+
+
+def _walk(agent: BaseAgent) -> Iterator[BaseAgent]:
+    yield agent
+    for sub_agent in agent.sub_agents:
+        yield from _walk(sub_agent)
+
+
+def _reads(agent: BaseAgent) -> Optional[Set[str]]:
+    """
+    Keys `agent` reads; None = unknown: an instruction built in code, or a
+    custom / remote agent without `input_keys` (a RemoteA2aAgent sends the
+    whole event history to the remote side).
+    """
+    if isinstance(agent, (SequentialAgent, LoopAgent, ParallelAgent)):
+        return set()   # only runs its sub-agents
+    declared = getattr(agent, "input_keys", None)
+    if declared is None and not isinstance(agent, LlmAgent):
+        return None
+
+    keys = set(declared or ())
+    for template in (getattr(agent, "instruction", ""), getattr(agent, "global_instruction", "")):
+        if not isinstance(template, str):
+            return None
+        keys |= state_references(template)
+    return keys
+
+
+@dataclass
+class CompactionPlan:
+    """
+    For a SequentialAgent pipeline: which output_key values can go after
+    each top-level stage — the last stage that reads them has finished.
+
+    Stages are the unit (not leaf agents) so loops and parallel branches
+    inside a stage still see their inputs on every iteration. Keys nobody
+    reads (final outputs) are never compacted.
+    """
+
+    stages: List[BaseAgent]
+    drop_after: Dict[int, List[str]] = field(default_factory=dict)
+    opaque: List[str] = field(default_factory=list)   # stages that may read anything
+
+    @classmethod
+    def from_agent(cls, root_agent: BaseAgent) -> "CompactionPlan":
+        if not isinstance(root_agent, SequentialAgent):
+            return cls(stages=[])
+
+        produced: Set[str] = set()
+        last_reader: Dict[str, int] = {}
+        opaque: Set[int] = set()   # stages that may read anything
+
+        for index, stage in enumerate(root_agent.sub_agents):
+            for agent in _walk(stage):
+                if getattr(agent, "output_key", None):
+                    produced.add(agent.output_key)
+                keys = _reads(agent)
+                if keys is None:
+                    opaque.add(index)
+                    continue
+                for key in keys:
+                    last_reader[key] = max(last_reader.get(key, index), index)
+
+        plan = cls(stages=list(root_agent.sub_agents))
+        plan.opaque = [plan.stages[i].name for i in sorted(opaque)]
+        for key in sorted(produced & last_reader.keys()):
+            index = max([last_reader[key], *opaque])
+            if index < len(plan.stages) - 1:
+                plan.drop_after.setdefault(index, []).append(key)
+        return plan
+
+    def keys_after(self, agent: BaseAgent) -> List[str]:
+        for index, stage in enumerate(self.stages):
+            if stage is agent:
+                return self.drop_after.get(index, [])
+        return []
+
+
+# ------------------------------------------------------------
+# PLUGIN
+# ------------------------------------------------------------
+class StateCompactionPlugin(BasePlugin):
+    """
+    Applies a CompactionPlan while the pipeline runs.
+
+    When a stage finishes, its now-unread keys are set to None in session
+    state (ADK renders a None placeholder as ""), and the events that
+    carried them — state_delta value and the producing reply's text — are
+    cut to a marker, in memory and in the session store (PostgreSQL session
+    store only; other services keep their events as they are). With
+    `keep_tokens` > 0 a truncated summary is kept instead of None.
+    """
+
+    def __init__(self, root_agent: BaseAgent, keep_tokens: Optional[int] = None, name: str = "state_compaction"):
+        super().__init__(name=name)
+        self.plan = CompactionPlan.from_agent(root_agent)
+        self.keep_tokens = settings.session_compaction_keep_tokens if keep_tokens is None else keep_tokens
+        self._rewrite_skipped_logged = False
+        logger.info(
+            "🟦 [COMPACTION] Plan: "
+            + (", ".join(f"{self.plan.stages[i].name} → {keys}" for i, keys in sorted(self.plan.drop_after.items())) or "nothing")
+            + (f" (stages reading all state/history: {self.plan.opaque})" if self.plan.opaque else "")
+        )
+
+    async def after_agent_callback(self, *, agent: BaseAgent, callback_context: CallbackContext):
+        keys = self.plan.keys_after(agent)
+        if not keys:
+            return None
+
+        ctx = _invocation_context(callback_context)
+        state = ctx.session.state
+        compacted: Dict[str, Any] = {}
+        freed = 0
+        for key in keys:
+            value = state.get(key)
+            if value is None:
+                continue
+            compacted[key] = self._summary(value)
+            freed += len(value if isinstance(value, str) else compact_json(value)) - len(compacted[key] or "")
+            callback_context.state[key] = compacted[key]
+
+        if not compacted:
+            return None
+
+        # Events are rewritten only where the stored copy can follow, so the
+        # in-memory session never diverges from the session store
+        if isinstance(ctx.session_service, PostgresSessionService):
+            events = [e for e in ctx.session.events if _compact_event(e, compacted)]
+            if events:
+                try:
+                    await ctx.session_service.replace_events(ctx.session, events)
+                except Exception as e:
+                    logger.warning(f"⚠️ [COMPACTION] Stored events not compacted: {e}")
+        elif not self._rewrite_skipped_logged:
+            self._rewrite_skipped_logged = True
+            logger.info(
+                f"🟦 [COMPACTION] {type(ctx.session_service).__name__} cannot rewrite stored "
+                "events: compacting session state only"
+            )
+
+        increment("session_compacted_keys_total", len(compacted))
+        increment("session_compacted_chars_total", freed)
+        logger.info(f"🟩 [COMPACTION] After {agent.name}: {sorted(compacted)} ({freed} chars)")
+        return None
+
+    def _summary(self, value: Any) -> Optional[str]:
+        if self.keep_tokens <= 0:
+            return None
+        return truncate_tokens(value if isinstance(value, str) else compact_json(value), self.keep_tokens)
+
+
+def _invocation_context(callback_context: CallbackContext) -> InvocationContext:
+    # CallbackContext exposes state but not the session's events or the
+    # session service; both are needed to compact events, and ADK offers
+    # no public accessor, so this is the one place that reaches in.
+    return callback_context._invocation_context
+
+
+def _compact_event(event: Event, compacted: Dict[str, Any]) -> bool:
+    """Rewrite `event` in place if it carried a compacted value."""
+    delta = event.actions.state_delta if event.actions else None
+    hits = [key for key in compacted if delta and delta.get(key) is not None]
+    if not hits:
+        return False
+
+    for key in hits:
+        delta[key] = compacted[key]
+    # The producing agent's reply is the same value as text (or its JSON)
+    for part in (event.content.parts or []) if event.content else []:
+        if part.text:
+            part.text = compacted[hits[0]] or f"[{hits[0]} compacted]"
+    return True
@@ -0,0 +1,132 @@
+# app/services/vector_store.py
+
+import logging
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.utils.vectors import Vector, VectorLike, to_vector
+
+logger = logging.getLogger("backend")
+
+
+@dataclass
+class VectorMatch:
+    """Backend-neutral query hit (same attribute names as Pinecone matches)."""
+
+    id: str
+    score: float
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    values: Optional[Vector] = None      # only when queried with include_values
+
+
+def match_values(match: Any) -> Optional[Vector]:
+    """Stored vector of a VectorMatch / Pinecone match, if it was returned."""
+    values = getattr(match, "values", None)
+    return to_vector(values) if values is not None and len(values) else None
+
+
+class VectorStore(ABC):
+    """
+    Interface every vector index backend implements.
+
+    metadata_filter uses the Pinecone filter dialect:
+    {
+        "business_type": "...",            # equality (list fields: contains)
+        "tags": {"$in": [...]},            # any of
+    }
+    """
+
+    async def connect(self) -> None:
+        """Open connections / resolve remote resources ahead of first use."""
+
+    async def close(self) -> None:
+        """Release connections and worker threads."""
+
+    @abstractmethod
+    async def upsert_example(
+        self,
+        example_id: str,
+        embedding: VectorLike,
+        metadata: Dict[str, Any],
+    ) -> None: ...
+
+    @abstractmethod
+    async def upsert_many(
+        self,
+        items: Sequence[Tuple[str, VectorLike, Dict[str, Any]]],
+    ) -> None:
+        """Upsert (example_id, embedding, metadata) triples in one call."""
+
+    @abstractmethod
+    async def query_examples(
+        self,
+        embedding: VectorLike,
+        top_k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+        include_values: bool = False,
+    ) -> List[Any]:
+        """Matches best first; `include_values` also returns the stored vectors."""
+
+    async def query_many(
+        self,
+        embeddings: Sequence[VectorLike],
+        top_k: int = 5,
+        metadata_filter: Optional[Dict[str, Any]] = None,
+    ) -> List[List[Any]]:
+        """Query several vectors (results in input order); backends may batch."""
+        return [await self.query_examples(e, top_k, metadata_filter) for e in embeddings]
+
+
+_store: Optional[VectorStore] = None
+
+
+def get_vector_store() -> VectorStore:
+    """
+    Return the process-wide vector store selected by VECTOR_STORE_BACKEND
+    ("pinecone" or "local"). Only the selected backend is imported, and
+    building it does no network I/O — remote setup happens on first use
+    or in `init_vector_store()`.
+    """
+    global _store
+
+    if _store is None:
+        backend = settings.vector_store_backend.lower()
+
+        if backend == "pinecone":
+            from app.services.pinecone_service import PineconeService
+
+            _store = PineconeService()
+        elif backend == "local":
+            from app.services.local_vector_store import LocalVectorStore
+
+            _store = LocalVectorStore(
+                path=settings.local_vector_store_path,
+                use_hnsw=settings.local_vector_store_hnsw,
+            )
+        else:
+            raise ValueError(f"Unknown VECTOR_STORE_BACKEND: {backend}")
+
+        logger.info(f"Vector store backend: {backend}")
+
+    return _store
+
+
+async def init_vector_store() -> None:
+    """
+    Warm up the shared store (FastAPI lifespan). Failures are logged, not
+    raised: the app still starts offline and the first real call retries.
+    """
+    try:
+        await get_vector_store().connect()
+    except Exception as e:
+        logger.error(f"❌ Vector store warm-up failed: {e}")
+
+
+async def close_vector_store() -> None:
+    global _store
+
+    if _store is not None:
+        await _store.close()
+        _store = None
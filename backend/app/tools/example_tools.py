@@ -1,13 +1,17 @@
 # app/tools/example_tools.py
 
 import asyncio
-from typing import List, Dict
+from typing import List, Dict, Optional
 from google.adk.tools.tool_context import ToolContext
 
+from app.core.config import settings
 from app.db.database import async_session
 from app.db.orm.prompt_example import PromptExample
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
+from app.services.context_packer import example_context_packer
+from app.services.example_cache import example_cache
 # Observability
 from app.observability import configure_logging, get_logger
 
@@ -46,7 +50,8 @@ async def fetch_examples_by_ids(ids: List[str]) -> Dict:
                 "error": None or "error_message"
             }
 
-   
+            Examples are packed into the example context token budget:
+            empty fields are omitted and very long text / lists are shortened.
     """
 
     logger.info(f"XXXXXXXXXX fetch_examples_by_ids called XXXXXXXXXX -> {ids}")
@@ -60,51 +65,89 @@ async def fetch_examples_by_ids(ids: List[str]) -> Dict:
 
     try:
         # ----------------------------------------------------------------------
-        # 1. Create an async DB session.
-        #    Load examples + tags with eager relationship loading.
+        # 1. Load examples + tags (one eager-loading query for cache misses).
+        #    Served from the in-memory example cache when possible.
         # ----------------------------------------------------------------------
-        async with async_session() as session:
-            stmt = (
-                select(PromptExample)
-                .where(PromptExample.id.in_(ids))
-                .options(selectinload(PromptExample.tags))  # load tags in one query
-            )
-
-            result = await session.execute(stmt)
-            rows = result.scalars().all()
-
-        # ----------------------------------------------------------------------
-        # 2. Format database rows into simple JSON objects.
-        #    This ensures LLM agents receive clean, predictable output.
-        # ----------------------------------------------------------------------
-        formatted = []
-
-        for row in rows:
-            formatted.append({
-                "id": row.id,
-                "title": row.title,
-                "prompt_text": row.prompt_text,
-                "prompt_json": row.prompt_json,
-                "business_type": row.business_type,
-                "ad_style": row.ad_style,
-                "tone": row.tone,
-                "target_audience": row.target_audience,
-                "tags": [t.name for t in row.tags],  # flatten tag names
-            })
+        formatted = await hydrate_examples(ids)
 
         # ----------------------------------------------------------------------
-        # 3. Return results to the agent exactly in this format.
+        # 2. Return results to the agent exactly in this format
+        #    (packed into the example context token budget).
         # ----------------------------------------------------------------------
         return {
-            "examples": formatted,
+            "examples": example_context_packer.pack(formatted),
             "error": None
         }
 
     except Exception as e:
         # ----------------------------------------------------------------------
-        # 4. Fail gracefully — never break LLM workflows.
+        # 3. Fail gracefully — never break LLM workflows.
         # ----------------------------------------------------------------------
         return {
             "examples": [],
             "error": str(e)
         }
+
+
+# ----------------------------------------------------------------------
+# Shared helpers (also used by search_tools.search_and_fetch_examples)
+# ----------------------------------------------------------------------
+async def hydrate_examples(ids: List[str], session: Optional[AsyncSession] = None) -> List[Dict]:
+    """
+    Read-through: cached payloads first, one DB query for the rest.
+    Returned in the order of `ids`; uses `session` if given, else opens one.
+    """
+    found, missing = example_cache.get_many(ids)
+
+    if missing:
+        if session is None:
+            async with async_session() as session:
+                loaded = await load_examples(session, missing)
+        else:
+            loaded = await load_examples(session, missing)
+
+        example_cache.put_many(loaded)
+        found.update((payload["id"], payload) for payload in loaded)
+
+    return [found[i] for i in ids if i in found]
+
+
+async def preload_hot_examples() -> None:
+    """Warm the example cache with the ids saved at the last shutdown."""
+    ids = example_cache.load_hot_ids(settings.example_cache_hot_ids_path)
+    ids = ids[: settings.example_cache_preload_count]
+    if ids:
+        await hydrate_examples(ids)
+        logger.info(f"🟩 [EXAMPLE CACHE] Preloaded {len(example_cache)} examples")
+
+
+async def load_examples(session: AsyncSession, ids: List[str]) -> List[Dict]:
+    """Load examples + tags in one round trip, returned in the order of `ids`."""
+    stmt = (
+        select(PromptExample)
+        .where(PromptExample.id.in_(ids))
+        .options(selectinload(PromptExample.tags))  # load tags in one query
+    )
+
+    result = await session.execute(stmt)
+    by_id = {row.id: row for row in result.scalars().all()}
+
+    return [serialize_example(by_id[i]) for i in ids if i in by_id]
+
+
+def serialize_example(row: PromptExample) -> Dict:
+    """
+    Format a database row into a simple JSON object.
+    This ensures LLM agents receive clean, predictable output.
+    """
+    return {
+        "id": row.id,
+        "title": row.title,
+        "prompt_text": row.prompt_text,
+        "prompt_json": row.prompt_json,
+        "business_type": row.business_type,
+        "ad_style": row.ad_style,
+        "tone": row.tone,
+        "target_audience": row.target_audience,
+        "tags": [t.name for t in row.tags],  # flatten tag names
+    }
@@ -1,27 +1,25 @@
 # app/tools/search_tools.py
 
-import os
-import asyncio
-from typing import Dict, List
-from dotenv import load_dotenv
-from pinecone import Pinecone
+from typing import Dict, List, Optional
 
-from app.services.embedding_service import embedding_service
+import numpy as np
 
-load_dotenv()
+from app.core.config import settings
+from app.services.context_packer import example_context_packer
+from app.services.example_service import example_service
+from app.services.vector_store import get_vector_store, match_values
+from app.tools.example_tools import hydrate_examples
+from app.utils.vectors import mmr_select
+# Observability
+from app.observability import configure_logging, get_logger
 
-PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
-PINECONE_INDEX = os.getenv("PINECONE_INDEX")
+# Configure logging once
+configure_logging()
+logger = get_logger(__name__)
 
-# -----------------------------------------------------
-# 🔧 Initialize Pinecone Client
-# -----------------------------------------------------
-pc = Pinecone(api_key=PINECONE_API_KEY)
 
-try:
-    index = pc.Index(PINECONE_INDEX)
-except Exception:
-    index = None
+def _diversity() -> Optional[float]:
+    return settings.example_mmr_lambda if settings.example_mmr_enabled else None
 
 
 async def search_similar_examples(query: str, top_k: int = 5) -> Dict:
@@ -30,66 +28,119 @@ Return at most 2 example IDs from Pinecone with similarity >= 0.9.
 If none meet the threshold, return an empty list.
     """
 
-    print("🔍 search_similar_examples (with ≥0.9 score filtering + max 2 results) called")
+    logger.debug("🔍 search_similar_examples (with ≥0.9 score filtering + max 2 results) called")
 
     # -----------------------------
-    # Validate Pinecone index
+    # Validate vector index
     # -----------------------------
-    if index is None:
+    try:
+        get_vector_store()
+    except Exception as e:
         return {
             "ids": [],
-            "error": f"Pinecone index '{PINECONE_INDEX}' not available"
+            "error": f"Vector index not available: {e}"
         }
 
     try:
-        # 1. Generate embedding
-        embedding: List[float] = await embedding_service.get_embedding(query)
-
-        # 2. Perform Pinecone vector search
-        response = await asyncio.to_thread(
-            index.query,
-            vector=embedding,
-            top_k=top_k,
-            include_metadata=True,
+        # 1 + 2. Embed + vector search (served from the result cache when
+        #        the same query ran since the last ingest)
+        matches = await example_service.find_matches(
+            query, top_k=top_k, include_values=settings.example_mmr_enabled
         )
 
-        if not response.matches:
-            return {"ids": [], "error": None}
+        # 3–5. Score >= 0.9, at most 2 (MMR-diversified when enabled)
+        return {
+            "ids": select_top_ids(matches, diversity=_diversity()),
+            "error": None
+        }
+
+    except Exception as e:
+        return {
+            "ids": [],
+            "error": str(e)
+        }
+
+
+async def search_and_fetch_examples(query: str, top_k: int = 5) -> Dict:
+    """Search the example index and return the full matching examples in one call.
 
-        # 3. Filter matches by score >= 0.9
-        qualified = []
-        for match in response.matches:
-            raw_score = match.score
+    Same selection rule as `search_similar_examples` (score >= 0.9, at most 2),
+    hydrated like `fetch_examples_by_ids` (example cache, then PostgreSQL).
 
-            # Normalize score to 0–1 scale if needed
-            score = raw_score / 100 if raw_score > 1 else raw_score
-            print("=========Score is============")
-            print(score)
-            print("=============================")
+    Args:
+        query (str): One short sentence describing the business domain.
+        top_k (int): Number of vector candidates to consider.
 
-            if score >= 0.9:
-                md = match.metadata or {}
-                example_id = md.get("id", match.id)
-                if example_id:
-                    qualified.append((example_id, score))
+    Returns:
+        Dict: {"examples": [{"id", "title", "prompt_text", "prompt_json",
+        "business_type", "ad_style", "tone", "target_audience", "tags"}, ...],
+        "error": None or "error_message"}, packed into the example context
+        token budget (empty fields omitted, long text / lists shortened).
+    """
 
-        # No matches above threshold
-        if not qualified:
-            return {"ids": [], "error": None}
+    try:
+        get_vector_store()
+    except Exception as e:
+        return {
+            "examples": [],
+            "error": f"Vector index not available: {e}"
+        }
 
-        # 4. Sort by highest score
-        qualified.sort(key=lambda x: x[1], reverse=True)
+    try:
+        matches = await example_service.find_matches(
+            query, top_k=top_k, include_values=settings.example_mmr_enabled
+        )
+        ids = select_top_ids(matches, diversity=_diversity())
 
-        # 5. Keep ONLY top 2 IDs
-        final_ids = [item[0] for item in qualified[:2]]
+        # Example cache first; a DB session is opened only for cache misses
+        examples = await hydrate_examples(ids) if ids else []
 
         return {
-            "ids": final_ids,
+            "examples": example_context_packer.pack(examples),
             "error": None
         }
 
     except Exception as e:
         return {
-            "ids": [],
+            "examples": [],
             "error": str(e)
         }
+
+
+def select_top_ids(
+    matches,
+    threshold: float = 0.9,
+    limit: int = 2,
+    diversity: Optional[float] = None,
+) -> List[str]:
+    """
+    Example IDs with score >= threshold, highest first, at most `limit`.
+
+    With `diversity` (MMR λ) and candidate vectors on the matches, the
+    `limit` picks are made by maximal marginal relevance instead, so
+    near-duplicates of the best match give way to different examples.
+    """
+    qualified = []
+    for match in matches or []:
+        raw_score = match.score
+
+        # Normalize score to 0–1 scale if needed (cosine can come back
+        # as 1.0000001 for identical vectors — that is not a percentage)
+        score = raw_score / 100 if raw_score > 1.5 else min(raw_score, 1.0)
+        logger.debug(f"Example {match.id} score: {score:.4f}")
+
+        if score >= threshold:
+            md = match.metadata or {}
+            example_id = md.get("id", match.id)
+            if example_id:
+                qualified.append((example_id, score, match_values(match)))
+
+    qualified.sort(key=lambda x: x[1], reverse=True)
+
+    if diversity is not None and len(qualified) > limit:
+        vectors = [item[2] for item in qualified]
+        if all(v is not None for v in vectors):
+            picks = mmr_select([item[1] for item in qualified], np.stack(vectors), limit, diversity)
+            return [qualified[i][0] for i in picks]
+
+    return [item[0] for item in qualified[:limit]]
@@ -0,0 +1,71 @@
+# app/utils/gemini.py
+#
+# Gemini model for agents, throttled by the shared per-model token bucket
+# (app/services/rate_limiter.py) before each request goes out, instead of
+# only retrying after a 429.
+
+from typing import AsyncGenerator
+
+from google.adk.models.google_llm import Gemini
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import errors, types
+
+from app.services.context_packer import compact_json
+from app.services.rate_limiter import rate_limiter
+from app.utils.tokens import count_tokens
+
+# Images, audio, files: flat estimate instead of counting base64
+MEDIA_PART_TOKENS = 258
+
+
+def estimate_request_tokens(llm_request: LlmRequest) -> int:
+    """Input tokens of a request (system instruction, history, tools' I/O)."""
+    tokens = 0
+    config = llm_request.config
+    instruction = config.system_instruction if config else None
+    if isinstance(instruction, str):
+        tokens += count_tokens(instruction)
+    elif isinstance(instruction, types.Content):
+        tokens += sum(_part_tokens(part) for part in instruction.parts or [])
+
+    for content in llm_request.contents or []:
+        for part in content.parts or []:
+            tokens += _part_tokens(part)
+    return max(tokens, 1)
+
+
+def _part_tokens(part: types.Part) -> int:
+    if part.text:
+        return count_tokens(part.text)
+    if part.function_call:
+        return count_tokens(compact_json(part.function_call.model_dump(mode="json", exclude_none=True)))
+    if part.function_response:
+        return count_tokens(compact_json(part.function_response.model_dump(mode="json", exclude_none=True)))
+    if part.inline_data or part.file_data:
+        return MEDIA_PART_TOKENS
+    return 0
+
+
+class RateLimitedGemini(Gemini):
+    """Gemini that waits for its model's rate-limit budget before each call."""
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        model = llm_request.model or self.model
+        estimated = estimate_request_tokens(llm_request)
+        await rate_limiter.acquire(model, estimated)
+
+        usage = None
+        try:
+            async for response in super().generate_content_async(llm_request, stream):
+                usage = response.usage_metadata or usage
+                yield response
+        except errors.ClientError as e:
+            if e.code == 429:
+                rate_limiter.pause(model)
+            raise
+
+        # Reconcile the estimate with what the API actually counted
+        rate_limiter.settle(model, estimated, usage.prompt_token_count if usage else None)
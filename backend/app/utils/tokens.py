@@ -0,0 +1,59 @@
+# app/utils/tokens.py
+#
+# Token counting for prompt budgeting.
+#
+# "estimate" (default) needs no dependency and no download: ~4 characters
+# per token, which is close for English text and JSON with both OpenAI and
+# Gemini tokenizers. "tiktoken" counts exactly for OpenAI models when the
+# package (and its cached encoding) is available, and falls back otherwise.
+
+import logging
+import math
+
+from app.core.config import settings
+
+try:
+    import tiktoken  # optional: pip install tiktoken
+except ImportError:
+    tiktoken = None
+
+logger = logging.getLogger("backend")
+
+CHARS_PER_TOKEN = 4
+
+_encoding = None
+_encoding_failed = False
+
+
+def _get_encoding():
+    global _encoding, _encoding_failed
+    if _encoding is None and not _encoding_failed:
+        try:
+            _encoding = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            _encoding_failed = True
+            logger.warning(f"⚠️ tiktoken unavailable, estimating tokens: {e}")
+    return _encoding
+
+
+def _exact() -> bool:
+    return settings.token_counter == "tiktoken" and tiktoken is not None and _get_encoding() is not None
+
+
+def count_tokens(text: str) -> int:
+    if not text:
+        return 0
+    if _exact():
+        return len(_encoding.encode(text))
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` to at most `max_tokens` (marking the cut with an ellipsis)."""
+    if count_tokens(text) <= max_tokens:
+        return text
+    if max_tokens <= 0:
+        return ""
+    if _exact():
+        return _encoding.decode(_encoding.encode(text)[: max_tokens - 1]).rstrip() + "…"
+    return text[: (max_tokens - 1) * CHARS_PER_TOKEN].rstrip() + "…"
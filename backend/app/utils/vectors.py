@@ -0,0 +1,129 @@
+# app/utils/vectors.py
+#
+# Compact embedding representation shared by the services.
+#
+# Embeddings are carried as 1-D NumPy float32 arrays (`Vector`):
+# a 3072-dim vector is 12 KB contiguous, vs ~100 KB for a List[float]
+# of boxed Python floats. Conversions happen only at client boundaries:
+#   - OpenAI:   base64 payload → np.frombuffer (no float objects at all)
+#   - Pinecone: vector.tolist() right at the request call
+
+import base64
+import struct
+from typing import List, Sequence, Union
+
+import numpy as np
+
+Vector = np.ndarray                       # 1-D, dtype float32
+VectorLike = Union[np.ndarray, Sequence[float]]
+
+CODECS = ("float32", "int8", "binary")
+
+
+def to_vector(values: VectorLike) -> Vector:
+    """Return a float32 array; no copy if `values` already is one."""
+    return np.asarray(values, dtype=np.float32)
+
+
+def from_base64(data: str) -> Vector:
+    """Decode an OpenAI `encoding_format="base64"` embedding."""
+    return np.frombuffer(base64.b64decode(data), dtype=np.float32)
+
+
+def to_list(vector: VectorLike) -> list:
+    """Boundary conversion for clients that only accept JSON lists."""
+    if isinstance(vector, np.ndarray):
+        return vector.tolist()
+    return list(vector)
+
+
+def truncate_and_normalize(vectors: np.ndarray, dim: int) -> np.ndarray:
+    """
+    Shorten embeddings to `dim` and L2-renormalize (works on 1-D or 2-D).
+    For text-embedding-3 models this matches requesting `dimensions=dim`.
+    """
+    v = np.asarray(vectors, dtype=np.float32)[..., :dim]
+    norms = np.linalg.norm(v, axis=-1, keepdims=True)
+    return v / np.where(norms == 0, 1.0, norms)
+
+
+def mmr_select(
+    relevance: Sequence[float],
+    vectors: np.ndarray,
+    k: int,
+    lambda_: float = 0.7,
+) -> List[int]:
+    """
+    Maximal marginal relevance: greedily pick the candidate maximizing
+    λ·relevance − (1−λ)·(max cosine similarity to the picks so far).
+    The n×n similarity matrix is computed once; each step is one
+    vectorized argmax. Returns candidate indices in pick order.
+    """
+    rel = np.asarray(relevance, dtype=np.float32)
+    k = min(k, rel.size)
+    if k <= 0:
+        return []
+
+    v = truncate_and_normalize(vectors, vectors.shape[-1])
+    sim = v @ v.T
+
+    first = int(np.argmax(rel))
+    picks = [first]
+    max_sim = sim[first].copy()
+    available = np.ones(rel.size, dtype=bool)
+    available[first] = False
+
+    while len(picks) < k:
+        scores = lambda_ * rel - (1.0 - lambda_) * max_sim
+        scores[~available] = -np.inf
+        pick = int(np.argmax(scores))
+        picks.append(pick)
+        available[pick] = False
+        np.maximum(max_sim, sim[pick], out=max_sim)
+
+    return picks
+
+
+# ------------------------------------------------------------
+# QUANTIZED STORAGE (cache blobs)
+#
+#   float32 : raw float32 bytes                         (4 B/dim)
+#   int8    : <f scale> + int8[dim], v ≈ q * scale       (1 B/dim)
+#   binary  : <f scale><I dim> + packed sign bits,
+#             v ≈ ±scale (unit-norm reconstruction)      (1 bit/dim)
+# ------------------------------------------------------------
+def encode(vector: VectorLike, codec: str = "float32") -> bytes:
+    v = to_vector(vector)
+
+    if codec == "float32":
+        return v.tobytes()
+
+    if codec == "int8":
+        max_abs = float(np.max(np.abs(v))) if v.size else 0.0
+        scale = max_abs / 127.0 if max_abs > 0 else 1.0
+        q = np.clip(np.rint(v / scale), -127, 127).astype(np.int8)
+        return struct.pack("<f", scale) + q.tobytes()
+
+    if codec == "binary":
+        scale = 1.0 / np.sqrt(v.size) if v.size else 1.0
+        bits = np.packbits(v > 0)
+        return struct.pack("<fI", scale, v.size) + bits.tobytes()
+
+    raise ValueError(f"Unknown vector codec: {codec}")
+
+
+def decode(blob: bytes, codec: str = "float32") -> Vector:
+    if codec == "float32":
+        return np.frombuffer(blob, dtype=np.float32)
+
+    if codec == "int8":
+        (scale,) = struct.unpack_from("<f", blob)
+        q = np.frombuffer(blob, dtype=np.int8, offset=4)
+        return q.astype(np.float32) * np.float32(scale)
+
+    if codec == "binary":
+        scale, dim = struct.unpack_from("<fI", blob)
+        bits = np.unpackbits(np.frombuffer(blob, dtype=np.uint8, offset=8))[:dim]
+        return np.where(bits, scale, -scale).astype(np.float32)
+
+    raise ValueError(f"Unknown vector codec: {codec}")
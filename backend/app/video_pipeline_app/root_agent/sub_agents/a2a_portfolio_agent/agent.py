@@ -3,7 +3,7 @@ from google.adk.agents.remote_a2a_agent import (
     RemoteA2aAgent,
     AGENT_CARD_WELL_KNOWN_PATH,
 )
-from google.adk.models.google_llm import Gemini
+from app.utils.gemini import RateLimitedGemini
 from app.utils.retry_config import retry_config
 from app.core.config import settings
 from app.observability import configure_logging, get_logger
@@ -39,7 +39,7 @@ logger.info("   The main agent can now use this like a local sub-agent!")
 # 🤖 MAIN LLM AGENT (Support Agent for Client Interaction)
 # ---------------------------------------------------------------------------
 a2a_portfolio_agent = Agent(
-    model=Gemini(model=settings.google_model_name, retry_config=retry_config),
+    model=RateLimitedGemini(model=settings.google_model_name, retry_options=retry_config),
     name="a2a_portfolio_agent",
     instruction="""
     You are part of an automated pipeline.
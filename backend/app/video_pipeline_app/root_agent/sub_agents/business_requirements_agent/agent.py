@@ -1,7 +1,7 @@
 # app/video_pipeline_app/business_requirements_agent/agent.py
 
 from google.adk.agents import Agent
-from google.adk.models.google_llm import Gemini
+from app.utils.gemini import RateLimitedGemini
 from app.utils.retry_config import retry_config
 from app.core.config import settings
 from .schema import BusinessRequirements
@@ -18,7 +18,7 @@ logger = get_logger(__name__)
 
 business_requirements_agent = Agent(
     name="business_requirements_agent",
-    model=Gemini(model=settings.google_model_name, retry_config=retry_config),
+    model=RateLimitedGemini(model=settings.google_model_name, retry_options=retry_config),
     instruction=business_requirements_instructions,
     output_schema=BusinessRequirements,
     output_key="business_requirements_output",
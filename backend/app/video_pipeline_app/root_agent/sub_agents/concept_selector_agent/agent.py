@@ -2,6 +2,7 @@ from google.adk.agents import LlmAgent
 from google.adk.tools.function_tool import FunctionTool
 from google.adk.tools.tool_context import ToolContext
 from app.core.config import settings
+from app.utils.gemini import RateLimitedGemini
 from app.video_pipeline_app.root_agent.sub_agents.domain_concept_parallel_agent.concept_writer_agent.schema import ConceptWriterOutput, Concept
 
 # Observability
@@ -84,7 +85,7 @@ async def select_concept(concepts_output: dict, concept_name: str, tool_context:
 # -----------------------------------------------------------
 
 concept_selector_agent = LlmAgent(
-    model=settings.google_model_name,
+    model=RateLimitedGemini(model=settings.google_model_name),
     name="concept_selector_agent",
     instruction="Call the select_concept tool with parameters {concept_writer_output} .You may select the most suitable Concept_Name on your own.",
 #     instruction="""
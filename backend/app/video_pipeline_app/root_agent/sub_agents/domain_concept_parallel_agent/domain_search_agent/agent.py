@@ -1,24 +1,88 @@
 # path: app/video_pipeline_app/root_agent/sub_agents/domain_search_agent/agent.py
 
-from google.adk.agents import Agent
-from google.adk.tools import FunctionTool
-from app.tools.search_tools import search_similar_examples
-from app.tools.example_tools import fetch_examples_by_ids
-from app.core.config import settings
-from .instructions import domain_search_instructions
-from google.adk.models.google_llm import Gemini
-from app.utils.retry_config import retry_config
+import json
+from typing import AsyncGenerator, Any, List
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+from pydantic import ValidationError
+
+from app.services.context_packer import compact_json
+from app.tools.search_tools import search_and_fetch_examples
 from app.video_pipeline_app.root_agent.sub_agents.business_requirements_agent.schema import BusinessRequirements
 
+# Observability
+from app.observability import configure_logging, get_logger
 
-domain_search_agent = Agent(
-    name="domain_search_agent",
-    model=Gemini(model=settings.google_model_name, retry_config=retry_config),
-    tools=[FunctionTool(search_similar_examples), FunctionTool(fetch_examples_by_ids)],
-    output_key="domain_search_output",
-    input_schema=BusinessRequirements,
-    instruction=domain_search_instructions
-)
+# Configure logging once
+configure_logging()
+logger = get_logger(__name__)
+
+
+# -----------------------------------------------------------
+# Query: business domain / core offering / primary audience
+# (no mood, camera, audio or tooling words)
+# -----------------------------------------------------------
+def build_domain_query(requirements: Any) -> str:
+    if isinstance(requirements, str):
+        try:
+            requirements = json.loads(requirements)
+        except json.JSONDecodeError:
+            return requirements
+
+    try:
+        info = BusinessRequirements.model_validate(requirements).business_info
+    except ValidationError:
+        return json.dumps(requirements, default=str)
+
+    audience = " ".join(
+        part for part in (info.target_audience.age_group, info.target_audience.demographics) if part
+    )
+
+    parts = [f"{info.business_type} ({info.industry})"]
+    if info.core_offer:
+        parts.append(f"offering {info.core_offer}")
+    if audience:
+        parts.append(f"for {audience}")
+    return " ".join(parts)
 
 
+class DomainSearchAgent(BaseAgent):
+    """
+    Deterministic (non-LLM) retrieval stage.
 
+    business_requirements_output → domain query → `search_and_fetch_examples`
+    (score ≥ 0.9, top 2, hydrated from PostgreSQL) → domain_search_output.
+    Same selection rule and output format as the former LLM retrieval agent, minus
+    the two or three model round trips.
+    """
+
+    output_key: str = "domain_search_output"
+    input_keys: List[str] = ["business_requirements_output"]   # read in code, not via {placeholder}
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        query = build_domain_query(ctx.session.state.get("business_requirements_output", ""))
+        logger.info(f"[{self.name}] query: {query}")
+
+        result = await search_and_fetch_examples(query)
+        if result.get("error"):
+            logger.warning(f"[{self.name}] retrieval failed: {result['error']}")
+
+        output = compact_json(result)   # injected into downstream prompts
+        logger.info(f"[{self.name}] {len(result['examples'])} examples")
+
+        yield Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            content=types.Content(role="model", parts=[types.Part(text=output)]),
+            actions=EventActions(state_delta={self.output_key: output}),
+        )
+
+
+domain_search_agent = DomainSearchAgent(
+    name="domain_search_agent",
+    description="Retrieves up to 2 highly similar stored ad examples for the business domain.",
+)
@@ -1,6 +1,7 @@
 from google.adk.agents import Agent, SequentialAgent
 from google.adk.tools import google_search
 from app.core.config import settings
+from app.utils.gemini import RateLimitedGemini
 from .instructions import trends_query_creator_instructions
 # Observability
 from app.observability import configure_logging, ADKObservabilityPlugin, get_logger
@@ -12,7 +13,7 @@ logger = get_logger(__name__)
 
 trends_query_creator_agent = Agent(
     name="trends_research_agent",
-    model=settings.google_model_name,
+    model=RateLimitedGemini(model=settings.google_model_name),
     instruction=trends_query_creator_instructions,
     output_key="trends_query_creator_output",
 )
@@ -20,7 +21,7 @@ trends_query_creator_agent = Agent(
 
 google_trends_search_agent = Agent(
     name="google_trends_search_agent",
-    model=settings.google_model_name,
+    model=RateLimitedGemini(model=settings.google_model_name),
     instruction="use tool `google_search` and search for {trends_query_creator_output}",
     tools=[google_search],
     output_key="google_trends_search_output",
@@ -28,7 +29,7 @@ google_trends_search_agent = Agent(
 
 trends_refiner_agent = Agent(
     name = "trends_research_agent",
-    model=settings.google_model_name,
+    model=RateLimitedGemini(model=settings.google_model_name),
     instruction="You will receive {google_trends_search_output}. Your task is to beautify, clean, and summarize the information into 4–6 clear, well-formatted bullet points. Focus on clarity, relevance, and readability; remove noise, repetition, or unnecessary details.",
     output_key="trends_refiner_agent_output"
 
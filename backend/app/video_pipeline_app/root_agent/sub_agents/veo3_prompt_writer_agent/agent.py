@@ -2,6 +2,7 @@
 
 from google.adk.agents import Agent, LoopAgent, SequentialAgent
 from app.core.config import settings
+from app.utils.gemini import RateLimitedGemini
 from .instructions import veo3_prompt_writer_instructions
 from .veo3_prompt_reviewer_agent import veo3_prompt_reviewer_agent
 from .veo3_prompt_refinement_agent import veo3_prompt_refinement_agent
@@ -15,7 +16,7 @@ print("✅ exit_loop function created.")
 
 veo3_prompt_writer_agent = Agent(
     name="veo3_prompt_writer_agent",
-    model=settings.google_model_name,
+    model=RateLimitedGemini(model=settings.google_model_name),
     instruction=veo3_prompt_writer_instructions,
     output_key="veo3_prompt_writer_output",
     output_schema=FinalPromptSchema,
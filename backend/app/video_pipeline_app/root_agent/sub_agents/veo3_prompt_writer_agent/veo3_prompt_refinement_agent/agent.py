@@ -3,7 +3,7 @@
 from google.adk.agents import Agent
 from app.core.config import settings
 from .instructions import veo3_prompt_refinement_agent_instructions
-from google.adk.models.google_llm import Gemini
+from app.utils.gemini import RateLimitedGemini
 from app.utils.retry_config import retry_config
 from google.adk.tools import FunctionTool
 from ..schema import FinalPromptSchema
@@ -20,7 +20,7 @@ def exit_loop() -> dict:
 veo3_prompt_refinement_agent = Agent(
     name="veo3_prompt_refinement_agent",
     instruction=veo3_prompt_refinement_agent_instructions,
-    model=Gemini(model=settings.google_model_name, retry_config=retry_config),
+    model=RateLimitedGemini(model=settings.google_model_name, retry_options=retry_config),
     tools=[FunctionTool(exit_loop)],
     output_key="veo3_prompt_writer_output", # IMPORTANT: The key name should match the veo3_prompt_writer_agent's output key  
     output_schema=FinalPromptSchema,
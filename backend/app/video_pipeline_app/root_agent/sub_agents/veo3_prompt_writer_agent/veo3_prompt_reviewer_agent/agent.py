@@ -3,13 +3,13 @@
 from google.adk.agents import Agent
 from app.core.config import settings
 from .instructions import veo3_prompt_reviewer_agent_instructions
-from google.adk.models.google_llm import Gemini
+from app.utils.gemini import RateLimitedGemini
 from app.utils.retry_config import retry_config
 
 veo3_prompt_reviewer_agent = Agent(
     name="veo3_prompt_reviewer_agent",
     instruction=veo3_prompt_reviewer_agent_instructions,
-    model=Gemini(model=settings.google_model_name, retry_config=retry_config),
+    model=RateLimitedGemini(model=settings.google_model_name, retry_options=retry_config),
     tools=[],
     output_key="veo3_prompt_reviewer_output",  
 )
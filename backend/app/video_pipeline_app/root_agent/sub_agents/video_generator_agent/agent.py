@@ -1,7 +1,7 @@
 # app/agents/video_generator_agent/agent.py
 from google.adk.agents import Agent
 from google.adk.tools import FunctionTool
-from google.adk.models.google_llm import Gemini
+from app.utils.gemini import RateLimitedGemini
 from app.core.config import settings
 from app.utils.retry_config import retry_config
 from app.video_pipeline_app.root_agent.sub_agents.veo3_prompt_writer_agent.schema import FinalPromptSchema
@@ -58,9 +58,9 @@ logger.info(video_agent_instruction)
 video_generator_agent = Agent(
     name="video_generator_agent",
     instruction=video_agent_instruction,
-    model=Gemini(
+    model=RateLimitedGemini(
         model=settings.google_model_name,
-        retry_config=retry_config
+        retry_options=retry_config
     ),
     tools=[mcp_ai_vidoe_generation],
     input_schema=FinalPromptSchema,
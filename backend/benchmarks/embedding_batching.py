@@ -0,0 +1,113 @@
+"""
+Throughput benchmark: single-text embedding calls vs. micro-batched calls.
+
+Uses a fake embedder that behaves like a rate-limited upstream API
+(fixed per-request latency, small per-text cost, few parallel connections),
+so no network or API key is needed.
+
+Run from the backend folder:
+
+    python -m benchmarks.embedding_batching
+    python -m benchmarks.embedding_batching --requests 2000 --rate 800
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List
+
+from app.services.embedding_batcher import EmbeddingBatcher
+
+
+class FakeEmbedder:
+    """Simulated embeddings endpoint."""
+
+    def __init__(
+        self,
+        request_latency: float = 0.05,
+        per_text_latency: float = 0.0005,
+        max_parallel: int = 4,
+        dim: int = 3072,
+    ):
+        self.request_latency = request_latency
+        self.per_text_latency = per_text_latency
+        self.dim = dim
+        self.calls = 0
+        self._sem = asyncio.Semaphore(max_parallel)
+
+    async def embed_many(self, texts: List[str]) -> List[List[float]]:
+        async with self._sem:
+            self.calls += 1
+            await asyncio.sleep(
+                self.request_latency + self.per_text_latency * len(texts)
+            )
+        return [[0.0] * self.dim for _ in texts]
+
+    async def embed_one(self, text: str) -> List[float]:
+        return (await self.embed_many([text]))[0]
+
+
+async def run_load(
+    embed: Callable[[str], Awaitable[List[float]]],
+    n_requests: int,
+    rate: float,
+) -> dict:
+    latencies: List[float] = []
+
+    async def one(i: int) -> None:
+        start = time.perf_counter()
+        await embed(f"query number {i}")
+        latencies.append(time.perf_counter() - start)
+
+    wall_start = time.perf_counter()
+    tasks = []
+    for i in range(n_requests):
+        tasks.append(asyncio.create_task(one(i)))
+        await asyncio.sleep(1.0 / rate)
+    await asyncio.gather(*tasks)
+    wall = time.perf_counter() - wall_start
+
+    latencies.sort()
+    return {
+        "wall_s": wall,
+        "throughput": n_requests / wall,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000,
+    }
+
+
+async def main(n_requests: int, rate: float, window_ms: float, batch_size: int) -> None:
+    print(f"{n_requests} requests @ {rate:.0f} req/s\n")
+    print(f"{'mode':<10}{'upstream':>10}{'wall s':>10}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}")
+
+    unbatched = FakeEmbedder()
+    stats = await run_load(unbatched.embed_one, n_requests, rate)
+    print(
+        f"{'single':<10}{unbatched.calls:>10}{stats['wall_s']:>10.2f}"
+        f"{stats['throughput']:>10.0f}{stats['p50_ms']:>10.1f}{stats['p99_ms']:>10.1f}"
+    )
+
+    batched = FakeEmbedder()
+    batcher = EmbeddingBatcher(
+        batched.embed_many,
+        max_batch_size=batch_size,
+        max_wait_ms=window_ms,
+        max_concurrent_batches=4,  # same parallelism as the fake upstream
+    )
+    stats = await run_load(batcher.embed, n_requests, rate)
+    print(
+        f"{'batched':<10}{batched.calls:>10}{stats['wall_s']:>10.2f}"
+        f"{stats['throughput']:>10.0f}{stats['p50_ms']:>10.1f}{stats['p99_ms']:>10.1f}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--rate", type=float, default=400.0, help="arrivals per second")
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    asyncio.run(main(args.requests, args.rate, args.window_ms, args.batch_size))
@@ -0,0 +1,109 @@
+"""
+Recall / latency benchmark for reduced embedding dimensions.
+
+Embeds the example corpus from PostgreSQL once at full size (prompt text as
+documents, titles as queries), then for each candidate dimension truncates
++ renormalizes both sides and compares top-k against the full-size ranking:
+
+  recall@k   — overlap with the full-dimension top-k
+  query ms   — brute-force cosine search per query (NumPy)
+  index MB   — float32 matrix size
+
+Run from the backend folder:
+
+    python -m benchmarks.embedding_dimensions
+    python -m benchmarks.embedding_dimensions --dims 256 512 1024 --top-k 5
+    python -m benchmarks.embedding_dimensions --synthetic 5000   # offline
+"""
+
+import argparse
+import asyncio
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+from app.utils.vectors import truncate_and_normalize
+
+FULL_DIM = 3072
+
+
+async def load_corpus() -> Tuple[np.ndarray, np.ndarray]:
+    from sqlalchemy import select
+
+    from app.db.database import async_session
+    from app.db.orm.prompt_example import PromptExample
+    from app.services.embedding_service import EmbeddingService
+
+    async with async_session() as session:
+        rows = (await session.execute(select(PromptExample))).scalars().all()
+
+    docs, queries = [], []
+    for row in rows:
+        text = row.prompt_text if row.prompt_text else (str(row.prompt_json) if row.prompt_json else "")
+        if text.strip() and row.title.strip():
+            docs.append(text)
+            queries.append(row.title)
+
+    if not docs:
+        raise SystemExit("❌ No examples in the database — try --synthetic N")
+
+    embedder = EmbeddingService(dimensions=FULL_DIM)
+    doc_vecs = await embedder.generate_embeddings(docs)
+    query_vecs = await embedder.generate_embeddings(queries)
+    await embedder.aclose()
+
+    return np.stack(doc_vecs), np.stack(query_vecs)
+
+
+def synthetic_corpus(n: int, n_queries: int = 200, seed: int = 7) -> Tuple[np.ndarray, np.ndarray]:
+    """Leading dims carry more variance, like Matryoshka-trained embeddings."""
+    rng = np.random.default_rng(seed)
+    scale = 1.0 / np.sqrt(1.0 + np.arange(FULL_DIM) / 64.0)
+    docs = rng.standard_normal((n, FULL_DIM)).astype(np.float32) * scale
+    picks = rng.choice(n, size=min(n_queries, n), replace=False)
+    queries = docs[picks] + 0.5 * rng.standard_normal((len(picks), FULL_DIM)).astype(np.float32) * scale
+    return docs, queries
+
+
+def top_k(docs: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    scores = queries @ docs.T
+    idx = np.argpartition(-scores, kth=min(k, docs.shape[0]) - 1, axis=1)[:, :k]
+    return idx
+
+
+def run(docs: np.ndarray, queries: np.ndarray, dims: List[int], k: int) -> None:
+    k = min(k, docs.shape[0])
+    truth = top_k(truncate_and_normalize(docs, FULL_DIM), truncate_and_normalize(queries, FULL_DIM), k)
+
+    print(f"{docs.shape[0]} docs, {queries.shape[0]} queries, recall@{k} vs {FULL_DIM} dims\n")
+    print(f"{'dims':>6}{'recall':>10}{'query ms':>12}{'index MB':>12}")
+
+    for dim in dims:
+        d = truncate_and_normalize(docs, dim)
+        q = truncate_and_normalize(queries, dim)
+
+        start = time.perf_counter()
+        for row in q:
+            top_k(d, row[None, :], k)
+        per_query_ms = (time.perf_counter() - start) * 1000 / len(q)
+
+        found = top_k(d, q, k)
+        recall = np.mean([len(set(a) & set(b)) / k for a, b in zip(found, truth)])
+
+        print(f"{dim:>6}{recall:>10.3f}{per_query_ms:>12.3f}{d.nbytes / 1e6:>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare embedding dimensions on recall and latency.")
+    parser.add_argument("--dims", type=int, nargs="+", default=[256, 512, 1024, 3072])
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--synthetic", type=int, default=0, help="use N synthetic vectors instead of the DB")
+    args = parser.parse_args()
+
+    if args.synthetic:
+        docs, queries = synthetic_corpus(args.synthetic)
+    else:
+        docs, queries = asyncio.run(load_corpus())
+
+    run(docs, queries, args.dims, args.top_k)
@@ -0,0 +1,107 @@
+"""
+Latency benchmark: per-candidate re-ranking loop + full sort vs. the
+columnar ExampleReranker (NumPy scoring + argpartition top-k).
+
+Candidates are synthetic ExampleSearchResult objects, so no database or
+vector index is needed.
+
+Run from the backend folder:
+
+    python -m benchmarks.reranking
+    python -m benchmarks.reranking --candidates 1000 5000 20000 --top-k 6
+"""
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from app.schemas.example_schema import ExampleSearchResult
+from app.schemas.retrieval_schema import RetrievalPreferences
+from app.services.retrieval_service import CandidateBatch, ExampleReranker, RerankWeights
+
+CATEGORIES = ["restaurant", "salon", "gym", "bakery", "clinic", "boutique", "cafe", "dealer"]
+TONES = ["funny", "premium", "cinematic", "warm", "energetic", "calm", "bold", "playful"]
+REGIONS = ["punjab", "delhi", "mumbai", "kerala", "goa", "bengal"]
+TOPICS = ["family", "festival", "offer", "launch", "local", "night", "morning", "weekend"]
+
+
+def synthetic_candidates(n: int, seed: int = 7) -> List[ExampleSearchResult]:
+    rng = random.Random(seed)
+    return [
+        ExampleSearchResult(
+            id=f"ex-{i}",
+            title=f"Example {i}",
+            prompt_text="",
+            prompt_json=None,
+            business_type=rng.choice(CATEGORIES),
+            ad_style=None,
+            tone=rng.choice(TONES),
+            target_audience=None,
+            tags=rng.sample(TONES + REGIONS + TOPICS, k=rng.randint(2, 6)),
+            score=rng.uniform(0.5, 1.0),
+        )
+        for i in range(n)
+    ]
+
+
+def loop_rerank(candidates, prefs: RetrievalPreferences, w: RerankWeights) -> List[ExampleSearchResult]:
+    """The previous implementation: Python scoring per candidate, then a full sort."""
+    scored = []
+    for c in candidates:
+        score = c.score
+        if prefs.category and c.business_type and c.business_type.lower() == prefs.category.lower():
+            score += w.category
+        tags = {t.lower() for t in c.tags or []}
+        if c.tone:
+            tags.add(c.tone.lower())
+        for tone in prefs.tones or []:
+            if tone.lower() in tags:
+                score += w.tone
+        if prefs.region and prefs.region.lower() in tags:
+            score += w.region
+        scored.append((score, c))
+    scored.sort(key=lambda x: x[0], reverse=True)
+    return [c for _, c in scored[: prefs.max_examples]]
+
+
+def time_ms(fn: Callable[[], object], repeats: int) -> float:
+    fn()   # warm up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) * 1000 / repeats
+
+
+def run(sizes: List[int], top_k: int, repeats: int) -> None:
+    prefs = RetrievalPreferences(
+        category="salon", tones=["premium", "calm"], region="punjab", max_examples=top_k
+    )
+    weights = RerankWeights()
+    reranker = ExampleReranker(weights)
+
+    print(f"top-{top_k}, {repeats} repeats, ms per call\n")
+    print(f"{'candidates':>11}{'loop+sort':>12}{'encode':>10}{'score+top-k':>13}{'same top-k':>12}")
+
+    for n in sizes:
+        candidates = synthetic_candidates(n)
+        batch = CandidateBatch(candidates)
+
+        loop_ms = time_ms(lambda: loop_rerank(candidates, prefs, weights), repeats)
+        encode_ms = time_ms(lambda: CandidateBatch(candidates), repeats)
+        rank_ms = time_ms(lambda: reranker.top_k(batch, prefs, top_k), repeats)
+
+        expected = {c.id for c in loop_rerank(candidates, prefs, weights)}
+        got = {candidates[i].id for i, _ in reranker.top_k(batch, prefs, top_k)}
+
+        print(f"{n:>11}{loop_ms:>12.3f}{encode_ms:>10.3f}{rank_ms:>13.3f}{str(expected == got):>12}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare loop vs. vectorized example re-ranking.")
+    parser.add_argument("--candidates", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+    parser.add_argument("--top-k", type=int, default=6)
+    parser.add_argument("--repeats", type=int, default=50)
+    args = parser.parse_args()
+
+    run(args.candidates, args.top_k, args.repeats)
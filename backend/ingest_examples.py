@@ -0,0 +1,61 @@
+"""
+Bulk-load examples from an NDJSON / JSONL file (one example per line, same
+fields as POST /examples/upload) into PostgreSQL and the vector index.
+
+Runs the same pipeline as POST /examples/bulk-upload: batched DB commits,
+batched embeddings and batched upserts, overlapped with bounded queues.
+
+Usage (from the backend folder):
+
+    python ingest_examples.py examples.jsonl
+    python ingest_examples.py examples.jsonl --batch-size 128 --quiet
+"""
+
+import argparse
+import asyncio
+import time
+from typing import AsyncIterator
+
+from app.services.embedding_service import embedding_service
+from app.services.ingestion_service import BulkIngestionService
+
+
+async def read_lines(path: str) -> AsyncIterator[str]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield line
+            await asyncio.sleep(0)   # let the pipeline stages run
+
+
+async def main(path: str, batch_size: int, quiet: bool) -> int:
+    service = BulkIngestionService(batch_size=batch_size)
+    start = time.perf_counter()
+    summary = {}
+
+    try:
+        async for result in service.ingest(read_lines(path)):
+            if result["status"] == "done":
+                summary = result
+            elif result["status"] == "error":
+                print(f"❌ line {result['line']}: {result['error']}")
+            elif not quiet:
+                print(f"🟩 line {result['line']}: {result['example_id']}")
+    finally:
+        await embedding_service.aclose()
+
+    elapsed = time.perf_counter() - start
+    print(
+        f"🎉 Done in {elapsed:.1f}s: {summary.get('ok', 0)} ingested, "
+        f"{summary.get('failed', 0)} failed ({summary.get('total', 0)} records)."
+    )
+    return 1 if summary.get("failed") else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk-ingest examples from an NDJSON file.")
+    parser.add_argument("path", help="NDJSON / JSONL file, one example per line")
+    parser.add_argument("--batch-size", type=int, default=None)
+    parser.add_argument("--quiet", action="store_true", help="only print errors and the summary")
+    args = parser.parse_args()
+
+    raise SystemExit(asyncio.run(main(args.path, args.batch_size, args.quiet)))
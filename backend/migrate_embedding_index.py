@@ -0,0 +1,139 @@
+"""
+Migrate the Pinecone examples index to a different embedding dimension.
+
+Copies every vector (with metadata) from the source index into a target
+index of the requested dimension, using one of two modes:
+
+  truncate  — shorten existing vectors + L2-renormalize (no OpenAI calls).
+              Exact for text-embedding-3 models (Matryoshka embeddings).
+  reembed   — re-embed each example's prompt from PostgreSQL with
+              `dimensions=<target>`; falls back to truncate for vectors
+              that have no row in the database.
+
+Usage (from the backend folder):
+
+    python migrate_embedding_index.py --dimensions 1024 --target-index prompt-examples-1024
+    python migrate_embedding_index.py --dimensions 512 --target-index prompt-examples-512 --mode reembed
+
+Afterwards set PINECONE_INDEX=<target> and EMBEDDING_DIMENSIONS=<dimensions> in .env.
+"""
+
+import argparse
+import asyncio
+from typing import Dict, List
+
+import numpy as np
+from pinecone import Pinecone, ServerlessSpec
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.db.database import async_session
+from app.db.orm.prompt_example import PromptExample
+from app.services.embedding_service import EmbeddingService
+from app.utils.vectors import to_list, truncate_and_normalize
+
+
+# ------------------------------------------------------------------------------
+# Helpers
+# ------------------------------------------------------------------------------
+def ensure_index(pc: Pinecone, name: str, dimension: int) -> None:
+    existing = {idx["name"]: idx["dimension"] for idx in pc.list_indexes()}
+
+    if name not in existing:
+        print(f"🟦 Creating index '{name}' (dimension={dimension}) ...")
+        pc.create_index(
+            name=name,
+            dimension=dimension,
+            metric="cosine",
+            spec=ServerlessSpec(cloud="aws", region="us-east-1"),
+        )
+    elif existing[name] != dimension:
+        raise SystemExit(
+            f"❌ Index '{name}' exists with dimension {existing[name]}, expected {dimension}"
+        )
+
+
+async def load_texts(ids: List[str]) -> Dict[str, str]:
+    """Same embedding input as ExampleService.create_example."""
+    async with async_session() as session:
+        result = await session.execute(
+            select(PromptExample).where(PromptExample.id.in_(ids))
+        )
+        rows = result.scalars().all()
+
+    texts = {}
+    for row in rows:
+        text = row.prompt_text if row.prompt_text else (str(row.prompt_json) if row.prompt_json else "")
+        if text.strip():
+            texts[row.id] = text
+    return texts
+
+
+# ------------------------------------------------------------------------------
+# Migration
+# ------------------------------------------------------------------------------
+async def migrate(source: str, target: str, dimensions: int, mode: str, batch_size: int) -> None:
+    pc = Pinecone(api_key=settings.pinecone_api_key)
+    ensure_index(pc, target, dimensions)
+
+    src = pc.Index(source)
+    dst = pc.Index(target)
+    embedder = EmbeddingService(dimensions=dimensions) if mode == "reembed" else None
+
+    copied = reembedded = 0
+
+    for page in src.list(limit=batch_size):
+        fetched = src.fetch(ids=page)
+        ids = list(fetched.vectors.keys())
+        if not ids:
+            continue
+
+        matrix = np.asarray([fetched.vectors[i].values for i in ids], dtype=np.float32)
+        if matrix.shape[1] < dimensions:
+            raise SystemExit(
+                f"❌ Source vectors have {matrix.shape[1]} dims; cannot grow to {dimensions}"
+            )
+        new_vectors = dict(zip(ids, truncate_and_normalize(matrix, dimensions)))
+
+        if embedder is not None:
+            texts = await load_texts(ids)
+            if texts:
+                fresh = await embedder.generate_embeddings(list(texts.values()))
+                new_vectors.update(zip(texts.keys(), fresh))
+                reembedded += len(texts)
+
+        dst.upsert(
+            vectors=[
+                {
+                    "id": vid,
+                    "values": to_list(new_vectors[vid]),
+                    "metadata": fetched.vectors[vid].metadata or {},
+                }
+                for vid in ids
+            ]
+        )
+        copied += len(ids)
+        print(f"🟩 Migrated {copied} vectors ...")
+
+    if embedder is not None:
+        await embedder.aclose()
+
+    print(f"🎉 Done: {copied} vectors copied into '{target}' ({reembedded} re-embedded).")
+    print(f"   Now set PINECONE_INDEX={target} and EMBEDDING_DIMENSIONS={dimensions}.")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Migrate the examples index to a new embedding dimension.")
+    parser.add_argument("--dimensions", type=int, required=True)
+    parser.add_argument("--target-index", required=True)
+    parser.add_argument("--source-index", default=settings.pinecone_index)
+    parser.add_argument("--mode", choices=["truncate", "reembed"], default="truncate")
+    parser.add_argument("--batch-size", type=int, default=100)
+    args = parser.parse_args()
+
+    if args.target_index == args.source_index:
+        raise SystemExit("❌ Target index must differ from the source index")
+
+    asyncio.run(
+        migrate(args.source_index, args.target_index, args.dimensions, args.mode, args.batch_size)
+    )
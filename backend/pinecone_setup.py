@@ -21,7 +21,10 @@ if not PINECONE_API_KEY:
 # ------------------------------------------------------------------------------
 pc = Pinecone(api_key=PINECONE_API_KEY)
 
-index_name = "prompt-examples"
+index_name = os.getenv("PINECONE_INDEX", "prompt-examples")
+
+# text-embedding-3-large: 3072 by default, or a shortened size (256, 512, 1024, ...)
+EMBEDDING_DIMENSIONS = int(os.getenv("EMBEDDING_DIMENSIONS", "3072"))
 
 # ------------------------------------------------------------------------------
 # 3. Create Index if Not Exists
@@ -33,7 +36,7 @@ if index_name not in existing:
 
     pc.create_index(
         name=index_name,
-        dimension=3072,               # Same as text-embedding-3-large
+        dimension=EMBEDDING_DIMENSIONS,   # Must match EMBEDDING_DIMENSIONS
         metric="cosine",
         spec=ServerlessSpec(
             cloud="aws",
@@ -54,8 +57,8 @@ print(f"✅ Connected to index '{index_name}'")
 # ------------------------------------------------------------------------------
 # 5. OPTIONAL: Example Upsert (matches your metadata format)
 # ------------------------------------------------------------------------------
-# dummy embedding (3072 floats)
-dummy_embedding = [0.001] * 3072  
+# dummy embedding (EMBEDDING_DIMENSIONS floats)
+dummy_embedding = [0.001] * EMBEDDING_DIMENSIONS
 
 dummy_metadata = {
     "business_type": "Smart Speakers",